@@ -13,4 +13,6 @@ class AutomatedloggingConfig(AppConfig):
             from .signals import save
             from .signals import m2m
 
+            save.patch_refresh_from_db()
+
         from .handlers import DatabaseHandler
@@ -1,8 +1,12 @@
+import os
 import re
+import time
+import traceback
 from collections import OrderedDict
 from datetime import timedelta
 from logging import Handler, LogRecord
 from pathlib import Path
+from queue import Full, Queue
 from threading import Thread
 from typing import Dict, Any, TYPE_CHECKING, List, Optional, Union, Type, Tuple
 
@@ -21,75 +25,222 @@ if TYPE_CHECKING:
     )
 
 
+def delete_expired_events(config=None) -> None:
+    """
+    Delete all events that are older than the max_age of their module.
+    Meant to be run periodically, independent of the handler.
+
+    :param config: settings to use, defaults to the current settings
+    :return: None
+    """
+    from automated_logging.models import ModelEvent, RequestEvent, UnspecifiedEvent
+    from automated_logging.settings import settings
+    from django.db import transaction
+
+    config = config or settings
+    current = timezone.now()
+    with transaction.atomic():
+        if config.model.max_age:
+            ModelEvent.objects.filter(
+                created_at__lte=current - config.model.max_age
+            ).delete()
+        if config.unspecified.max_age:
+            UnspecifiedEvent.objects.filter(
+                created_at__lte=current - config.unspecified.max_age
+            ).delete()
+
+        if config.request.max_age:
+            RequestEvent.objects.filter(
+                created_at__lte=current - config.request.max_age
+            ).delete()
+
+
 class DatabaseHandler(Handler):
+    """
+    Saves the events in the database.
+
+    With threading enabled records are only put in a bounded queue,
+    a single background writer per process turns them into events
+    and saves them, up to `batch` rows at once or whenever the queue
+    runs empty. When the queue is full the overflow policy applies:
+    'block' waits for free space, 'drop' discards the record and
+    counts it in `dropped`. Queued records are written on shutdown.
+
+    Events older than max_age are not deleted here,
+    use delete_expired_events() for that.
+    """
+
     def __init__(
-        self, *args, batch: Optional[int] = 1, threading: bool = False, **kwargs
+        self,
+        *args,
+        batch: Optional[int] = 1,
+        threading: bool = False,
+        queue_size: int = 10000,
+        overflow: str = 'block',
+        shutdown_timeout: Optional[float] = 30,
+        **kwargs
     ):
+        if overflow not in ('block', 'drop'):
+            raise ValueError(f'unknown overflow policy {overflow!r}')
+
         self.limit = batch or 1
         self.threading = threading
         self.instances = OrderedDict()
+        # objects created by get_or_create, but not yet written
+        self.pending = {}
+
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.shutdown_timeout = shutdown_timeout
+        self.queue = Queue(queue_size)
+        self.writer = None
+        self.pid = None
+        self.dropped = 0
         super(DatabaseHandler, self).__init__(*args, **kwargs)
 
-    @staticmethod
-    def _clear(config):
-        from automated_logging.models import ModelEvent, RequestEvent, UnspecifiedEvent
-        from django.db import transaction
-
-        current = timezone.now()
-        with transaction.atomic():
-            if config.model.max_age:
-                ModelEvent.objects.filter(
-                    created_at__lte=current - config.model.max_age
-                ).delete()
-            if config.unspecified.max_age:
-                UnspecifiedEvent.objects.filter(
-                    created_at__lte=current - config.unspecified.max_age
-                ).delete()
-
-            if config.request.max_age:
-                RequestEvent.objects.filter(
-                    created_at__lte=current - config.request.max_age
-                ).delete()
-
-    def save(self, instance=None, commit=True, clear=True):
+    def save(self, instance=None, commit=True):
         """
         Internal save procedure.
-        Handles deletion when an event exceeds max_age
-        and batch saving via atomic transactions.
+        Collects the instances and writes them once the batch is full.
+        The background writer decides itself when to write.
 
         :return: None
         """
-        from django.db import transaction
-        from automated_logging.settings import settings
-
         if instance:
             self.instances[instance.pk] = instance
-        if len(self.instances) < self.limit:
-            if clear:
-                self._clear(settings)
-            return instance
 
-        if not commit:
+        if self.threading or not commit or len(self.instances) < self.limit:
             return instance
 
-        def database(instances, config):
-            """ wrapper so that we can actually use threading """
+        self.write()
+        return instance
+
+    def write(self) -> None:
+        """
+        Write all collected instances in a single transaction.
+        New instances are inserted with one bulk_create per model,
+        in the order the models were first seen, so that related objects
+        are always inserted before the objects referencing them.
+
+        :return: None
+        """
+        from django.db import transaction
+
+        created = OrderedDict()
+        updated = []
+        for instance in self.instances.values():
+            if instance._state.adding:
+                created.setdefault(instance.__class__, []).append(instance)
+            else:
+                updated.append(instance)
+
+        try:
             with transaction.atomic():
-                [i.save() for k, i in instances.items()]
+                for model, instances in created.items():
+                    model.objects.bulk_create(instances)
+                for instance in updated:
+                    instance.save()
+        finally:
+            self.instances.clear()
+            self.pending.clear()
+
+    def start_writer(self) -> None:
+        """
+        Start the background writer if it is not running in this process,
+        worker processes forked from a parent get their own.
+        """
+        if self.writer_running():
+            return
+
+        if self.pid != os.getpid():
+            # whatever the parent had queued is not ours to write
+            self.queue = Queue(self.queue_size)
+            self.instances.clear()
+            self.pending.clear()
+
+        self.pid = os.getpid()
+        self.writer = Thread(
+            target=self.run_writer, name='automated-logging-writer', daemon=True
+        )
+        self.writer.start()
 
-                if clear:
-                    self._clear(config)
-                instances.clear()
+    def run_writer(self) -> None:
+        """ body of the background writer """
+        from django.db import connection
 
-        if self.threading:
-            thread = Thread(
-                group=None, target=database, args=(self.instances, settings)
-            )
-            thread.start()
-        else:
-            database(self.instances, settings)
+        try:
+            self.drain(reconnect=True)
+        finally:
+            connection.close()
 
-        return instance
+    def drain(self, reconnect: bool = False) -> None:
+        """
+        Process and write queued records until a None record is received.
+
+        :param reconnect: replace database connections that went away between records
+        :return: None
+        """
+        from django.db import close_old_connections
+
+        queue = self.queue
+        while True:
+            record = queue.get()
+            try:
+                if record is not None:
+                    if reconnect:
+                        close_old_connections()
+                    self.process(record)
+
+                if self.instances and (
+                    record is None or queue.empty() or len(self.instances) >= self.limit
+                ):
+                    self.write()
+            except Exception:
+                if record is None:
+                    traceback.print_exc()
+                else:
+                    self.handleError(record)
+            finally:
+                queue.task_done()
+
+            if record is None:
+                return
+
+    def writer_running(self) -> bool:
+        return (
+            self.writer is not None
+            and self.writer.is_alive()
+            and self.pid == os.getpid()
+        )
+
+    def flush(self) -> None:
+        """
+        wait until everything queued so far has been written,
+        for at most shutdown_timeout seconds
+        """
+        if not self.writer_running():
+            return
+
+        deadline = None
+        if self.shutdown_timeout is not None:
+            deadline = time.monotonic() + self.shutdown_timeout
+
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                if deadline is None:
+                    self.queue.all_tasks_done.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.queue.all_tasks_done.wait(remaining)
+
+    def close(self) -> None:
+        """ drain the queue and stop the background writer """
+        if self.writer_running():
+            self.queue.put(None)
+            self.writer.join(self.shutdown_timeout)
+        super(DatabaseHandler, self).close()
 
     def get_or_create(self, target: Type[Model], **kwargs) -> Tuple[Model, bool]:
         """
@@ -100,12 +251,17 @@ class DatabaseHandler(Handler):
         :type target: Model to be get_or_create
         :type kwargs: properties to be used to find and create the new object
         """
+        key = (target, tuple(sorted(kwargs.items())))
+        if key in self.pending:
+            return self.pending[key], False
+
         created = False
         try:
             instance = target.objects.get(**kwargs)
         except ObjectDoesNotExist:
             instance = target(**kwargs)
-            self.save(instance, commit=False, clear=False)
+            self.pending[key] = instance
+            self.save(instance, commit=False)
             created = True
 
         return instance, created
@@ -145,7 +301,7 @@ class DatabaseHandler(Handler):
             )
             if entry.type != instance.type:
                 entry.type = instance.type
-                self.save(entry, commit=False, clear=False)
+                self.save(entry, commit=False)
             return entry
 
         elif isinstance(instance, ModelEntry):
@@ -156,7 +312,7 @@ class DatabaseHandler(Handler):
             )
             if entry.value != instance.value:
                 entry.value = instance.value
-                self.save(entry, commit=False, clear=False)
+                self.save(entry, commit=False)
             return entry
 
         # ForeignObjectRel is untouched rn
@@ -174,7 +330,7 @@ class DatabaseHandler(Handler):
                 instance, field.name, self.prepare_save(getattr(instance, field.name))
             )
 
-        self.save(instance, commit=False, clear=False)
+        self.save(instance, commit=False)
         return instance
 
     def unspecified(self, record: LogRecord) -> None:
@@ -270,11 +426,10 @@ class DatabaseHandler(Handler):
         self.prepare_save(event)
         self.save(event)
 
-    def emit(self, record: LogRecord) -> None:
+    def process(self, record: LogRecord) -> None:
         """
-        Emit function that gets triggered for every log message in scope.
+        Turn the record into events according to the action set.
 
-        The record will be processed according to the action set.
         :param record:
         :return:
         """
@@ -287,3 +442,25 @@ class DatabaseHandler(Handler):
             return self.m2m(record, record.event, record.relationships, record.data)
         elif record.action == 'request':
             return self.request(record, record.event)
+
+    def emit(self, record: LogRecord) -> None:
+        """
+        Emit function that gets triggered for every log message in scope.
+
+        The record is either processed right away
+        or handed over to the background writer.
+        :param record:
+        :return:
+        """
+        if not self.threading:
+            return self.process(record)
+
+        self.start_writer()
+        if self.overflow == 'block':
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
@@ -110,6 +110,13 @@ class ModelSchema(BaseSchema):
     performance = Boolean(missing=False)
     snapshot = Boolean(missing=False)
 
+    # how the previous values of a saved instance are determined:
+    # init - remembered when the instance is loaded (post_init), no extra query
+    # query - the row is fetched again via the pk before every save
+    # 'init' treats saves of instances that were not loaded from the
+    # database (e.g. Model(pk=...).save()) as creations.
+    tracking = LowerCaseString(validate=OneOf(['init', 'query']), missing='init')
+
     max_age = Duration(missing=None)
 
 
@@ -4,13 +4,16 @@ File handles every signal related to the saving/deletion of django models.
 
 import logging
 from collections import namedtuple
+from copy import deepcopy
 from datetime import datetime
+from functools import wraps
 from pprint import pprint
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
-from django.db.models.signals import pre_save, post_save, post_delete
+from django.db.models import Model
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
 from django.dispatch import receiver
 
 from automated_logging.models import (
@@ -22,6 +25,7 @@ from automated_logging.models import (
 from automated_logging.settings import settings
 from automated_logging.signals import (
     model_exclusion,
+    cached_model_exclusion,
     lazy_model_exclusion,
     field_exclusion,
 )
@@ -35,6 +39,10 @@ from automated_logging.helpers.enums import PastOperationMap
 ChangeSet = namedtuple('ChangeSet', ('deleted', 'added', 'changed'))
 logger = logging.getLogger("automated_logging")
 
+# instance attribute holding the field values the instance had in the database,
+# prefixed with an underscore so that it never shows up as a modification
+SNAPSHOT_ATTRIBUTE = '_dal_snapshot'
+
 
 def normalize_save_value(value: Any):
     """ normalize the values given to the function to make stuff more readable """
@@ -46,11 +54,153 @@ def normalize_save_value(value: Any):
     return repr(value)
 
 
+def take_snapshot(
+    instance, update_fields: Optional[frozenset] = None, copy: bool = False
+) -> None:
+    """
+    Remember the current field values of the instance, modifications
+    are computed against them on the next save.
+
+    The values are only referenced, mutable values (e.g. JSONField) are
+    copied with copy=True, which is done after a save but not on load.
+
+    :param instance: model instance
+    :param update_fields: only remember these fields (save(update_fields=...))
+    :param copy: copy mutable values
+    :return: None
+    """
+    values = instance.__dict__
+    fields = instance._meta.concrete_fields
+
+    if update_fields is not None:
+        snapshot = values.get(SNAPSHOT_ATTRIBUTE)
+        if snapshot is None:
+            return
+        fields = [
+            f for f in fields if f.name in update_fields or f.attname in update_fields
+        ]
+    elif any(f.attname not in values for f in fields):
+        # deferred fields have no known value, the row is fetched on save instead
+        values.pop(SNAPSHOT_ATTRIBUTE, None)
+        return
+    else:
+        snapshot = values[SNAPSHOT_ATTRIBUTE] = {}
+
+    for field in fields:
+        value = values[field.attname]
+        if copy and isinstance(value, (dict, list)):
+            value = deepcopy(value)
+        snapshot[field.attname] = value
+
+
+def track_instance(
+    sender, instance, update_fields: Optional[frozenset] = None, copy: bool = False
+) -> None:
+    """
+    Snapshot the instance when model.tracking is 'init' and
+    modifications of the sender are logged at all.
+    """
+    if settings.model.tracking != 'init':
+        return
+
+    if cached_model_exclusion(sender, sender._meta, Operation.MODIFY):
+        return
+
+    take_snapshot(instance, update_fields, copy)
+
+
+def track_refresh(refresh_from_db):
+    """
+    Wrap Model.refresh_from_db to snapshot the reloaded values, they are
+    copied onto the instance without any signal being sent.
+    """
+
+    @wraps(refresh_from_db)
+    def wrapper(self, using=None, fields=None, **kwargs):
+        refreshed = None if fields is None else frozenset(fields)
+        refresh_from_db(self, using=using, fields=fields, **kwargs)
+        track_instance(self.__class__, self, refreshed)
+
+    wrapper.dal_tracked = True
+    return wrapper
+
+
+def patch_refresh_from_db() -> None:
+    """ keep the snapshots of refreshed instances up to date """
+    if not getattr(Model.refresh_from_db, 'dal_tracked', False):
+        Model.refresh_from_db = track_refresh(Model.refresh_from_db)
+
+
+def shared_values(sender, instance, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Mutable values the instance still shares with its snapshot may have been
+    modified in place, their previous values are read from the database.
+
+    :param sender: model class
+    :param instance: model instance
+    :param snapshot: snapshot of the instance
+    :return: previous values
+    """
+    values = instance.__dict__
+    shared = [
+        k
+        for k, v in snapshot.items()
+        if isinstance(v, (dict, list)) and values.get(k) is v
+    ]
+    if not shared:
+        return snapshot
+
+    row = sender.objects.filter(pk=instance.pk).values(*shared).first()
+    if row is None:
+        return snapshot
+    return {**snapshot, **row}
+
+
+def previous_values(sender, instance) -> Tuple[Operation, Dict[str, Any]]:
+    """
+    Determine the operation of the upcoming save and the
+    values the instance currently has in the database.
+
+    With model.tracking = 'init' these are taken from the snapshot of
+    the instance, otherwise (and for instances loaded with deferred fields)
+    the row is fetched via the pk.
+
+    :param sender: model class
+    :param instance: model instance
+    :return: operation, previous values
+    """
+    if settings.model.tracking == 'init':
+        if instance._state.adding:
+            return Operation.CREATE, {}
+
+        snapshot = instance.__dict__.get(SNAPSHOT_ATTRIBUTE)
+        if snapshot is not None:
+            return Operation.MODIFY, shared_values(sender, instance, snapshot)
+
+    with transaction.atomic():
+        try:
+            return Operation.MODIFY, sender.objects.get(pk=instance.pk).__dict__
+        except ObjectDoesNotExist:
+            return Operation.CREATE, {}
+
+
+@receiver(post_init, weak=False)
+def post_init_signal(sender, instance, **kwargs) -> None:
+    """
+    Remember the values every instance was loaded or created with.
+
+    :param sender: model class
+    :param instance: model instance
+    :param kwargs: django needs kwargs to be there
+    :return: None
+    """
+    track_instance(sender, instance)
+
+
 @receiver(pre_save, weak=False)
-@transaction.atomic
 def pre_save_signal(sender, instance, **kwargs) -> None:
     """
-    Compares the current instance and old instance (fetched via the pk)
+    Compares the current instance and the previous values of the instance
     and generates a dictionary of changes
 
     :param sender:
@@ -62,21 +212,19 @@ def pre_save_signal(sender, instance, **kwargs) -> None:
     # clear the event to be sure
     instance._meta.dal.event = None
 
-    operation = Operation.MODIFY
-    try:
-        pre = sender.objects.get(pk=instance.pk)
-    except ObjectDoesNotExist:
-        # __dict__ is used on pre, therefore we need to create a function
-        # that uses __dict__ too, but returns nothing.
+    # skip models that are never logged before looking up anything
+    if lazy_model_exclusion(
+        instance, Operation.CREATE, instance.__class__
+    ) and lazy_model_exclusion(instance, Operation.MODIFY, instance.__class__):
+        return
 
-        pre = lambda _: None
-        operation = Operation.CREATE
+    operation, old = previous_values(sender, instance)
 
     excluded = lazy_model_exclusion(instance, operation, instance.__class__)
     if excluded:
         return
 
-    old, new = pre.__dict__, instance.__dict__
+    new = instance.__dict__
 
     previously = set(
         k for k in old.keys() if not k.startswith('_') and old[k] is not None
@@ -230,6 +378,9 @@ def post_save_signal(
     :param kwargs: django needs kwargs to be there
     :return: -
     """
+    # the saved values are the ones to compare the next save with
+    track_instance(sender, instance, None if created else update_fields, copy=True)
+
     status = Operation.CREATE if created else Operation.MODIFY
     if lazy_model_exclusion(
         instance,
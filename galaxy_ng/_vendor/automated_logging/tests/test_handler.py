@@ -9,6 +9,7 @@ import time
 from django.http import JsonResponse
 from marshmallow import ValidationError
 
+from automated_logging.handlers import DatabaseHandler, delete_expired_events
 from automated_logging.helpers.exceptions import CouldNotConvertError
 from automated_logging.models import ModelEvent, RequestEvent, UnspecifiedEvent
 from automated_logging.tests.models import OrdinaryTest
@@ -47,6 +48,7 @@ class TestDatabaseHandlerTestCase(BaseTestCase):
         time.sleep(2)
 
         logger.info('A surprise, to be sure, but a welcome one.')
+        delete_expired_events()
 
         self.assertEqual(ModelEvent.objects.count(), 0)
         self.assertEqual(RequestEvent.objects.count(), 0)
@@ -65,6 +67,7 @@ class TestDatabaseHandlerTestCase(BaseTestCase):
         logger.info('I will do what I must.')
         time.sleep(1)
         logger.info('Hello There.')
+        delete_expired_events()
         self.assertEqual(UnspecifiedEvent.objects.count(), 1)
 
         settings.AUTOMATED_LOGGING['unspecified']['max_age'] = 1
@@ -74,6 +77,7 @@ class TestDatabaseHandlerTestCase(BaseTestCase):
         logger.info('A yes, the negotiator.')
         time.sleep(1)
         logger.info('Your tactics confuse and frighten me, sir.')
+        delete_expired_events()
         self.assertEqual(UnspecifiedEvent.objects.count(), 1)
 
         settings.AUTOMATED_LOGGING['unspecified']['max_age'] = 'PT1S'
@@ -83,6 +87,7 @@ class TestDatabaseHandlerTestCase(BaseTestCase):
         logger.info('Don\'t make me kill you.')
         time.sleep(1)
         logger.info('An old friend from the dead.')
+        delete_expired_events()
         self.assertEqual(UnspecifiedEvent.objects.count(), 1)
 
     def test_batching(self):
@@ -105,3 +110,45 @@ class TestDatabaseHandlerTestCase(BaseTestCase):
 
         config['handlers']['db']['batch'] = 1
         logging.config.dictConfig(config)
+
+    @staticmethod
+    def record(message):
+        record = logging.LogRecord(__name__, logging.INFO, __file__, 1, message, None, None)
+        record.message = record.getMessage()
+        return record
+
+    def test_background_writer(self):
+        handler = DatabaseHandler(threading=True, batch=100)
+        # run the writer in this thread instead, after everything was queued
+        handler.start_writer = lambda: None
+
+        self.clear()
+        for _ in range(20):
+            handler.emit(self.record('Now this is podracing'))
+        self.assertEqual(UnspecifiedEvent.objects.count(), 0)
+
+        handler.queue.put(None)
+        handler.drain()
+        self.assertEqual(UnspecifiedEvent.objects.count(), 20)
+
+    def test_background_writer_drop(self):
+        handler = DatabaseHandler(threading=True, queue_size=1, overflow='drop')
+        handler.start_writer = lambda: None
+
+        for _ in range(3):
+            handler.emit(self.record('I have a bad feeling about this'))
+        self.assertEqual(handler.queue.qsize(), 1)
+        self.assertEqual(handler.dropped, 2)
+
+    def test_background_writer_flush_timeout(self):
+        handler = DatabaseHandler(threading=True, shutdown_timeout=0.1)
+        handler.start_writer = lambda: None
+        # a writer that never catches up
+        handler.writer_running = lambda: True
+
+        handler.emit(self.record("It's a trap!"))
+
+        checkpoint = time.monotonic()
+        handler.flush()
+        self.assertLess(time.monotonic() - checkpoint, 5)
+        self.assertEqual(handler.queue.unfinished_tasks, 1)
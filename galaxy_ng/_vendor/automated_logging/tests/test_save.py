@@ -98,6 +98,71 @@ class LoggedOutSaveModificationsTestCase(BaseTestCase):
         relationships = event.relationships.all()
         self.assertEqual(relationships.count(), 0)
 
+    def test_modify_loaded(self):
+        """
+        test if modifications of a loaded instance are computed
+        from the values it was loaded with, without fetching it again
+        :return:
+        """
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        previous, current = random_string(10), random_string(10)
+
+        OrdinaryTest(random=previous).save()
+        instance = OrdinaryTest.objects.get()
+
+        ModelEvent.objects.all().delete()
+
+        instance.random = current
+        with CaptureQueriesContext(connection) as queries:
+            instance.save()
+
+        table = OrdinaryTest._meta.db_table
+        selects = [
+            q['sql']
+            for q in queries.captured_queries
+            if q['sql'].startswith('SELECT') and table in q['sql']
+        ]
+        self.assertEqual(selects, [])
+
+        modifications = ModelEvent.objects.get().modifications.all()
+        self.assertEqual(modifications.count(), 1)
+        self.assertEqual(modifications[0].previous, previous)
+        self.assertEqual(modifications[0].current, current)
+
+    def test_modify_refreshed(self):
+        """
+        test if modifications of a refreshed instance are computed
+        from the values it was refreshed with
+        :return:
+        """
+        for fields in (None, ['random']):
+            with self.subTest(fields=fields):
+                previous, other, current = (
+                    random_string(10),
+                    random_string(10),
+                    random_string(10),
+                )
+
+                instance = OrdinaryTest(random=previous)
+                instance.save()
+                instance = OrdinaryTest.objects.get(pk=instance.pk)
+
+                # modified elsewhere, without any signal
+                OrdinaryTest.objects.filter(pk=instance.pk).update(random=other)
+                instance.refresh_from_db(fields=fields)
+
+                ModelEvent.objects.all().delete()
+
+                instance.random = current
+                instance.save()
+
+                modifications = ModelEvent.objects.get().modifications.all()
+                self.assertEqual(modifications.count(), 1)
+                self.assertEqual(modifications[0].previous, other)
+                self.assertEqual(modifications[0].current, current)
+
     def test_honor_save(self):
         """
         test if saving honors the only attribute
@@ -1,11 +1,10 @@
 import contextlib
 import logging
 import os
+import uuid
 
 from django.conf import settings
-from django.contrib.auth.models import Permission
-from django.db.models import Q, Exists, OuterRef, CharField
-from django.db.models.functions import Cast
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import NotFound, ValidationError
 
@@ -54,6 +53,31 @@ def has_model_or_object_permissions(user, permission, obj):
     return user.has_perm(permission) or user.has_perm(permission, obj)
 
 
+def get_request_cache(request):
+    """
+    Return a dict that lives as long as the request, or None outside of one.
+
+    Every permission check made while serving a request (has_permission,
+    queryset scoping, a condition shared by several statements...) shares it.
+    """
+    if request is None:
+        return None
+    request = getattr(request, "_request", request)
+    try:
+        return request._galaxy_access_cache
+    except AttributeError:
+        request._galaxy_access_cache = {}
+        return request._galaxy_access_cache
+
+
+def _memoize(cache, key, func):
+    if cache is None:
+        return func()
+    if key not in cache:
+        cache[key] = func()
+    return cache[key]
+
+
 class MockPulpAccessPolicy:
     statements = None
     creation_hooks = None
@@ -118,12 +142,24 @@ class AccessPolicyBase(AccessPolicyFromDB):
     2. It can be subclassed and used as a permission class for viewsets in galaxy_ng. This allows
        for custom policy conditions to be declared for specific viewsets, rather than putting them
        in the base class.
+
+    Resolved policies, condition results, distributions and has_perm decisions are memoized
+    for the duration of the request (see get_request_cache), conditions should use
+    `_has_perm` and `_get_distribution_repository` instead of querying directly.
     """
 
     NAME = None
 
     @classmethod
     def get_access_policy(cls, view):
+        return _memoize(
+            get_request_cache(getattr(view, "request", None)),
+            ("access_policy", cls, type(view)),
+            lambda: cls._resolve_access_policy(view),
+        )
+
+    @classmethod
+    def _resolve_access_policy(cls, view):
         statements = GALAXY_STATEMENTS
 
         # If this is a galaxy access policy, load from the statement file
@@ -155,6 +191,72 @@ class AccessPolicyBase(AccessPolicyFromDB):
             }
         )
 
+    def _check_condition(self, condition, request, view, action):
+        return _memoize(
+            get_request_cache(request),
+            ("condition", type(self), condition, action, view, request.user.pk),
+            lambda: super(AccessPolicyBase, self)._check_condition(
+                condition, request, view, action
+            ),
+        )
+
+    def _has_perm(self, request, permission, obj=None):
+        user = request.user
+        if obj is None:
+            key = ("has_perm", user.pk, permission)
+        else:
+            key = ("has_perm", user.pk, permission, obj._meta.label, obj.pk)
+        return _memoize(
+            get_request_cache(request),
+            key,
+            lambda: user.has_perm(permission) if obj is None else user.has_perm(permission, obj),
+        )
+
+    def _has_model_or_object_perms(self, request, permission, obj):
+        return self._has_perm(request, permission) or self._has_perm(request, permission, obj)
+
+    def _get_distribution_repository(self, request, base_path):
+        """The cast repository of the AnsibleDistribution with this base_path."""
+        def lookup():
+            distro = ansible_models.AnsibleDistribution.objects.select_related(
+                "repository"
+            ).get(base_path=base_path)
+            return distro.repository.cast()
+
+        return _memoize(get_request_cache(request), ("distribution", base_path), lookup)
+
+    def _get_visible_private_repository_pks(self, request):
+        """
+        Pks of the repositories the user has view_ansiblerepository on through a user or
+        group role, computed once per request.
+        """
+        def lookup():
+            user = request.user
+            role_filter = {
+                "role__permissions__content_type__app_label": "ansible",
+                "role__permissions__codename": "view_ansiblerepository",
+                "object_id__isnull": False,
+            }
+            object_ids = set(
+                UserRole.objects.filter(user=user, **role_filter)
+                .values_list("object_id", flat=True)
+            )
+            object_ids.update(
+                GroupRole.objects.filter(group__in=user.groups.all(), **role_filter)
+                .values_list("object_id", flat=True)
+            )
+            pks = set()
+            for object_id in object_ids:
+                with contextlib.suppress(ValueError):
+                    pks.add(uuid.UUID(object_id))
+            return pks
+
+        return _memoize(
+            get_request_cache(request),
+            ("visible_private_repository_pks", request.user.pk),
+            lookup,
+        )
+
     def scope_by_view_repository_permissions(self, view, qs, field_name="", is_generic=True):
         """
         Returns objects with a repository foreign key that are connected to a public
@@ -163,11 +265,10 @@ class AccessPolicyBase(AccessPolicyFromDB):
         is_generic should be set to True when repository is a FK to the generic Repository
         object and False when it's a FK to AnsibleRepository
         """
-        user = view.request.user
-        if user.has_perm("ansible.view_ansiblerepository"):
+        request = view.request
+        user = request.user
+        if self._has_perm(request, "ansible.view_ansiblerepository"):
             return qs
-        view_perm = Permission.objects.get(
-            content_type__app_label="ansible", codename="view_ansiblerepository")
 
         if field_name:
             field_name = field_name + "__"
@@ -180,26 +281,9 @@ class AccessPolicyBase(AccessPolicyFromDB):
         if user.is_anonymous:
             qs = qs.filter(private_q)
         else:
-            user_roles = UserRole.objects.filter(user=user, role__permissions=view_perm).filter(
-                object_id=OuterRef("repo_pk_str"))
-
-            group_roles = GroupRole.objects.filter(
-                group__in=user.groups.all(),
-                role__permissions=view_perm
-            ).filter(
-                object_id=OuterRef("repo_pk_str"))
-
-            qs = qs.annotate(
-                repo_pk_str=Cast(f"{field_name}pk", output_field=CharField())
-            ).annotate(
-                has_user_role=Exists(user_roles)
-            ).annotate(
-                has_group_roles=Exists(group_roles)
-            ).filter(
-                private_q
-                | Q(has_user_role=True)
-                | Q(has_group_roles=True)
-            )
+            # the generic Repository and AnsibleRepository share their pk
+            visible_pks = self._get_visible_private_repository_pks(request)
+            qs = qs.filter(private_q | Q(**{f"{field_name}pk__in": visible_pks}))
 
         return qs
 
@@ -249,22 +333,19 @@ class AccessPolicyBase(AccessPolicyFromDB):
         )
 
         if path:
-            distro = ansible_models.AnsibleDistribution.objects.get(base_path=path)
-            repo = distro.repository
-            repo = repo.cast()
+            repo = self._get_distribution_repository(request, path)
 
             if repo.private:
-                perm = "ansible.view_ansiblerepository"
-                return request.user.has_perm(perm) or request.user.has_perm(perm, repo)
+                return self._has_model_or_object_perms(
+                    request, "ansible.view_ansiblerepository", repo
+                )
 
         return True
 
     def v3_can_destroy_collections(self, request, view, action):
-        user = request.user
-
         # first check for global permissions ...
         for delete_permission in ["galaxy.change_namespace", "ansible.delete_collection"]:
-            if user.has_perm(delete_permission):
+            if self._has_perm(request, delete_permission):
                 return True
 
         # could be a collection or could be a collectionversion ...
@@ -281,11 +362,11 @@ class AccessPolicyBase(AccessPolicyFromDB):
         namespace = models.Namespace.objects.get(name=collection.namespace)
 
         # check namespace object level permissions ...
-        if user.has_perm("galaxy.change_namespace", namespace):
+        if self._has_perm(request, "galaxy.change_namespace", namespace):
             return True
 
         # check collection object level permissions ...
-        if user.has_perm("ansible.delete_collection", collection):  # noqa: SIM103
+        if self._has_perm(request, "ansible.delete_collection", collection):  # noqa: SIM103
             return True
 
         return False
@@ -302,7 +383,7 @@ class AccessPolicyBase(AccessPolicyFromDB):
         if is_github_social_auth:
             return True
 
-        if request.user.has_perm('galaxy.view_user'):  # noqa: SIM103
+        if self._has_perm(request, 'galaxy.view_user'):  # noqa: SIM103
             return True
 
         return False
@@ -314,7 +395,7 @@ class AccessPolicyBase(AccessPolicyFromDB):
 
         View actions are only enforced when the repo is private.
         """
-        if request.user.has_perm(permission):
+        if self._has_perm(request, permission):
             return True
 
         try:
@@ -335,14 +416,14 @@ class AccessPolicyBase(AccessPolicyFromDB):
         if permission == "ansible.view_ansiblerepository" and not repo.private:
             return True
 
-        return request.user.has_perm(permission, repo)
+        return self._has_perm(request, permission, repo)
 
     def can_copy_or_move(self, request, view, action, permission):
         """
         Check if the user has model or object-level permissions
         on the source and destination repositories.
         """
-        if request.user.has_perm(permission):
+        if self._has_perm(request, permission):
             return True
 
         # accumulate all the objects to check for permission
@@ -360,7 +441,7 @@ class AccessPolicyBase(AccessPolicyFromDB):
         # have to check `repos_to_check and all(...)` because `all([])` on an empty
         # list would return True
         return repos_to_check and all(
-            request.user.has_perm(permission, repo) for repo in repos_to_check
+            self._has_perm(request, permission, repo) for repo in repos_to_check
         )
 
     def _get_rh_identity(self, request):
@@ -396,11 +477,7 @@ class AccessPolicyBase(AccessPolicyFromDB):
             return False
         collection = view.get_object()
         namespace = models.Namespace.objects.get(name=collection.namespace)
-        return has_model_or_object_permissions(
-            request.user,
-            "galaxy.upload_to_namespace",
-            namespace
-        )
+        return self._has_model_or_object_perms(request, "galaxy.upload_to_namespace", namespace)
 
     def can_create_collection(self, request, view, permission):
         data = view._get_data(request)
@@ -409,8 +486,8 @@ class AccessPolicyBase(AccessPolicyFromDB):
         except models.Namespace.DoesNotExist:
             raise NotFound(_("Namespace in filename not found."))
 
-        can_upload_to_namespace = has_model_or_object_permissions(
-            request.user,
+        can_upload_to_namespace = self._has_model_or_object_perms(
+            request,
             "galaxy.upload_to_namespace",
             namespace
         )
@@ -420,7 +497,7 @@ class AccessPolicyBase(AccessPolicyFromDB):
 
         path = view._get_path()
         try:
-            repo = ansible_models.AnsibleDistribution.objects.get(base_path=path).repository.cast()
+            repo = self._get_distribution_repository(request, path)
             pipeline = repo.pulp_labels.get("pipeline", None)
 
             # if uploading to a staging repo, don't check any additional perms
@@ -430,8 +507,8 @@ class AccessPolicyBase(AccessPolicyFromDB):
             # if no pipeline is declared on the repo, verify that the user can modify the
             # repo contents.
             elif pipeline is None:
-                return has_model_or_object_permissions(
-                    request.user,
+                return self._has_model_or_object_perms(
+                    request,
                     "ansible.modify_ansible_repo_content",
                     repo
                 )
@@ -446,7 +523,9 @@ class AccessPolicyBase(AccessPolicyFromDB):
         # Repository is required on the CollectionSign payload
         # Assumed that if user can modify repo they can sign everything in it
         repository = view.get_repository(request)
-        can_modify_repo = request.user.has_perm('ansible.modify_ansible_repo_content', repository)
+        can_modify_repo = self._has_perm(
+            request, 'ansible.modify_ansible_repo_content', repository
+        )
 
         # Payload can optionally specify a namespace to filter its contents
         # Assumed that if user has access to modify namespace they can sign its contents.
@@ -455,8 +534,8 @@ class AccessPolicyBase(AccessPolicyFromDB):
                 namespace = models.Namespace.objects.get(name=namespace)
             except models.Namespace.DoesNotExist:
                 raise NotFound(_('Namespace not found.'))
-            return can_modify_repo and has_model_or_object_permissions(
-                request.user,
+            return can_modify_repo and self._has_model_or_object_perms(
+                request,
                 "galaxy.upload_to_namespace",
                 namespace
             )
@@ -474,7 +553,7 @@ class AccessPolicyBase(AccessPolicyFromDB):
     def has_concrete_perms(self, request, view, action, permission):
         # Function the same as has_model_or_object_perms, but uses the concrete model
         # instead of the proxy model
-        if request.user.has_perm(permission):
+        if self._has_perm(request, permission):
             return True
 
         # if the object is a proxy object, get the concrete object and use that for the
@@ -483,7 +562,7 @@ class AccessPolicyBase(AccessPolicyFromDB):
         if obj._meta.proxy:
             obj = obj._meta.concrete_model.objects.get(pk=obj.pk)
 
-        return request.user.has_perm(permission, obj)
+        return self._has_perm(request, permission, obj)
 
     def signatures_not_required_for_repo(self, request, view, action):
         """
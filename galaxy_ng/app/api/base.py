@@ -1,6 +1,12 @@
+import hashlib
+import json
 from collections import OrderedDict
 
 from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
 
 from rest_framework import (
     serializers,
@@ -9,7 +15,7 @@ from rest_framework import (
     permissions,
     generics
 )
-
+from rest_framework.response import Response
 from rest_framework.settings import perform_import
 
 
@@ -41,6 +47,119 @@ class LocalSettingsMixin:
         return GALAXY_EXCEPTION_HANDLER
 
 
+class _ConditionalResponse(Exception):
+    """Answers a request without running the view."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    Adds a strong ETag to GET responses and answers If-None-Match with
+    304 Not Modified right after the permission checks, before the view
+    builds its queryset.
+
+    The ETag is derived from the repository versions returned by
+    get_etag_repository_versions(), the path, the query parameters, the
+    accepted media types, get_etag_scope() and get_etag_extra(), so only
+    views whose response depends on nothing else may use it. Returning None from
+    get_etag_repository_versions() disables it for the request, views with
+    their own notion of a version override get_etag() instead.
+
+    With GALAXY_API_RESPONSE_CACHE_TTL set, rendered responses are also
+    kept in the shared cache under their ETag.
+
+    Must come before the view base class:
+
+    class MyViewSet(api_base.ConditionalGetMixin, api_base.GenericViewSet):
+        def get_etag_repository_versions(self):
+            return [self.repository.latest_version()]
+    """
+
+    etag = None
+
+    def get_etag_repository_versions(self):
+        raise NotImplementedError("subclass must implement get_etag_repository_versions()")
+
+    def get_etag_scope(self):
+        """What the user is allowed to see, the user and their groups by default."""
+        user = self.request.user
+        if not user.is_authenticated:
+            return None
+        return [user.pk, sorted(user.groups.values_list("pk", flat=True))]
+
+    def get_etag_extra(self):
+        """Anything else the response depends on, as JSON serializable data."""
+        return None
+
+    def get_etag(self):
+        repository_versions = self.get_etag_repository_versions()
+        if repository_versions is None:
+            return None
+
+        request = self.request
+        parts = [
+            request.path,
+            sorted(request.query_params.lists()),
+            request.META.get("HTTP_ACCEPT", ""),
+            self.get_etag_scope(),
+            [str(version.pk) if version else None for version in repository_versions],
+            self.get_etag_extra(),
+        ]
+        digest = hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+        return f'"{digest}"'
+
+    def _get_response_cache_key(self):
+        return f"galaxy_api_response:{self.etag}"
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in ("GET", "HEAD"):
+            return
+
+        self.etag = self.get_etag()
+        if self.etag is None:
+            return
+
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+        if if_none_match:
+            # If-None-Match uses the weak comparison
+            etags = {etag.removeprefix("W/") for etag in parse_etags(if_none_match)}
+            if self.etag in etags or "*" in etags:
+                raise _ConditionalResponse(Response(status=304))
+
+        if settings.get("GALAXY_API_RESPONSE_CACHE_TTL"):
+            cached = cache.get(self._get_response_cache_key())
+            if cached is not None:
+                content, content_type = cached
+                raise _ConditionalResponse(HttpResponse(content, content_type=content_type))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _ConditionalResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.etag is None or response.status_code not in (200, 304):
+            return response
+
+        response["ETag"] = self.etag
+        patch_vary_headers(response, ["Accept"])
+
+        ttl = settings.get("GALAXY_API_RESPONSE_CACHE_TTL")
+        if ttl and response.status_code == 200 and isinstance(response, Response):
+            response.render()
+            cache.set(
+                self._get_response_cache_key(),
+                (response.content, response["Content-Type"]),
+                ttl,
+            )
+        return response
+
+
 class APIView(LocalSettingsMixin, views.APIView):
     pass
 
@@ -52,6 +52,7 @@ class IndexRegistryEEView(api_base.APIView):
                 "registry_pk": registry.pk,
                 "request_data": request_data
             },
+            exclusive_resources=["/api/v3/distributions/"]
         )
 
         return OperationPostponedResponse(result, self.request)
@@ -1,12 +1,52 @@
 from galaxy_ng.app.access_control import access_policy
-from random import sample
+from random import randint
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Min
 from rest_framework.response import Response
 from pulp_ansible.app.models import CollectionVersion, AnsibleDistribution
 from galaxy_ng.app.models import Namespace
-from galaxy_ng.app import settings
 from galaxy_ng.app.api import base as api_base
 
 
+LANDING_PAGE_CACHE_KEY_PREFIX = "galaxy_landing_page"
+PARTNERS_CACHE_KEY = f"{LANDING_PAGE_CACHE_KEY_PREFIX}:partners"
+
+
+def invalidate_partners_cache():
+    cache.delete(PARTNERS_CACHE_KEY)
+
+
+def _get_collection_count(repository_version):
+    """Highest collection versions in the repository version, cached per version."""
+    return cache.get_or_set(
+        f"{LANDING_PAGE_CACHE_KEY_PREFIX}:collections:{repository_version.pk}",
+        lambda: CollectionVersion.objects.filter(
+            pk__in=repository_version.content, is_highest=True
+        ).count(),
+        settings.get("GALAXY_LANDING_PAGE_CACHE_TTL"),
+    )
+
+
+def _get_partners():
+    """Number of namespaces and the range of their ids."""
+    return cache.get_or_set(
+        PARTNERS_CACHE_KEY,
+        lambda: Namespace.objects.aggregate(count=Count("pk"), min_pk=Min("pk"), max_pk=Max("pk")),
+        settings.get("GALAXY_LANDING_PAGE_CACHE_TTL"),
+    )
+
+
+def _get_random_partner(partners):
+    """
+    Pick a namespace via the primary key index, ids freed by deleted
+    namespaces make the next namespace a bit more likely to be picked.
+    """
+    pk = randint(partners["min_pk"], partners["max_pk"])
+    namespaces = Namespace.objects.order_by("pk")
+    return namespaces.filter(pk__gte=pk).first() or namespaces.first()
+
+
 class LandingPageView(api_base.APIView):
     permission_classes = [access_policy.LandingPageAccessPolicy]
     action = "retrieve"
@@ -16,16 +56,15 @@ class LandingPageView(api_base.APIView):
 
         distro = AnsibleDistribution.objects.get(base_path=golden_name)
         repository_version = distro.repository.latest_version()
-        collection_count = CollectionVersion.objects.filter(
-            pk__in=repository_version.content, is_highest=True
-        ).count()
+        collection_count = _get_collection_count(repository_version)
 
-        partner_count = Namespace.objects.count()
+        partners = _get_partners()
+        partner_count = partners["count"]
 
         # If there are no partners dont show the recommendation for it
         recommendations = {}
-        if partner_count > 0:
-            namespace = sample(list(Namespace.objects.all()), 1)[0]
+        namespace = _get_random_partner(partners) if partner_count > 0 else None
+        if namespace is not None:
             recommendations = {
                 "recs": [
                     {
@@ -1,33 +1,14 @@
-from django.contrib.postgres.aggregates import JSONBAgg
 from django.contrib.postgres.search import SearchQuery
-from django.db.models import (
-    Exists,
-    F,
-    FloatField,
-    Func,
-    JSONField,
-    OuterRef,
-    Q,
-    Subquery,
-    Value,
-)
-from django.db.models.fields.json import KT
-from django.db.models.functions import Coalesce
+from django.db.models import F, FloatField, Func, Q, Value
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
-from pulp_ansible.app.models import (
-    AnsibleCollectionDeprecated,
-    CollectionDownloadCount,
-    CollectionVersion,
-)
 from rest_framework import mixins
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
 
 from galaxy_ng.app.api import base as api_base
 from galaxy_ng.app.api.ui.v1.serializers import SearchResultsSerializer
-from galaxy_ng.app.api.v1.models import LegacyRole
-from galaxy_ng.app.models.namespace import Namespace
+from galaxy_ng.app.models import SearchDocument
 
 FILTER_PARAMS = [
     "keywords",
@@ -148,7 +129,7 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
         return super().list(*args, **kwargs)
 
     def get_queryset(self):
-        """Returns the UNION ALL from CollectionVersion and LegacyRole"""
+        """Returns the matching collection and role SearchDocuments"""
         request = self.request
         self.filter_params = self.get_filter_params(request)
         self.sort = self.get_sorting_param(request)
@@ -156,7 +137,7 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
         return qs
 
     def get_search_results(self, filter_params, sort):
-        """Validates filter_params, builds each queryset and then unionize and apply filters."""
+        """Validates filter_params, builds the queryset and then apply filters."""
         type_ = filter_params.get("type", "").lower()
         if type_ not in ("role", "collection", ""):
             raise ValidationError("'type' must be ['collection', 'role']")
@@ -169,16 +150,8 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
         if keywords and search_type == "websearch":
             query = SearchQuery(keywords, search_type="websearch")
 
-        collections = self.get_collection_queryset(query=query)
-        roles = self.get_role_queryset(query=query)
-        result_qs = self.filter_and_sort(
-            collections,
-            roles,
-            filter_params,
-            sort,
-            type_,
-            query=query
-        )
+        documents = self.get_document_queryset(query=query)
+        result_qs = self.filter_and_sort(documents, filter_params, sort, type_, query=query)
         return result_qs
 
     def get_filter_params(self, request):
@@ -202,52 +175,8 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
             raise ValidationError("'order_by=relevance' works only with 'search_type=websearch'")
         return sort
 
-    def get_collection_queryset(self, query=None):
-        """Build the CollectionVersion queryset from annotations."""
-        deprecated_qs = AnsibleCollectionDeprecated.objects.filter(
-            namespace=OuterRef("namespace"), name=OuterRef("name")
-        )
-        download_count_qs = CollectionDownloadCount.objects.filter(
-            namespace=OuterRef("namespace"), name=OuterRef("name")
-        )
-        namespace_qs = Namespace.objects.filter(name=OuterRef("namespace"))
-
-        relevance = Value(0)
-        if query:
-            relevance = Func(
-                F("search_vector"),
-                query,
-                RANK_NORMALIZATION,
-                function="ts_rank",
-                output_field=FloatField(),
-            )
-
-        # The order of the fields here is important, must match the role_queryset
-        qs = (
-            CollectionVersion.objects.annotate(
-                namespace_name=F("namespace"),
-                description_text=F("description"),
-                platform_names=Value([], JSONField()),  # There is no platforms for collections
-                tag_names=JSONBAgg("tags__name"),
-                content_type=Value("collection"),
-                last_updated=F("timestamp_of_interest"),
-                deprecated=Exists(deprecated_qs),
-                download_count=Coalesce(
-                    Subquery(download_count_qs.values("download_count")[:1]), Value(0)
-                ),
-                latest_version=F("version"),
-                content_list=F("contents"),
-                namespace_avatar=Subquery(namespace_qs.values("_avatar_url")),
-                search=F("search_vector"),
-                relevance=relevance,
-            )
-            .values(*QUERYSET_VALUES)
-            .filter(is_highest=True)
-        )
-        return qs
-
-    def get_role_queryset(self, query=None):
-        """Build the LegacyRole queryset from annotations."""
+    def get_document_queryset(self, query=None):
+        """Build the SearchDocument queryset, documents are kept current by database triggers."""
         relevance = Value(0)
         if query:
             relevance = Func(
@@ -257,26 +186,10 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
                 function="ts_rank",
                 output_field=FloatField(),
             )
-        # The order of the fields here is important, must match the collection_queryset
-        qs = LegacyRole.objects.annotate(
-            namespace_name=F("namespace__name"),
-            description_text=KT("full_metadata__description"),
-            platform_names=F("full_metadata__platforms"),
-            tag_names=F("full_metadata__tags"),
-            content_type=Value("role"),
-            last_updated=F("created"),
-            deprecated=Value(False),  # there is no deprecation for roles
-            download_count=Coalesce(F("legacyroledownloadcount__count"), Value(0)),
-            latest_version=KT("full_metadata__versions__-1__version"),
-            content_list=Value([], JSONField()),  # There is no contents for roles
-            namespace_avatar=F("namespace__namespace___avatar_url"),  # v3 namespace._avatar_url
-            search=F("legacyrolesearchvector__search_vector"),
-            relevance=relevance,
-        ).values(*QUERYSET_VALUES)
-        return qs
+        return SearchDocument.objects.annotate(relevance=relevance).values(*QUERYSET_VALUES)
 
-    def filter_and_sort(self, collections, roles, filter_params, sort, type_="", query=None):
-        """Apply filters individually on each queryset and then combine to sort."""
+    def filter_and_sort(self, documents, filter_params, sort, type_="", query=None):
+        """Apply filters on the documents and sort."""
         facets = {}
         if deprecated := filter_params.get("deprecated"):
             if deprecated.lower() not in ("true", "false"):
@@ -286,24 +199,23 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
             facets["name__iexact"] = name
         if namespace := filter_params.get("namespace"):
             facets["namespace_name__iexact"] = namespace
+        if type_:
+            facets["content_type"] = type_
         if facets:
-            collections = collections.filter(**facets)
-            roles = roles.filter(**facets)
+            documents = documents.filter(**facets)
 
         if tags := filter_params.get("tags"):
             tag_filter = Q()
             for tag in tags:
                 tag_filter &= Q(tag_names__icontains=tag)
-            collections = collections.filter(tag_filter)
-            roles = roles.filter(tag_filter)
+            documents = documents.filter(tag_filter)
 
         if platform := filter_params.get("platform"):
-            roles = roles.filter(full_metadata__platforms__icontains=platform)
-            collections = collections.filter(platform_names=platform)  # never match but required
+            # There is no platforms for collections
+            documents = documents.filter(content_type="role", platform_names__icontains=platform)
 
         if query:
-            collections = collections.filter(search=query)
-            roles = roles.filter(search=query)
+            documents = documents.filter(search=query)
         elif keywords := filter_params.get("keywords"):
             query = (
                 Q(name__icontains=keywords)
@@ -312,16 +224,10 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
                 | Q(tag_names__icontains=keywords)
                 | Q(platform_names__icontains=keywords)
             )
-            collections = collections.filter(query)
-            roles = roles.filter(query)
-
-        if type_.lower() == "role":
-            qs = roles.order_by(*sort)
-        elif type_.lower() == "collection":
-            qs = collections.order_by(*sort)
-        else:
-            qs = collections.union(roles, all=True).order_by(*sort)
-        return qs
+            documents = documents.filter(query)
+
+        # id breaks ties so pages don't overlap between equally ranked documents
+        return documents.order_by(*sort, "id")
 
 
 def test():
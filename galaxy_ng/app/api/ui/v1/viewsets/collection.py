@@ -1,4 +1,5 @@
-from django.db.models import Exists, OuterRef, Q, Value, F, Func, CharField
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Exists, Max, OuterRef, Q, Value
 from django.db.models import When, Case
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import Http404
@@ -17,6 +18,7 @@ from pulp_ansible.app.models import (
     CollectionRemote,
 )
 from pulp_ansible.app.models import CollectionImport as PulpCollectionImport
+from pulpcore.plugin.models.role import GroupRole, UserRole
 from rest_framework import mixins
 from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
@@ -26,6 +28,8 @@ from galaxy_ng.app.api import base as api_base
 from galaxy_ng.app.access_control import access_policy
 from galaxy_ng.app.api.ui.v1 import serializers, versioning
 from galaxy_ng.app.api.v3.serializers.sync import CollectionRemoteSerializer
+from galaxy_ng.app.models import HighestCollectionVersion, Namespace
+from galaxy_ng.app.utils import semver
 
 
 class CollectionByCollectionVersionFilter(pulp_ansible_viewsets.CollectionVersionFilter):
@@ -52,6 +56,7 @@ class CollectionByCollectionVersionFilter(pulp_ansible_viewsets.CollectionVersio
 
 
 class CollectionViewSet(
+    api_base.ConditionalGetMixin,
     api_base.GenericViewSet,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -67,6 +72,23 @@ class CollectionViewSet(
     filterset_class = CollectionByCollectionVersionFilter
     permission_classes = [access_policy.CollectionAccessPolicy]
 
+    def get_etag_repository_versions(self):
+        return [self._repository_version]
+
+    def get_etag_extra(self):
+        # every collection embeds its namespace, including the groups and
+        # users with roles on it, which change without a new repository version
+        namespace_type = ContentType.objects.get_for_model(Namespace)
+        return [
+            Namespace.objects.aggregate(updated=Max("updated"), count=Count("pk")),
+            *(
+                role_model.objects.filter(content_type=namespace_type).aggregate(
+                    updated=Max("pulp_last_updated"), count=Count("pk")
+                )
+                for role_model in (GroupRole, UserRole)
+            ),
+        ]
+
     def get_queryset(self):
         """Returns a CollectionVersions queryset for specified distribution."""
         if getattr(self, "swagger_fake_view", False):
@@ -76,22 +98,14 @@ class CollectionViewSet(
         if path is None:
             raise Http404(_("Distribution base path is required"))
 
-        base_versions_query = CollectionVersion.objects.filter(pk__in=self._distro_content)
-
-        # Build a dict to be used by the annotation filter at the end of the method
-        collection_versions = {}
-        for collection_id, version in base_versions_query.values_list("collection_id", "version"):
-            value = collection_versions.get(str(collection_id))
-            if not value or semantic_version.Version(version) > semantic_version.Version(value):
-                collection_versions[str(collection_id)] = version
-
         deprecated_query = AnsibleCollectionDeprecated.objects.filter(
             namespace=OuterRef("namespace"),
             name=OuterRef("name"),
             pk__in=self._distro_content,
         )
 
-        if not collection_versions.items():
+        repository_version = self._repository_version
+        if repository_version is None:
             return CollectionVersion.objects.none().annotate(
                 # AAH-122: annotated filterable fields must exist in all the returned querysets
                 #          in order for filters to work.
@@ -99,35 +113,25 @@ class CollectionViewSet(
                 sign_state=Value("unsigned"),
             )
 
-        # The main queryset to be annotated
-        version_qs = base_versions_query.select_related("collection")
-
-        # AAH-1484 - replacing `Q(collection__id, version)` with this annotation
-        # This builds `61505561-f806-4ddd-8f53-c403f0ec04ed:3.2.9` for each row.
-        # this is done to be able to filter at the end of this method and
-        # return collections only once and only for its highest version.
-        version_identifier_expression = Func(
-            F("collection__pk"), Value(":"), F("version"),
-            function="concat",
-            output_field=CharField(),
+        # Only the highest version of each collection, indexed when the
+        # repository version was created.
+        highest_versions = HighestCollectionVersion.objects.for_repository_version(
+            repository_version
         )
 
+        # The main queryset to be annotated
+        version_qs = CollectionVersion.objects.filter(
+            pk__in=highest_versions.values("collection_version_id")
+        ).select_related("collection")
+
         version_qs = version_qs.annotate(
             deprecated=Exists(deprecated_query),
-            version_identifier=version_identifier_expression,
             sign_state=Case(
                 When(signatures__pk__in=self._distro_content, then=Value("signed")),
                 default=Value("unsigned"),
             )
         )
 
-        # AAH-1484 - filtering by version_identifier
-        version_qs = version_qs.filter(
-            version_identifier__in=[
-                ":".join([pk, version]) for pk, version in collection_versions.items()
-            ]
-        )
-
         return version_qs
 
     def get_object(self):
@@ -187,12 +191,7 @@ class CollectionVersionFilter(filterset.FilterSet):
 
     def version_range_filter(self, queryset, name, value):
         try:
-            s = semantic_version.SimpleSpec(value)
-            full_version_list = [
-                semantic_version.Version(v) for v in queryset.values_list('version', flat=True)]
-            version_list = [str(v) for v in s.filter(full_version_list)]
-
-            return queryset.filter(version__in=version_list)
+            return semver.filter_by_spec(queryset, semantic_version.SimpleSpec(value))
         except ValueError:
             raise ValidationError(_('{} must be a valid semantic version range.').format(name))
 
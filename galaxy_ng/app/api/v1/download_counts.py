@@ -0,0 +1,190 @@
+"""
+Buffered download counter for legacy roles.
+
+Every role install from the CLI used to lock the role's LegacyRoleDownloadCount
+row to increment it. Instead the increments are accumulated per role, in Redis
+when a connection is configured or in process memory otherwise, and written
+periodically with a single `UPDATE ... SET count = count + delta` per role.
+
+    record_role_download(role.pk)   # called on every install
+    flush_role_download_counts()    # called every
+                                    # GALAXY_LEGACY_ROLE_DOWNLOAD_COUNT_FLUSH_INTERVAL
+                                    # seconds by the request that finds it due
+                                    # and when the process exits.
+
+With Redis, the counts left behind by the last downloads are written by
+scheduling the flush as a task:
+
+    django-admin task-scheduler --id flush_role_download_counts
+        --path galaxy_ng.app.api.v1.download_counts.flush_role_download_counts --interval 1
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.utils import InternalError as DatabaseInternalError
+
+from galaxy_ng.app.api.v1.models import LegacyRole, LegacyRoleDownloadCount
+from galaxy_ng.app.common import metrics
+from galaxy_ng.app.tasks.settings_cache import (
+    acquire_lock,
+    connection_error_wrapper,
+    get_redis_connection,
+)
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "GALAXY_LEGACY_ROLE_DOWNLOADS"
+PENDING_SINCE_KEY = "GALAXY_LEGACY_ROLE_DOWNLOADS_SINCE"
+FLUSH_LOCK_NAME = "legacy_role_download_counts"
+
+# used when there is no Redis connection, each process flushes its own deltas
+_pending = {}
+_pending_since = None
+_last_flush = time.monotonic()
+_lock = threading.Lock()
+
+
+def _flush_interval():
+    return settings.get("GALAXY_LEGACY_ROLE_DOWNLOAD_COUNT_FLUSH_INTERVAL", 10)
+
+
+@connection_error_wrapper(default=lambda: False)
+def _redis_record(conn, role_id):
+    pipe = conn.pipeline()
+    pipe.hincrby(PENDING_KEY, role_id, 1)
+    pipe.set(PENDING_SINCE_KEY, time.time(), nx=True)
+    pipe.execute()
+    return True
+
+
+@connection_error_wrapper(default=lambda: ({}, None))
+def _redis_take(conn):
+    pipe = conn.pipeline(transaction=True)
+    pipe.hgetall(PENDING_KEY)
+    pipe.get(PENDING_SINCE_KEY)
+    pipe.delete(PENDING_KEY, PENDING_SINCE_KEY)
+    pending, since, _ = pipe.execute()
+    return {int(k): int(v) for k, v in pending.items()}, since and float(since)
+
+
+@connection_error_wrapper(default=lambda: False)
+def _redis_restore(conn, pending, since):
+    pipe = conn.pipeline()
+    for role_id, delta in pending.items():
+        pipe.hincrby(PENDING_KEY, role_id, delta)
+    pipe.set(PENDING_SINCE_KEY, since or time.time(), nx=True)
+    pipe.execute()
+    return True
+
+
+def record_role_download(role_id):
+    """Count one download of the role, the database is updated on the next flush."""
+    global _pending_since
+
+    conn = get_redis_connection()
+    if conn is None or not _redis_record(conn, role_id):
+        with _lock:
+            _pending[role_id] = _pending.get(role_id, 0) + 1
+            if _pending_since is None:
+                _pending_since = time.time()
+
+    if time.monotonic() - _last_flush >= _flush_interval():
+        flush_role_download_counts(lock=True)
+
+
+def _take_pending(conn):
+    global _pending, _pending_since
+
+    with _lock:
+        pending, since = _pending, _pending_since
+        _pending, _pending_since = {}, None
+
+    if conn is not None:
+        redis_pending, redis_since = _redis_take(conn)
+        for role_id, delta in redis_pending.items():
+            pending[role_id] = pending.get(role_id, 0) + delta
+        if redis_since and (since is None or redis_since < since):
+            since = redis_since
+
+    return pending, since
+
+
+def _restore_pending(conn, pending, since):
+    global _pending_since
+
+    if conn is not None and _redis_restore(conn, pending, since):
+        return
+
+    with _lock:
+        for role_id, delta in pending.items():
+            _pending[role_id] = _pending.get(role_id, 0) + delta
+        if since and (_pending_since is None or since < _pending_since):
+            _pending_since = since
+
+
+def _write_counts(pending):
+    existing = set(
+        LegacyRole.objects.filter(pk__in=pending.keys()).values_list("pk", flat=True)
+    )
+    with transaction.atomic():
+        LegacyRoleDownloadCount.objects.bulk_create(
+            [LegacyRoleDownloadCount(legacyrole_id=role_id, count=0) for role_id in existing],
+            ignore_conflicts=True,
+        )
+        for role_id in sorted(existing):
+            LegacyRoleDownloadCount.objects.filter(legacyrole_id=role_id).update(
+                count=F("count") + pending[role_id]
+            )
+    return len(existing)
+
+
+def flush_role_download_counts(lock=False):
+    """
+    Write the pending download counts to the database.
+
+    With `lock=True` the flush is skipped when another process is already doing it.
+    Returns the number of roles updated.
+    """
+    global _last_flush
+
+    _last_flush = time.monotonic()
+    conn = get_redis_connection()
+    # False means another process holds the lock, 0 means Redis is unreachable
+    # in which case the in-process counts are flushed anyway.
+    if lock and conn is not None and acquire_lock(FLUSH_LOCK_NAME, _flush_interval()) is False:
+        return 0
+
+    pending, since = _take_pending(conn)
+    if not pending:
+        return 0
+
+    try:
+        updated = _write_counts(pending)
+    except DatabaseInternalError as e:
+        # keep the counts around for the next flush
+        _restore_pending(conn, pending, since)
+        # Fail gracefully if the database is in read-only mode.
+        if "read-only" not in str(e):
+            raise e
+        return 0
+
+    if since:
+        metrics.legacy_role_download_count_flush_lag.set(time.time() - since)
+    logger.debug("Flushed download counts of %s roles", updated)
+    return updated
+
+
+@atexit.register
+def _flush_at_exit():
+    # the in-process counts are not visible to the scheduled task
+    if not _pending:
+        return
+    try:
+        flush_role_download_counts()
+    except Exception:
+        logger.exception("Could not flush the download counts of %s roles", len(_pending))
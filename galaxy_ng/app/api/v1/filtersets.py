@@ -7,7 +7,7 @@ from galaxy_ng.app.models.auth import User
 from galaxy_ng.app.api.v1.models import LegacyNamespace
 from galaxy_ng.app.api.v1.models import LegacyRole
 from galaxy_ng.app.api.v1.models import LegacyRoleImport
-from galaxy_ng.app.utils.rbac import get_v3_namespace_owners
+from galaxy_ng.app.utils.rbac import filter_by_v3_namespace_owner
 
 
 class LegacyNamespaceFilter(filterset.FilterSet):
@@ -38,20 +38,7 @@ class LegacyNamespaceFilter(filterset.FilterSet):
 
     def owner_filter(self, queryset, name, value):
         # find the owner on the linked v3 namespace
-
-        # FIXME(jctanner): this is terribly slow
-        pks = []
-        for ns1 in LegacyNamespace.objects.all():
-            if not ns1.namespace:
-                continue
-            ns3 = ns1.namespace
-            owners = get_v3_namespace_owners(ns3)
-            if value in [x.username for x in owners]:
-                pks.append(ns1.id)
-
-        queryset = queryset.filter(id__in=pks)
-
-        return queryset
+        return filter_by_v3_namespace_owner(queryset, value, field_name='namespace_id')
 
     def provider_filter(self, queryset, name, value):
         return queryset.filter(namespace__name=value)
@@ -81,6 +68,9 @@ class LegacyRoleFilterOrdering(filters.OrderingFilter):
         if value is not None and any(v in ["download_count", "-download_count"] for v in value):
             order = "-" if "-download_count" in value else ""
 
+            if "download_count" in qs.query.annotations:
+                return qs.order_by(f"{order}download_count")
+
             return qs.annotate(
                 download_count=Case(
                     When(legacyroledownloadcount=None, then=Value(0)),
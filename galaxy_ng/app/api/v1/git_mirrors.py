@@ -0,0 +1,162 @@
+"""
+On-disk cache of bare git mirrors for legacy role imports.
+
+Every import used to clone the role's full history from github. When
+GALAXY_LEGACY_ROLE_GIT_CACHE_DIR is set, each clone url gets a bare mirror in
+that directory instead. The mirror is refreshed with `git fetch` and then
+cloned locally into the import's checkout, where git hardlinks the objects
+instead of downloading them. Mirrors are evicted least recently used first
+once the cache grows over GALAXY_LEGACY_ROLE_GIT_CACHE_MAX_SIZE bytes.
+"""
+import contextlib
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+
+from django.conf import settings
+
+from galaxy_ng.app.common import metrics
+
+
+logger = logging.getLogger("galaxy_ng.app.api.v1.tasks.legacy_role_import")
+
+GIT_ENV = {'GIT_TERMINAL_PROMPT': '0'}
+
+
+def get_cache_dir():
+    return settings.get('GALAXY_LEGACY_ROLE_GIT_CACHE_DIR')
+
+
+def mirror_path(cache_dir, clone_url):
+    return os.path.join(cache_dir, hashlib.sha256(clone_url.encode()).hexdigest() + '.git')
+
+
+def run_git(args, cwd=None):
+    pid = subprocess.run(
+        ['git', *args],
+        cwd=cwd,
+        shell=False,
+        env=GIT_ENV,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    output = pid.stdout.decode('utf-8')
+    if pid.returncode != 0:
+        logger.error(f'git {args[0]} failed: {output}')
+        raise Exception(f'git {" ".join(args)} failed')
+    return output
+
+
+@contextlib.contextmanager
+def repository_lock(path, blocking=True):
+    """Exclusive lock on a mirror, shared by every worker process on the host."""
+    with open(path + '.lock', 'a') as fd:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(fd, flags)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _dir_size(path):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            with contextlib.suppress(OSError):
+                total += os.lstat(os.path.join(dirpath, filename)).st_size
+    return total
+
+
+def _read_size(path):
+    try:
+        with open(path + '.size') as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return 0
+
+
+def _write_size(path, size):
+    with open(path + '.size', 'w') as f:
+        f.write(str(size))
+
+
+def _update_mirror(mirror, clone_url):
+    if os.path.isdir(mirror):
+        logger.info(f'refreshing git mirror of {clone_url} ...')
+        saved = _read_size(mirror)
+        run_git(['--git-dir', mirror, 'fetch', '--prune', '--tags', 'origin'])
+        metrics.legacy_role_git_mirror_requests.labels(result='hit').inc()
+        metrics.legacy_role_git_mirror_bytes_saved.inc(saved)
+    else:
+        logger.info(f'creating git mirror of {clone_url} ...')
+        try:
+            run_git(['clone', '--bare', clone_url, mirror])
+            run_git([
+                '--git-dir', mirror, 'config', 'remote.origin.fetch', '+refs/heads/*:refs/heads/*'
+            ])
+        except Exception:
+            shutil.rmtree(mirror, ignore_errors=True)
+            raise
+        metrics.legacy_role_git_mirror_requests.labels(result='miss').inc()
+
+    # follow the upstream default branch, it is what gets imported without a reference
+    symref = run_git(['--git-dir', mirror, 'ls-remote', '--symref', 'origin', 'HEAD'])
+    for line in symref.splitlines():
+        if line.startswith('ref: '):
+            run_git(['--git-dir', mirror, 'symbolic-ref', 'HEAD', line[5:].split('\t')[0]])
+            break
+
+    _write_size(mirror, _dir_size(mirror))
+    # the mtime orders mirrors for eviction
+    os.utime(mirror)
+
+
+def clone_from_mirror(clone_url, checkout_path):
+    """Make checkout_path a clone of clone_url, going through the mirror cache."""
+    cache_dir = get_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    mirror = mirror_path(cache_dir, clone_url)
+
+    with repository_lock(mirror):
+        _update_mirror(mirror, clone_url)
+        run_git(['clone', mirror, checkout_path])
+
+    run_git(['remote', 'set-url', 'origin', clone_url], cwd=checkout_path)
+    run_git(['submodule', 'update', '--init', '--recursive'], cwd=checkout_path)
+
+    evict_mirrors(cache_dir, settings.get('GALAXY_LEGACY_ROLE_GIT_CACHE_MAX_SIZE'), keep=mirror)
+
+
+def evict_mirrors(cache_dir, max_size, keep=None):
+    """Delete the least recently used mirrors until the cache fits in max_size bytes."""
+    if not max_size:
+        return
+
+    mirrors = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith('.git') and entry.is_dir():
+            mirrors.append((entry.stat().st_mtime, entry.path, _read_size(entry.path)))
+
+    total = sum(size for _, _, size in mirrors)
+    for _, path, size in sorted(mirrors):
+        if total <= max_size:
+            break
+        if path == keep:
+            continue
+        with repository_lock(path, blocking=False) as locked:
+            # in use by another import, try the next one
+            if not locked:
+                continue
+            logger.info(f'evicting git mirror {path}')
+            shutil.rmtree(path, ignore_errors=True)
+            with contextlib.suppress(OSError):
+                os.remove(path + '.size')
+        total -= size
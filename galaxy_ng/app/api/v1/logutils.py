@@ -1,11 +1,29 @@
 import logging
+import time
+
+from functools import wraps
 
 
 class LegacyRoleImportHandler(logging.Handler):
     """
     A custom Handler which logs into `LegacyRoleImport.messages` attribute of the current task.
+
+    Records are buffered in memory per task and appended to the messages list in
+    batches, when `capacity` records are pending, when `flush_interval` seconds
+    passed since the last write or when the task finishes (see `flush_import_logs`).
     """
 
+    def __init__(self, level=logging.NOTSET, capacity=50, flush_interval=1.0):
+        super().__init__(level)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        # task pulp_id -> list of pending messages
+        self._buffers = {}
+        # task pulp_id -> time of the last write
+        self._flushed_at = {}
+        # task pulp_id -> whether the task has a LegacyRoleImport
+        self._has_import = {}
+
     def emit(self, record):
         """
         Log `record` into the `LegacyRoleImport.messages` field of the current task.
@@ -20,15 +38,68 @@ class LegacyRoleImportHandler(logging.Handler):
         from pulpcore.plugin.models import Task
 
         # some v1 tasks may not create async jobs ...
-        if not Task.current():
+        task = Task.current()
+        if not task:
             return
 
-        # v1 sync tasks will also end up here ...
-        if not LegacyRoleImport.objects.filter(task=Task.current().pulp_id).exists():
-            return
+        self.acquire()
+        try:
+            # v1 sync tasks will also end up here ...
+            if task.pulp_id not in self._has_import:
+                self._has_import[task.pulp_id] = LegacyRoleImport.objects.filter(
+                    task=task.pulp_id
+                ).exists()
+                self._flushed_at[task.pulp_id] = time.monotonic()
+            if not self._has_import[task.pulp_id]:
+                return
 
-        # fetch the task
-        task = Task.current()
-        legacyrole_import = LegacyRoleImport.objects.get(task=task.pulp_id)
-        legacyrole_import.add_log_record(record, state=task.state)
-        legacyrole_import.save()
+            buffer = self._buffers.setdefault(task.pulp_id, [])
+            buffer.append(LegacyRoleImport.build_log_message(record, state=task.state))
+
+            elapsed = time.monotonic() - self._flushed_at[task.pulp_id]
+            if len(buffer) >= self.capacity or elapsed >= self.flush_interval:
+                self._flush_task(task.pulp_id)
+        finally:
+            self.release()
+
+    def flush(self):
+        """Write all the pending messages and forget about the finished tasks."""
+        self.acquire()
+        try:
+            for task_id in list(self._buffers):
+                self._flush_task(task_id)
+            self._buffers.clear()
+            self._flushed_at.clear()
+            self._has_import.clear()
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+    def _flush_task(self, task_id):
+        from galaxy_ng.app.api.v1.models import LegacyRoleImport
+
+        messages = self._buffers.get(task_id)
+        if messages:
+            LegacyRoleImport.append_messages(task_id, messages)
+            self._buffers[task_id] = []
+        self._flushed_at[task_id] = time.monotonic()
+
+
+def flush_import_logs(logger):
+    """
+    Decorate a task so the buffered import messages of `logger` are written when it returns
+    or fails.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                for handler in logger.handlers:
+                    handler.flush()
+        return wrapper
+    return decorator
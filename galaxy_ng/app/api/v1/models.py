@@ -4,6 +4,7 @@ from django.contrib.postgres.indexes import GinIndex
 
 from galaxy_ng.app.models import Namespace
 from galaxy_ng.app.models.auth import User
+from galaxy_ng.app.api.v1.utils import summarize_versions
 
 from pulpcore.plugin.models import Task
 
@@ -173,6 +174,14 @@ class LegacyRole(models.Model):
     def __repr__(self):
         return f'<LegacyRole: {self.namespace.name}.{self.name}>'
 
+    def save(self, *args, **kwargs):
+        # the role list shows the newest versions of every role, so sort
+        # them once here instead of on every serialization.
+        self.full_metadata['versions_summary'] = summarize_versions(
+            self.full_metadata.get('versions', [])
+        )
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f'{self.namespace.name}.{self.name}'
 
@@ -200,6 +209,13 @@ class LegacyRoleSearchVector(models.Model):
         indexes = (GinIndex(fields=["search_vector"]),)
 
 
+class JSONBConcat(models.Func):
+    """Postgres `jsonb || jsonb`, appends the items of a list to another."""
+    template = "%(expressions)s"
+    arg_joiner = " || "
+    output_field = models.JSONField()
+
+
 class LegacyRoleImport(models.Model):
     role = models.ForeignKey(
         'LegacyRole',
@@ -224,9 +240,30 @@ class LegacyRoleImport(models.Model):
             log_record(logging.LogRecord): The logging record to record on messages.
 
         """
-        self.messages.append({
+        self.messages.append(self.build_log_message(log_record, state=state))
+
+    @staticmethod
+    def build_log_message(log_record, state=None):
+        return {
             "state": state,
             "message": log_record.msg,
             "level": log_record.levelname,
             "time": log_record.created
-        })
+        }
+
+    @classmethod
+    def append_messages(cls, task_id, messages):
+        """
+        Appends a batch of messages in a single UPDATE, without reading the current ones.
+
+        Args:
+            task_id: The pulp_id of the import task.
+            messages(list): The messages built by `build_log_message`.
+
+        """
+        return cls.objects.filter(task_id=task_id).update(
+            messages=JSONBConcat(
+                models.F("messages"),
+                models.Value(messages, output_field=models.JSONField()),
+            )
+        )
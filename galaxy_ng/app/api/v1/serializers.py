@@ -11,6 +11,7 @@ from galaxy_ng.app.api.v1.models import LegacyNamespace
 from galaxy_ng.app.api.v1.models import LegacyRole, LegacyRoleTag
 from galaxy_ng.app.api.v1.models import LegacyRoleDownloadCount
 from galaxy_ng.app.api.v1.utils import sort_versions
+from galaxy_ng.app.api.v1.utils import summarize_versions
 
 from galaxy_ng.app.utils.galaxy import (
     uuid_to_int
@@ -322,14 +323,10 @@ class LegacyRoleSerializer(serializers.ModelSerializer):
         dependencies = obj.full_metadata.get('dependencies', [])
         tags = obj.full_metadata.get('tags', [])
 
-        versions = obj.full_metadata.get('versions', [])
-        if versions:
-            # FIXME(jctanner): we can't assume they're all sorted yet
-            versions = sort_versions(versions)
-            versions = versions[::-1]
-            if len(versions) > 10:
-                versions = versions[:11]
-            versions = [LegacyRoleVersionSummary(obj, x).to_json() for x in versions]
+        # precomputed on save, older roles may not have it yet
+        versions = obj.full_metadata.get('versions_summary')
+        if versions is None:
+            versions = summarize_versions(obj.full_metadata.get('versions', []))
 
         provider_ns = None
         if obj.namespace and obj.namespace.namespace:
@@ -368,6 +365,9 @@ class LegacyRoleSerializer(serializers.ModelSerializer):
         }
 
     def get_download_count(self, obj):
+        # annotated by LegacyRolesViewSet.get_queryset
+        if hasattr(obj, 'download_count'):
+            return obj.download_count
         counter = LegacyRoleDownloadCount.objects.filter(legacyrole=obj).first()
         if counter:
             return counter.count
@@ -427,30 +427,6 @@ class LegacyRoleContentSerializer(serializers.ModelSerializer):
         return obj.full_metadata.get('readme_html', '')
 
 
-class LegacyRoleVersionSummary:
-    """
-    Shim serializer to be replaced once role versions
-    become first class objects.
-    """
-    def __init__(self, role, version):
-        self.role = role
-        self.version = version
-
-    def to_json(self):
-
-        # old galaxy has a field for the real tag value
-        # and that is what gets returned for the name
-        name = self.version.get('tag')
-        if not name:
-            name = self.version.get('name')
-
-        return {
-            'id': self.version.get('id'),
-            'name': name,
-            'release_date': self.version.get('commit_date'),
-        }
-
-
 class LegacyRoleVersionDetail:
     """
     Shim serializer to be replaced once role versions
@@ -8,7 +8,10 @@ import traceback
 import tempfile
 import uuid
 
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 
 from ansible.module_utils.compat.version import LooseVersion
 
@@ -26,8 +29,13 @@ from galaxy_ng.app.api.v1.models import LegacyNamespace
 from galaxy_ng.app.api.v1.models import LegacyRole
 from galaxy_ng.app.api.v1.models import LegacyRoleDownloadCount
 from galaxy_ng.app.api.v1.models import LegacyRoleImport
+from galaxy_ng.app.api.v1 import git_mirrors
+from galaxy_ng.app.api.v1.logutils import flush_import_logs
 from galaxy_ng.app.api.v1.utils import sort_versions
 from galaxy_ng.app.api.v1.utils import parse_version_tag
+from galaxy_ng.app.api.v1.utils import summarize_versions
+from galaxy_ng.app.tasks.settings_cache import connection_error_wrapper
+from galaxy_ng.app.tasks.settings_cache import get_redis_connection
 
 from pulpcore.plugin.models import Task
 
@@ -112,19 +120,23 @@ def do_git_checkout(clone_url, checkout_path, github_reference):
     """
     logger.info(f'cloning {clone_url} ...')
 
-    # pygit didn't have an obvious way to prevent interactive clones ...
-    cmd_args = ['git', 'clone', '--recurse-submodules', clone_url, checkout_path]
-    pid = subprocess.run(
-        cmd_args,
-        shell=False,
-        env={'GIT_TERMINAL_PROMPT': '0'},
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-    )
-    if pid.returncode != 0:
-        error = pid.stdout.decode('utf-8')
-        logger.error(f'cloning failed: {error}')
-        raise Exception(f'git clone for {clone_url} failed')
+    if git_mirrors.get_cache_dir():
+        git_mirrors.clone_from_mirror(clone_url, checkout_path)
+
+    else:
+        # pygit didn't have an obvious way to prevent interactive clones ...
+        cmd_args = ['git', 'clone', '--recurse-submodules', clone_url, checkout_path]
+        pid = subprocess.run(
+            cmd_args,
+            shell=False,
+            env={'GIT_TERMINAL_PROMPT': '0'},
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        if pid.returncode != 0:
+            error = pid.stdout.decode('utf-8')
+            logger.error(f'cloning failed: {error}')
+            raise Exception(f'git clone for {clone_url} failed')
 
     # bind the checkout to a pygit object
     gitrepo = Repo(checkout_path)
@@ -161,9 +173,7 @@ def do_git_checkout(clone_url, checkout_path, github_reference):
                 logger.error(f'{cmd} failed: {error}')
                 raise Exception(f'{cmd} failed')
 
-        # REVIEW(cutwater): Why this iterates over all commits to get first one and doesn't use
-        #   gitrepo.head.commit as the code below?
-        last_commit = next(iter(gitrepo.iter_commits()))
+        last_commit = gitrepo.head.commit
 
     else:
         # use the default branch ...
@@ -227,7 +237,8 @@ def compute_all_versions(this_role, gitrepo):
         if not tag:
             tag = cversion.get('name')
         current_tags.append(tag)
-    for tag in gitrepo.tags:
+    repo_tags = gitrepo.tags
+    for tag in repo_tags:
 
         # must be a semver compliant value ...
         try:
@@ -253,7 +264,7 @@ def compute_all_versions(this_role, gitrepo):
         versions.append(vdata)
 
     # remove old tag versions if they no longer exist in the repo
-    git_tags = [x.name for x in gitrepo.tags]
+    git_tags = [x.name for x in repo_tags]
     for version in versions[:]:
         vname = version.get('tag')
         if not vname:
@@ -269,6 +280,7 @@ def compute_all_versions(this_role, gitrepo):
     return versions
 
 
+@flush_import_logs(logger)
 def legacy_role_import(
     request_username=None,
     github_user=None,
@@ -550,16 +562,168 @@ def legacy_role_import(
         this_role.save()
 
     # bind the role to the import log model
+    # update only the role so buffered log messages are never overwritten
     if import_model:
-        import_model.refresh_from_db()
-        import_model.role = this_role
-        import_model.save()
+        LegacyRoleImport.objects.filter(pk=import_model.pk).update(role=this_role)
 
     logger.info('')
     logger.info('Import completed')
     return this_role
 
 
+SYNC_CHECKPOINT_KEY = "GALAXY_LEGACY_ROLE_SYNC_CHECKPOINT"
+SYNC_CHECKPOINT_TTL = 7 * 24 * 60 * 60
+
+
+@connection_error_wrapper(default=lambda: None)
+def _get_sync_checkpoint(conn, key):
+    page = conn.get(key)
+    return int(page) if page else None
+
+
+@connection_error_wrapper(default=lambda: None)
+def _set_sync_checkpoint(conn, key, page):
+    if page is None:
+        conn.delete(key)
+    else:
+        conn.set(key, page, ex=SYNC_CHECKPOINT_TTL)
+
+
+def build_synced_role_metadata(rdata, rversions):
+    """Map the upstream role data to the full_metadata of the LegacyRole."""
+    github_user = rdata.get('github_user')
+    github_repo = rdata['github_repo']
+    clone_url = f'https://github.com/{github_user}/{github_repo}'
+    sfields = rdata.get('summary_fields', {})
+    now = datetime.datetime.now().isoformat()  # noqa: DTZ005
+
+    full_metadata = {
+        'upstream_id': rdata['id'],
+        'role_type': rdata.get('role_type', 'ANS'),
+        'imported': rdata.get('imported', now),
+        'created': rdata.get('created', now),
+        'modified': rdata.get('modified', now),
+        'clone_url': clone_url,
+        'tags': sfields.get('tags', []),
+        'commit': rdata.get('commit'),
+        'commit_message': rdata.get('commit_message'),
+        'commit_url': rdata.get('commit_url'),
+        'github_user': github_user,
+        'github_repo': github_repo,
+        'github_branch': rdata['github_branch'],
+        # 'github_reference': github_reference,
+        'issue_tracker_url': rdata.get('issue_tracker_url', clone_url + '/issues'),
+        'dependencies': sfields.get('dependencies', []),
+        'versions': sort_versions(normalize_versions(rversions[:])),
+        'description': rdata.get('description'),
+        'license': rdata.get('license'),
+        'readme': rdata.get('readme'),
+        'readme_html': rdata.get('readme_html'),
+        'min_ansible_version': rdata.get('min_ansible_version'),
+        'company': rdata.get('company'),
+    }
+
+    # bulk writes skip LegacyRole.save()
+    full_metadata['versions_summary'] = summarize_versions(full_metadata['versions'])
+    return full_metadata
+
+
+class LegacyRoleSyncBatch:
+    """Accumulates synced roles and download counts and writes them in bulk."""
+
+    def __init__(self, size=100):
+        self.size = size
+        self.roles = {}
+        self.counts = {}
+
+    def add_role(self, namespace, name, full_metadata, download_count):
+        self.roles[(namespace.pk, name)] = (namespace, name, full_metadata, download_count)
+        if len(self.roles) >= self.size:
+            self.flush()
+
+    def add_count(self, role_pk, download_count):
+        self.counts[role_pk] = download_count
+        if len(self.counts) >= self.size:
+            self.flush()
+
+    def flush(self):
+        with transaction.atomic():
+            if self.roles:
+                self._write_roles()
+            if self.counts:
+                LegacyRoleDownloadCount.objects.bulk_create(
+                    [
+                        LegacyRoleDownloadCount(legacyrole_id=pk, count=count)
+                        for pk, count in self.counts.items()
+                    ],
+                    update_conflicts=True,
+                    unique_fields=['legacyrole'],
+                    update_fields=['count'],
+                )
+        self.roles = {}
+        self.counts = {}
+
+    def _write_roles(self):
+        lookup = Q(pk__in=[])
+        for namespace_id, name in self.roles:
+            lookup |= Q(namespace_id=namespace_id, name=name)
+        existing = {
+            (role.namespace_id, role.name): role
+            for role in LegacyRole.objects.filter(lookup).only(
+                'pk', 'namespace_id', 'name', 'full_metadata'
+            )
+        }
+
+        now = timezone.now()
+        to_create = []
+        to_update = []
+        for key, (namespace, name, full_metadata, _) in self.roles.items():
+            role = existing.get(key)
+            if role is None:
+                logger.debug(f'SYNC create initial role for {namespace.name}.{name}')
+                role = LegacyRole(namespace=namespace, name=name, full_metadata=full_metadata)
+                existing[key] = role
+                to_create.append(role)
+            elif role.full_metadata != full_metadata:
+                role.full_metadata = full_metadata
+                role.modified = now
+                to_update.append(role)
+
+        LegacyRole.objects.bulk_create(to_create)
+        LegacyRole.objects.bulk_update(to_update, ['full_metadata', 'modified'])
+
+        for key, (_, _, _, download_count) in self.roles.items():
+            self.counts[existing[key].pk] = download_count
+
+
+def find_unchanged_roles(results):
+    """
+    Map the upstream id of the roles whose `modified` timestamp didn't change
+    since they were last synced to the id of the local role.
+    """
+    candidates = {}
+    for rdata in results:
+        ns_name = rdata.get('summary_fields', {}).get('namespace', {}).get('name')
+        if ns_name and rdata.get('modified'):
+            candidates[(ns_name, rdata['name'])] = rdata
+    if not candidates:
+        return {}
+
+    lookup = Q(pk__in=[])
+    for ns_name, name in candidates:
+        lookup |= Q(namespace__name=ns_name, name=name)
+    rows = LegacyRole.objects.filter(lookup).values_list(
+        'pk', 'namespace__name', 'name', 'full_metadata__upstream_id', 'full_metadata__modified'
+    )
+
+    unchanged = {}
+    for pk, ns_name, name, upstream_id, modified in rows:
+        rdata = candidates[(ns_name, name)]
+        if upstream_id == rdata['id'] and modified == rdata['modified']:
+            unchanged[rdata['id']] = pk
+    return unchanged
+
+
 def legacy_sync_from_upstream(
     baseurl=None,
     github_user=None,
@@ -579,12 +743,21 @@ def legacy_sync_from_upstream(
         Allow the client to reduce the set of synced roles by the role name.
     :param limit:
         Allow the client to reduce the total number of synced roles.
+    :param start_page:
+        Upstream page to start from. Without it, an interrupted sync resumes
+        from the page after the last one it completed.
 
     This is conceptually similar to the pulp_ansible/app/tasks/roles.py:synchronize
     function but has more robust handling and better schema matching. Although
     not considered something we'd be normally running on a production hosted
     galaxy instance, it is necessary for mirroring the roles into that future
     system until it is ready to deprecate the old instance.
+
+    Roles of a page are fetched concurrently (GALAXY_LEGACY_SYNC_WORKERS) and
+    rate limited (GALAXY_LEGACY_SYNC_RATE_LIMIT requests per second), roles
+    whose upstream `modified` timestamp is unchanged only get their download
+    count refreshed, and roles are written in bulk every
+    GALAXY_LEGACY_SYNC_BATCH_SIZE roles.
     """
 
     logger.debug(
@@ -599,8 +772,25 @@ def legacy_sync_from_upstream(
     if limit is not None:
         limit = int(limit)
 
-    # index of all roles
-    rmap = {}
+    conn = get_redis_connection()
+    checkpoint_key = f'{SYNC_CHECKPOINT_KEY}:{baseurl}:{github_user}:{role_name}'
+    if start_page is None and conn is not None:
+        start_page = _get_sync_checkpoint(conn, checkpoint_key)
+        if start_page:
+            logger.info(f'SYNC resuming from page {start_page}')
+
+    batch = LegacyRoleSyncBatch(size=settings.get('GALAXY_LEGACY_SYNC_BATCH_SIZE', 100))
+    unchanged_roles = {}
+
+    def is_unchanged(results):
+        unchanged_roles.update(find_unchanged_roles(results))
+        return unchanged_roles.keys()
+
+    def on_page(pagenum):
+        # the checkpoint only moves once the page is written
+        batch.flush()
+        if conn is not None:
+            _set_sync_checkpoint(conn, checkpoint_key, pagenum + 1)
 
     iterator_kwargs = {
         'baseurl': baseurl,
@@ -608,9 +798,18 @@ def legacy_sync_from_upstream(
         'role_name': role_name,
         'limit': limit,
         'start_page': start_page,
+        'workers': settings.get('GALAXY_LEGACY_SYNC_WORKERS', 4),
+        'rate_limit': settings.get('GALAXY_LEGACY_SYNC_RATE_LIMIT'),
+        'is_unchanged': is_unchanged,
+        'on_page': on_page,
     }
     for ns_data, rdata, rversions in upstream_role_iterator(**iterator_kwargs):
 
+        if ns_data is None:
+            # unchanged upstream, only the download count moves
+            batch.add_count(unchanged_roles[rdata['id']], rdata.get('download_count', 0))
+            continue
+
         # processing a namespace should make owners and set rbac as needed ...
         if ns_data['name'] not in nsmap:
             namespace, v3_namespace = process_namespace(ns_data['name'], ns_data)
@@ -618,83 +817,17 @@ def legacy_sync_from_upstream(
         else:
             namespace, v3_namespace = nsmap[ns_data['name']]
 
-        github_user = rdata.get('github_user')
-        role_name = rdata.get('name')
-
-        logger.info(f'POPULATE {github_user}.{role_name}')
-
-        rkey = (github_user, role_name)
-        remote_id = rdata['id']
-        role_versions = rversions[:]
-        github_repo = rdata['github_repo']
-        github_branch = rdata['github_branch']
-        clone_url = f'https://github.com/{github_user}/{github_repo}'
-        sfields = rdata.get('summary_fields', {})
-        role_tags = sfields.get('tags', [])
-        commit_hash = rdata.get('commit')
-        commit_msg = rdata.get('commit_message')
-        commit_url = rdata.get('commit_url')
-        issue_tracker = rdata.get('issue_tracker_url', clone_url + '/issues')
-        role_description = rdata.get('description')
-        role_license = rdata.get('license')
-        role_readme = rdata.get('readme')
-        role_html = rdata.get('readme_html')
-        role_dependencies = sfields.get('dependencies', [])
-        role_min_ansible = rdata.get('min_ansible_version')
-        role_company = rdata.get('company')
-        role_imported = rdata.get('imported', datetime.datetime.now().isoformat())  # noqa: DTZ005
-        role_created = rdata.get('created', datetime.datetime.now().isoformat())  # noqa: DTZ005
-        role_modified = rdata.get('modified', datetime.datetime.now().isoformat())  # noqa: DTZ005
-        role_type = rdata.get('role_type', 'ANS')
-        role_download_count = rdata.get('download_count', 0)
-
-        if rkey not in rmap:
-            logger.debug(f'SYNC create initial role for {rkey}')
-            this_role, _ = LegacyRole.objects.get_or_create(
-                namespace=namespace,
-                name=role_name
-            )
-            rmap[rkey] = this_role
-        else:
-            this_role = rmap[rkey]
+        logger.info(f'POPULATE {rdata.get("github_user")}.{rdata.get("name")}')
 
-        new_full_metadata = {
-            'upstream_id': remote_id,
-            'role_type': role_type,
-            'imported': role_imported,
-            'created': role_created,
-            'modified': role_modified,
-            'clone_url': clone_url,
-            'tags': role_tags,
-            'commit': commit_hash,
-            'commit_message': commit_msg,
-            'commit_url': commit_url,
-            'github_user': github_user,
-            'github_repo': github_repo,
-            'github_branch': github_branch,
-            # 'github_reference': github_reference,
-            'issue_tracker_url': issue_tracker,
-            'dependencies': role_dependencies,
-            'versions': role_versions,
-            'description': role_description,
-            'license': role_license,
-            'readme': role_readme,
-            'readme_html': role_html,
-            'min_ansible_version': role_min_ansible,
-            'company': role_company,
-        }
-
-        new_full_metadata['versions'] = normalize_versions(new_full_metadata['versions'])
-        new_full_metadata['versions'] = sort_versions(new_full_metadata['versions'])
-
-        if dict(this_role.full_metadata) != new_full_metadata:
-            with transaction.atomic():
-                this_role.full_metadata = new_full_metadata
-                this_role.save()
+        batch.add_role(
+            namespace,
+            rdata.get('name'),
+            build_synced_role_metadata(rdata, rversions),
+            rdata.get('download_count', 0),
+        )
 
-        with transaction.atomic():
-            counter, _ = LegacyRoleDownloadCount.objects.get_or_create(legacyrole=this_role)
-            counter.count = role_download_count
-            counter.save()
+    batch.flush()
+    if conn is not None:
+        _set_sync_checkpoint(conn, checkpoint_key, None)
 
     logger.debug('STOP LEGACY SYNC!')
@@ -43,3 +43,32 @@ def sort_versions(versions):
         return versions
 
     return sorted_versions
+
+
+def summarize_versions(versions, limit=10):
+    """
+    Return the newest versions of a role as the short dicts shown in summary_fields.
+    """
+    if not versions:
+        return []
+
+    # FIXME(jctanner): we can't assume they're all sorted yet
+    versions = sort_versions(versions)
+    versions = versions[::-1]
+    if len(versions) > limit:
+        versions = versions[:limit + 1]
+
+    summaries = []
+    for version in versions:
+        # old galaxy has a field for the real tag value
+        # and that is what gets returned for the name
+        name = version.get('tag')
+        if not name:
+            name = version.get('name')
+
+        summaries.append({
+            'id': version.get('id'),
+            'name': name,
+            'release_date': version.get('commit_date'),
+        })
+    return summaries
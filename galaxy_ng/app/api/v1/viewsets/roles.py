@@ -1,8 +1,7 @@
 import logging
 
 from django.conf import settings
-from django.db import transaction
-from django.db.utils import InternalError as DatabaseInternalError
+from django.db.models.functions import Coalesce
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 
@@ -18,9 +17,9 @@ from galaxy_ng.app.access_control.access_policy import LegacyAccessPolicy
 from galaxy_ng.app.api.v1.tasks import (
     legacy_role_import,
 )
+from galaxy_ng.app.api.v1.download_counts import record_role_download
 from galaxy_ng.app.api.v1.models import (
     LegacyRole,
-    LegacyRoleDownloadCount,
     LegacyRoleImport,
 )
 from galaxy_ng.app.api.v1.serializers import (
@@ -68,6 +67,14 @@ class LegacyRolesViewSet(viewsets.ModelViewSet):
     permission_classes = [LegacyAccessPolicy]
     authentication_classes = GALAXY_AUTHENTICATION_CLASSES
 
+    def get_queryset(self):
+        # load everything LegacyRoleSerializer needs in the page query
+        return super().get_queryset().select_related(
+            'namespace__namespace'
+        ).annotate(
+            download_count=Coalesce('legacyroledownloadcount__count', 0)
+        )
+
     def list(self, request):
 
         # this is the naive logic used in the original galaxy to assume a role
@@ -78,25 +85,9 @@ class LegacyRolesViewSet(viewsets.ModelViewSet):
             role_name = request.query_params.get('name')
             role = LegacyRole.objects.filter(namespace__name=role_namespace, name=role_name).first()
             if role:
-
-                with transaction.atomic():
-
-                    try:
-                        # attempt to get or create the counter first
-                        counter, _ = LegacyRoleDownloadCount.objects.get_or_create(legacyrole=role)
-
-                        # now lock the row so that we avoid race conditions
-                        counter = LegacyRoleDownloadCount.objects.select_for_update().get(
-                            pk=counter.pk
-                        )
-
-                        # increment and save
-                        counter.count += 1
-                        counter.save()
-                    except DatabaseInternalError as e:
-                        # Fail gracefully if the database is in read-only mode.
-                        if "read-only" not in str(e):
-                            raise e
+                # counts are buffered and written in batches,
+                # see galaxy_ng.app.api.v1.download_counts
+                record_role_download(role.pk)
 
         return super().list(request)
 
@@ -1,6 +1,9 @@
+import hashlib
+import json
+
 import yaml
-from django.core.exceptions import ObjectDoesNotExist
 from django.conf import settings
+from django.http import HttpResponse
 
 from galaxy_ng.app import models
 from galaxy_ng.app.access_control import access_policy
@@ -15,15 +18,6 @@ from rest_framework.response import Response
 from yaml.dumper import SafeDumper
 
 
-def get_synclist_excludes(base_path):
-    """Get SyncList that has same name as distro base_path"""
-    try:
-        synclist = models.SyncList.objects.get(name=base_path, policy="exclude")
-        return synclist.collections.all()
-    except ObjectDoesNotExist:
-        return None
-
-
 def serialize_collection_queryset(queryset):
     """Serialize a Queryset in to a JSONable format."""
     return (queryset is not None and [
@@ -67,7 +61,47 @@ class RequirementsFileRenderer(BaseRenderer):
         )
 
 
-class ExcludesView(api_base.APIView):
+def render_excludes_document(queryset):
+    """Render the exclude list in all the formats ExcludesView serves directly."""
+    data = {"collections": serialize_collection_queryset(queryset)}
+    excludes_json = JSONRenderer().render(data).decode()
+    return {
+        "excludes_json": excludes_json,
+        "excludes_yaml": RequirementsFileRenderer().render(data).decode(),
+        "excludes_digest": hashlib.sha256(excludes_json.encode()).hexdigest(),
+    }
+
+
+def update_synclist_excludes(synclist_pk):
+    """Render the exclude list of a synclist again and store it on the synclist."""
+    synclist = models.SyncList.objects.filter(pk=synclist_pk).only("policy").first()
+    if synclist is None:
+        return None
+
+    queryset = None
+    if synclist.policy == "exclude":
+        queryset = synclist.collections.only("namespace", "name").order_by("namespace", "name")
+
+    document = render_excludes_document(queryset)
+    # update() instead of save(), this runs from the synclist's post_save
+    models.SyncList.objects.filter(pk=synclist_pk).update(**document)
+    return document
+
+
+def get_excludes_document(base_path):
+    """The pre-rendered exclude list of the synclist named like the distro base_path."""
+    document = models.SyncList.objects.filter(name=base_path).values(
+        "pk", "excludes_json", "excludes_yaml", "excludes_digest"
+    ).first()
+    if document is None:
+        return render_excludes_document(None)
+    if not document["excludes_digest"]:
+        # synclists from before the documents were stored
+        return update_synclist_excludes(document["pk"])
+    return document
+
+
+class ExcludesView(api_base.ConditionalGetMixin, api_base.APIView):
     permission_classes = [access_policy.CollectionAccessPolicy]
     action = 'list'
     renderer_classes = [
@@ -76,11 +110,32 @@ class ExcludesView(api_base.APIView):
         RequirementsFileRenderer
     ]
 
+    _document = None
+
+    def get_document(self):
+        if self._document is None:
+            base_path = self.kwargs.get('path', settings.ANSIBLE_DEFAULT_DISTRIBUTION_PATH)
+            self._document = get_excludes_document(base_path)
+        return self._document
+
+    def get_etag(self):
+        digest = self.get_document()["excludes_digest"]
+        return f'"{digest}-{self.request.accepted_renderer.format}"'
+
     def get(self, request: Request, *args, **kwargs):
         """
         Returns a list of excludes for a given distro.
         """
-        base_path = self.kwargs.get('path', settings.ANSIBLE_DEFAULT_DISTRIBUTION_PATH)
-        queryset = get_synclist_excludes(base_path)
-        collections_to_exclude = serialize_collection_queryset(queryset)
-        return Response({"collections": collections_to_exclude})
+        document = self.get_document()
+        renderer = request.accepted_renderer
+        if renderer.format not in ("json", "yaml"):
+            return Response(json.loads(document["excludes_json"]))
+
+        content = document[f"excludes_{renderer.format}"].encode()
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+
+        response = HttpResponse(content, content_type=content_type)
+        response["Content-Length"] = len(content)
+        return response
@@ -1,9 +1,12 @@
 import logging
+import threading
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
-from django.http import HttpResponseRedirect, StreamingHttpResponse
+from django.http import HttpResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
@@ -156,12 +159,53 @@ class CollectionUploadViewSet(api_base.LocalSettingsMixin,
         )
 
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+_content_app_session = None
+_content_app_session_lock = threading.Lock()
+
+
+def get_content_app_session():
+    """Keep-alive session shared by the artifact downloads proxied to the content app."""
+    global _content_app_session
+    with _content_app_session_lock:
+        if _content_app_session is None:
+            _content_app_session = requests.Session()
+            _content_app_session.mount('http://', HTTPAdapter(pool_maxsize=20))
+    return _content_app_session
+
+
+def _stream_content(response):
+    try:
+        # the body is passed through as sent, without decoding any Content-Encoding
+        yield from response.raw.stream(DOWNLOAD_CHUNK_SIZE, decode_content=False)
+    finally:
+        # hands the connection back to the pool once the body was read
+        response.close()
+
+
 class CollectionArtifactDownloadView(api_base.APIView):
     permission_classes = [access_policy.CollectionAccessPolicy]
     action = 'download'
 
     def _get_tcp_response(self, url):
-        return requests.get(url, stream=True, allow_redirects=False)
+        return get_content_app_session().get(url, stream=True, allow_redirects=False)
+
+    def _get_internal_redirect(self, url):
+        """
+        Let the front proxy fetch the artifact from the content app, the
+        request is already authorized and the worker is released right away.
+        """
+        url = urlsplit(url)
+        prefix = settings.GALAXY_DOWNLOAD_INTERNAL_REDIRECT_PREFIX.rstrip('/')
+        location = f'{prefix}{url.path}'
+        if url.query:
+            location = f'{location}?{url.query}'
+        response = HttpResponse()
+        response[settings.GALAXY_DOWNLOAD_INTERNAL_REDIRECT_HEADER] = location
+        # the proxy sets the type of the artifact it serves
+        del response['Content-Type']
+        return response
 
     def _get_ansible_distribution(self, base_path):
         return AnsibleDistribution.objects.get(base_path=base_path)
@@ -190,10 +234,26 @@ class CollectionArtifactDownloadView(api_base.APIView):
                 distro_base_path=distro_base_path,
                 filename=filename,
             )
-            response = self._get_tcp_response(
-                distribution.content_guard.cast().preauthenticate_url(url)
-            )
+            url = distribution.content_guard.cast().preauthenticate_url(url)
 
+            if settings.get('GALAXY_DOWNLOAD_INTERNAL_REDIRECT_PREFIX'):
+                metrics.collection_artifact_download_successes.inc()
+                return self._get_internal_redirect(url)
+
+            response = self._get_tcp_response(url)
+
+            if response.status_code == requests.codes.ok:
+                metrics.collection_artifact_download_successes.inc()
+                streaming_response = StreamingHttpResponse(
+                    _stream_content(response),
+                    content_type=response.headers['Content-Type']
+                )
+                for header in ('Content-Length', 'Content-Encoding'):
+                    if header in response.headers:
+                        streaming_response[header] = response.headers[header]
+                return streaming_response
+
+            response.close()
             if response.status_code == requests.codes.not_found:
                 metrics.collection_artifact_download_failures.labels(
                     status=requests.codes.not_found
@@ -201,12 +261,6 @@ class CollectionArtifactDownloadView(api_base.APIView):
                 raise NotFound()
             if response.status_code == requests.codes.found:
                 return HttpResponseRedirect(response.headers['Location'])
-            if response.status_code == requests.codes.ok:
-                metrics.collection_artifact_download_successes.inc()
-                return StreamingHttpResponse(
-                    response.raw.stream(amt=4096),
-                    content_type=response.headers['Content-Type']
-                )
             metrics.collection_artifact_download_failures.labels(status=response.status_code).inc()
             raise APIException(
                 _('Unexpected response from content app. Code: %s.') % response.status_code
@@ -1,8 +1,10 @@
 import base64
+import hashlib
 import json
 import logging
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 
 from pulpcore.plugin.util import get_objects_for_group
@@ -17,6 +19,7 @@ from galaxy_ng.app.models.auth import Group, User
 DEFAULT_UPSTREAM_REPO_NAME = settings.GALAXY_API_DEFAULT_DISTRIBUTION_BASE_PATH
 RH_ACCOUNT_SCOPE = 'rh-identity-account'
 SYNCLIST_DEFAULT_POLICY = 'exclude'
+IDENTITY_CACHE_KEY_PREFIX = 'galaxy_rh_identity'
 
 
 log = logging.getLogger(__name__)
@@ -28,6 +31,10 @@ class RHIdentityAuthentication(BaseAuthentication):
 
     For users logging in first time creates User record and
     Tenant record for user's account if it doesn't exist.
+
+    Once that is done the user pk and a fingerprint of the identity are cached
+    for GALAXY_RH_IDENTITY_CACHE_TTL seconds, later requests with the same
+    identity only load the user and do not write anything.
     """
 
     header = 'HTTP_X_RH_IDENTITY'
@@ -75,6 +82,12 @@ class RHIdentityAuthentication(BaseAuthentication):
         first_name = user.get('first_name', '')
         last_name = user.get('last_name', '')
 
+        cache_key = self._identity_cache_key(account, username)
+        fingerprint = self._identity_fingerprint(email, first_name, last_name)
+        user = self._get_cached_user(cache_key, fingerprint, username)
+        if user is not None:
+            return user, {'rh_identity': header}
+
         group, _ = self._ensure_group(RH_ACCOUNT_SCOPE, account)
 
         user = self._ensure_user(
@@ -87,8 +100,33 @@ class RHIdentityAuthentication(BaseAuthentication):
 
         self._ensure_synclists(group)
 
+        ttl = settings.get('GALAXY_RH_IDENTITY_CACHE_TTL')
+        if ttl:
+            cache.set(cache_key, {'fingerprint': fingerprint, 'user_pk': user.pk}, ttl)
+
         return user, {'rh_identity': header}
 
+    @staticmethod
+    def _identity_cache_key(account, username):
+        identity = json.dumps([account, username])
+        return f'{IDENTITY_CACHE_KEY_PREFIX}:{hashlib.sha256(identity.encode()).hexdigest()}'
+
+    @staticmethod
+    def _identity_fingerprint(email, first_name, last_name):
+        attrs = json.dumps([email, first_name, last_name])
+        return hashlib.sha256(attrs.encode()).hexdigest()
+
+    @staticmethod
+    def _get_cached_user(cache_key, fingerprint, username):
+        """Return the user of an identity seen recently with the same attributes."""
+        if not settings.get('GALAXY_RH_IDENTITY_CACHE_TTL'):
+            return None
+        cached = cache.get(cache_key)
+        if cached is None or cached['fingerprint'] != fingerprint:
+            return None
+        # the user may have been deleted or renamed since
+        return User.objects.filter(pk=cached['user_pk'], username=username).first()
+
     def _ensure_group(self, account_scope, account):
         """Create a auto group for the account and create a synclist distribution"""
 
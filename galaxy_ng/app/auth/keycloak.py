@@ -1,6 +1,11 @@
-from requests import post as requests_post
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
 
 from django.conf import settings
+from django.core.cache import cache
+from django.utils.crypto import salted_hmac
 
 from rest_framework.authentication import BasicAuthentication
 
@@ -12,9 +17,50 @@ from social_core.backends.keycloak import KeycloakOAuth2
 
 from gettext import gettext as _
 
+from galaxy_ng.app.models.auth import User
+
+
+VERIFICATION_CACHE_KEY_PREFIX = 'galaxy_keycloak_basic_auth'
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Keep-alive session shared by every request sent to keycloak."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.mount('https://', HTTPAdapter(pool_maxsize=10))
+            _session.mount('http://', HTTPAdapter(pool_maxsize=10))
+    return _session
+
+
+def verification_cache_key(userid, password):
+    # salted with the SECRET_KEY, the password never reaches the cache
+    digest = salted_hmac(VERIFICATION_CACHE_KEY_PREFIX, f'{userid}:{password}').hexdigest()
+    return f'{VERIFICATION_CACHE_KEY_PREFIX}:{digest}'
+
 
 class KeycloakBasicAuth(BasicAuthentication):
+    """
+    Basic auth verified with a keycloak password grant.
+
+    Successful verifications are cached for GALAXY_KEYCLOAK_BASIC_AUTH_CACHE_TTL
+    seconds, never longer than the access token keycloak issued, so clients
+    repeating the same credentials do not go back to keycloak on every call.
+    """
+
     def authenticate_credentials(self, userid, password, request=None):
+        cache_key = verification_cache_key(userid, password)
+        user_pk = cache.get(cache_key)
+        if user_pk is not None:
+            user = User.objects.filter(pk=user_pk, is_active=True).first()
+            if user is not None:
+                return (user, None)
+            cache.delete(cache_key)
+
         payload = {
             'client_id': settings.SOCIAL_AUTH_KEYCLOAK_KEY,
             'client_secret': settings.SOCIAL_AUTH_KEYCLOAK_SECRET,
@@ -27,7 +73,7 @@ class KeycloakBasicAuth(BasicAuthentication):
             "Content-Type": "application/x-www-form-urlencoded",
         }
 
-        response = requests_post(
+        response = get_session().post(
             url=settings.SOCIAL_AUTH_KEYCLOAK_ACCESS_TOKEN_URL,
             headers=headers,
             data=payload,
@@ -43,7 +89,8 @@ class KeycloakBasicAuth(BasicAuthentication):
                 strategy = load_strategy(request)
                 backend = KeycloakOAuth2(strategy)
 
-                token_data = backend.user_data(response.json()['access_token'])
+                token_response = response.json()
+                token_data = backend.user_data(token_response['access_token'])
 
                 # The django social auth strategy uses data from the JWT token in the
                 # KeycloackOAuth2
@@ -54,6 +101,7 @@ class KeycloakBasicAuth(BasicAuthentication):
                 if user is None:
                     raise exceptions.AuthenticationFailed(_("Authentication failed."))
 
+                self._cache_verification(cache_key, user, token_response.get('expires_in'))
                 return (user, None)
             except AttributeError:
                 pass
@@ -61,3 +109,11 @@ class KeycloakBasicAuth(BasicAuthentication):
         else:
             # If keycloak basic auth fails, try regular basic auth.
             return super().authenticate_credentials(userid, password, request)
+
+    @staticmethod
+    def _cache_verification(cache_key, user, expires_in):
+        ttl = settings.get('GALAXY_KEYCLOAK_BASIC_AUTH_CACHE_TTL')
+        if expires_in is not None:
+            ttl = min(ttl or 0, int(expires_in))
+        if ttl and ttl > 0:
+            cache.set(cache_key, user.pk, ttl)
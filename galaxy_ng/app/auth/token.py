@@ -1,39 +1,107 @@
 import datetime
+import hashlib
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.authtoken.models import Token
 from rest_framework import exceptions
 
+from galaxy_ng.app.tasks.settings_cache import connection_error_wrapper, get_redis_connection
+
+
+TOKEN_CACHE_KEY_PREFIX = 'galaxy_token_auth'
+REVOCATION_KEY_PREFIX = 'GALAXY_TOKEN_AUTH_REVOCATION'
+
+
+def token_cache_key(key):
+    # never put the token itself in the cache key
+    return f'{TOKEN_CACHE_KEY_PREFIX}:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def _revocation_key(cache_key):
+    return f'{REVOCATION_KEY_PREFIX}:{cache_key}'
+
+
+@connection_error_wrapper(default=lambda: None)
+def _get_revision(conn, cache_key):
+    return int(conn.get(_revocation_key(cache_key)) or 0)
+
+
+@connection_error_wrapper(default=lambda: None)
+def _revoke(conn, cache_key, ttl):
+    pipe = conn.pipeline()
+    pipe.incr(_revocation_key(cache_key))
+    # cache entries older than the ttl are gone anyway
+    pipe.expire(_revocation_key(cache_key), ttl)
+    pipe.execute()
+
+
+def invalidate_token_cache(key):
+    """
+    Drop the token from the cache of this process and bump its revision in
+    Redis, so the copies cached by the other processes are not used anymore.
+    """
+    cache_key = token_cache_key(key)
+    cache.delete(cache_key)
+
+    ttl = settings.get('GALAXY_TOKEN_AUTH_CACHE_TTL')
+    conn = get_redis_connection()
+    if ttl and conn is not None:
+        _revoke(conn, cache_key, ttl)
+
+
+def _is_keycloak_user(user):
+    if not hasattr(user, 'social_auth'):
+        return False
+    return user.social_auth.filter(provider="keycloak").exists()
+
 
 class ExpiringTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that keeps the token, its user and the keycloak
+    linkage in the django cache for GALAXY_TOKEN_AUTH_CACHE_TTL seconds, so
+    clients sending the same token over and over do not hit the database for
+    every request.
+
+    Each entry holds the revision of the token in Redis at the time it was
+    cached, deleting the token or saving its user bumps the revision (see
+    galaxy_ng.app.signals.handlers) and the entry is not used anymore by any
+    process. Nothing is cached without a Redis connection.
+    """
 
     def authenticate_credentials(self, key):
-        try:
-            token = Token.objects.get(key=key)
-        except Token.DoesNotExist:
-            raise exceptions.AuthenticationFailed('Invalid token')
+        ttl = settings.get('GALAXY_TOKEN_AUTH_CACHE_TTL')
+        conn = get_redis_connection() if ttl else None
+        cache_key = token_cache_key(key)
+
+        revision = _get_revision(conn, cache_key) if conn is not None else None
+        cached = cache.get(cache_key) if revision is not None else None
+        if cached is None or cached[2] != revision:
+            try:
+                token = Token.objects.select_related('user').get(key=key)
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed('Invalid token')
+            cached = (token, _is_keycloak_user(token.user), revision)
+            if revision is not None:
+                cache.set(cache_key, cached, ttl)
+        token, is_keycloak_user, _ = cached
 
         if not token.user.is_active:
             raise exceptions.AuthenticationFailed('User inactive or deleted')
 
         # Token expiration only for SOCIAL AUTH users
-        if hasattr(token.user, 'social_auth'):
-            from social_django.models import UserSocialAuth
+        if is_keycloak_user:
+            utc_now = timezone.now()
+            # Set default to one day expiration
             try:
-                token.user.social_auth.get(provider="keycloak")
-                utc_now = timezone.now()
-                # Set default to one day expiration
-                try:
-                    expiry = int(settings.get('GALAXY_TOKEN_EXPIRATION'))
-                    if token.created < utc_now - datetime.timedelta(minutes=expiry):
-                        raise exceptions.AuthenticationFailed('Token has expired')
-                except ValueError:
-                    pass
-                except TypeError:
-                    pass
-            except UserSocialAuth.DoesNotExist:
+                expiry = int(settings.get('GALAXY_TOKEN_EXPIRATION'))
+                if token.created < utc_now - datetime.timedelta(minutes=expiry):
+                    raise exceptions.AuthenticationFailed('Token has expired')
+            except ValueError:
+                pass
+            except TypeError:
                 pass
 
         return (token.user, token)
@@ -1,4 +1,4 @@
-from prometheus_client import Counter
+from prometheus_client import Counter, Gauge
 
 
 collection_import_attempts = Counter(
@@ -31,3 +31,19 @@ collection_artifact_download_successes = Counter(
     "galaxy_api_collection_artifact_download_successes",
     "count of successful collection artifact downloads"
 )
+
+legacy_role_download_count_flush_lag = Gauge(
+    "galaxy_api_legacy_role_download_count_flush_lag_seconds",
+    "age of the oldest role download count written on the last flush"
+)
+
+legacy_role_git_mirror_requests = Counter(
+    "galaxy_api_legacy_role_git_mirror_requests",
+    "count of legacy role import clones served by the git mirror cache",
+    ["result"]
+)
+
+legacy_role_git_mirror_bytes_saved = Counter(
+    "galaxy_api_legacy_role_git_mirror_bytes_saved",
+    "size of the git mirrors reused by legacy role imports instead of cloning"
+)
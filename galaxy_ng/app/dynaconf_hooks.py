@@ -11,6 +11,7 @@ settings before making conditionals.
 
 Read more: https://www.dynaconf.com/advanced/#hooks
 """
+import copy
 import json
 import logging
 import os
@@ -337,6 +338,7 @@ def configure_logging(settings: Dynaconf) -> dict[str, Any]:
                 "max_age": None,
                 "performance": False,
                 "snapshot": False,
+                "tracking": "init",
                 "user_mirror": False,
             },
             "modules": ["request", "unspecified", "model"],
@@ -704,6 +706,9 @@ def configure_dynamic_settings(settings: Dynaconf) -> dict[str, Any]:
 
     logger.info("Enabling Dynamic Settings Feature")
 
+    # Read once here, reading it inside the hook would trigger the hook again
+    snapshot_ttl = settings.get("GALAXY_DYNAMIC_SETTINGS_SNAPSHOT_TTL", 5)
+
     def read_settings_from_cache_or_db(
         temp_settings: Settings,
         value: HookValue,
@@ -720,36 +725,42 @@ def configure_dynamic_settings(settings: Dynaconf) -> dict[str, Any]:
             return value.value
 
         # lazy import because it can't happen before apps are ready
-        from galaxy_ng.app.tasks.settings_cache import (
-            get_settings_from_cache,
-            get_settings_from_db,
-        )
-        if data := get_settings_from_cache():
-            metadata = SourceMetadata(loader="hooking", identifier="cache")
-        else:
-            data = get_settings_from_db()
-            if data:
-                metadata = SourceMetadata(loader="hooking", identifier="db")
+        from galaxy_ng.app.tasks.settings_cache import get_settings_snapshot
 
-        # This is the main part, it will update temp_settings with data coming from settings db
-        # and by calling update it will process dynaconf parsing and merging.
-        try:
-            if data:
-                temp_settings.update(data, loader_identifier=metadata, tomlfy=True)
-        except (DynaconfFormatError, DynaconfParseError) as exc:
-            logger.error("Error loading dynamic settings: %s", str(exc))
+        snapshot = get_settings_snapshot(ttl=snapshot_ttl)
+        data = snapshot.data
 
         if not data:
             logger.debug("Dynamic settings are empty, reading key %s from default sources", key)
-        elif key in [_k.split("__")[0] for _k in data]:
-            logger.debug("Dynamic setting for key: %s loaded from %s", key, metadata.identifier)
-        else:
+            return value.value
+
+        base_keys = {_k.split("__")[0].upper() for _k in data}
+        if key.upper() not in base_keys:
             logger.debug(
                 "Key %s not on db/cache, %s other keys loaded from %s",
-                key, len(data), metadata.identifier
+                key, len(data), snapshot.source
             )
+            return value.value
+
+        # Parsed values depend on the default value because of dynaconf merging,
+        # so the cached value is reused only while the default is the same.
+        cached = snapshot.values.get(key.upper())
+        if cached is not None and cached[0] == value.value:
+            return copy.deepcopy(cached[1])
+
+        # This is the main part, it will update temp_settings with data coming from settings db
+        # and by calling update it will process dynaconf parsing and merging.
+        metadata = SourceMetadata(loader="hooking", identifier=snapshot.source)
+        try:
+            temp_settings.update(data, loader_identifier=metadata, tomlfy=True)
+        except (DynaconfFormatError, DynaconfParseError) as exc:
+            logger.error("Error loading dynamic settings: %s", str(exc))
+            return temp_settings.get(key, value.value)
 
-        return temp_settings.get(key, value.value)
+        logger.debug("Dynamic setting for key: %s loaded from %s", key, snapshot.source)
+        result = temp_settings.get(key, value.value)
+        snapshot.values[key.upper()] = (copy.deepcopy(value.value), copy.deepcopy(result))
+        return result
 
     def alter_hostname_settings(
         temp_settings: Settings,
@@ -20,7 +20,8 @@ class Command(BaseCommand):
             logger=logger,
         )
 
-        collector.gather(since=now() - timedelta(days=8), until=now() - timedelta(days=1))
+        # every table is exported from where the previous successful run stopped
+        collector.gather(until=now() - timedelta(days=1))
 
         self.stdout.write("Gather Analytics => S3(Lightspeed): Completed ")
 
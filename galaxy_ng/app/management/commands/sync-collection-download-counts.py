@@ -1,16 +1,25 @@
-import datetime
+import datetime as dt
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
 import requests
+from requests.adapters import HTTPAdapter
 
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.utils import timezone
 from pulp_ansible.app.models import Collection, CollectionDownloadCount
 
+from galaxy_ng.app.utils.galaxy import RateLimiter, safe_fetch
+
 
 log = logging.getLogger(__name__)
 
 
 DEFAULT_UPSTREAM = 'https://old-galaxy.ansible.com'
+DEFAULT_WORKERS = 10
+DEFAULT_BATCH_SIZE = 1000
 
 SKIPLIST = [
     'larrymou9',
@@ -18,6 +27,26 @@ SKIPLIST = [
 ]
 
 
+def fetch_download_count(upstream, namespace, name, session=None, limiter=None):
+    """Return the upstream download count of a collection, None if it is unknown."""
+    query = urlencode({'namespace': namespace, 'name': name})
+    detail_url = upstream + f'/api/internal/ui/repo-or-collection-detail/?{query}'
+    try:
+        ds = safe_fetch(detail_url, session=session, limiter=limiter).json()
+    except (requests.RequestException, ValueError) as e:
+        log.error(f'{namespace}.{name}: {e}')
+        return None
+
+    if 'data' not in ds:
+        log.error(ds)
+        return None
+    if 'collection' not in ds['data']:
+        log.error(ds['data'].keys())
+        return None
+
+    return ds['data']['collection']['download_count']
+
+
 class Command(BaseCommand):
 
     def add_arguments(self, parser):
@@ -30,71 +59,104 @@ class Command(BaseCommand):
         parser.add_argument(
             '--force', action='store_true', help='sync all counts and ignore last update'
         )
+        parser.add_argument(
+            '--workers', type=int, default=DEFAULT_WORKERS,
+            help=f"concurrent requests to the upstream [{DEFAULT_WORKERS}]"
+        )
+        parser.add_argument(
+            '--rate-limit', type=float,
+            help="maximum requests per second sent to the upstream"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help=f"counters written per transaction [{DEFAULT_BATCH_SIZE}]"
+        )
 
     def handle(self, *args, **options):
         log.info(f"Processing upstream download counts from {options['upstream']}")
         upstream = options['upstream']
         limit = options['limit']
+        batch_size = options['batch_size']
 
-        now = datetime.datetime.now()  # noqa: DTZ005
-
-        collection_count = 0
-        collection_total = Collection.objects.count()
-        for collection in Collection.objects.all().order_by('pulp_created'):
-
-            namespace = collection.namespace
-            name = collection.name
-            collection_count += 1
+        now = timezone.now()
 
-            log.info(f'{collection_total}|{collection_count} {namespace}.{name}')
+        counters = {
+            (counter.namespace, counter.name): counter
+            for counter in CollectionDownloadCount.objects.all()
+        }
 
-            if limit and collection_count > limit:
-                break
+        collections = Collection.objects.order_by('pulp_created').values_list('namespace', 'name')
+        if limit:
+            collections = collections[:limit]
 
+        to_fetch = []
+        for namespace, name in collections:
             if namespace in SKIPLIST:
                 continue
 
             # optimization: don't try to resync something that changed less than a day ago
-            counter = CollectionDownloadCount.objects.filter(namespace=namespace, name=name).first()
-            if counter is not None and not options['force']:
-                delta = (now - counter.pulp_last_updated.replace(tzinfo=None)).total_seconds()
-                if (delta / 60) < (24 * 60 * 60):
-                    continue
+            counter = counters.get((namespace, name))
+            if (
+                counter is not None
+                and not options['force']
+                and now - counter.pulp_last_updated < dt.timedelta(days=1)
+            ):
+                continue
+
+            to_fetch.append((namespace, name))
+
+        log.info(f'fetching {len(to_fetch)} of {len(counters)} known download counts')
 
-            detail_url = (
-                upstream
-                + f'/api/internal/ui/repo-or-collection-detail/?namespace={namespace}&name={name}'
+        session = requests.Session()
+        session.mount(upstream, HTTPAdapter(pool_maxsize=options['workers']))
+        limiter = RateLimiter(options['rate_limit'])
+
+        def fetch(collection):
+            namespace, name = collection
+            dcount = fetch_download_count(
+                upstream, namespace, name, session=session, limiter=limiter
             )
-            log.info('\t' + detail_url)
-            drr = requests.get(detail_url)
-            ds = drr.json()
-            if 'data' not in ds:
-                log.error(ds)
-                continue
-            if 'collection' not in ds['data']:
-                log.error(ds['data'].keys())
-                continue
+            return namespace, name, dcount
 
-            cid = ds['data']['collection']['id']
-            dcount = ds['data']['collection']['download_count']
-            log.info(f'\t{cid} {namespace}.{name} downloads:{dcount}')
+        to_create = []
+        to_update = []
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for namespace, name, dcount in executor.map(fetch, to_fetch):
+                if dcount is None:
+                    continue
 
-            if counter is None:
-                log.info(f'\tcreate downloadcount for {namespace}.{name} with value of {dcount}')
-                with transaction.atomic():
-                    counter = CollectionDownloadCount(
+                counter = counters.get((namespace, name))
+                if counter is None:
+                    log.info(
+                        f'\tcreate downloadcount for {namespace}.{name} with value of {dcount}'
+                    )
+                    to_create.append(CollectionDownloadCount(
                         namespace=namespace,
                         name=name,
                         download_count=dcount
+                    ))
+                elif counter.download_count < dcount:
+                    log.info(
+                        f'\tupdate downloadcount for {namespace}.{name}'
+                        + f' from {counter.download_count} to {dcount}'
                     )
-                    counter.save()
-                continue
-
-            if counter.download_count < dcount:
-                log.info(
-                    f'\tupdate downloadcount for {namespace}.{name}'
-                    + f' from {counter.download_count} to {dcount}'
-                )
-                with transaction.atomic():
                     counter.download_count = dcount
-                    continue
+                    # bulk_update does not touch auto_now fields
+                    counter.pulp_last_updated = timezone.now()
+                    to_update.append(counter)
+
+                if len(to_create) + len(to_update) >= batch_size:
+                    self._write(to_create, to_update)
+                    to_create, to_update = [], []
+
+        self._write(to_create, to_update)
+
+    @staticmethod
+    def _write(to_create, to_update):
+        with transaction.atomic():
+            # counters created meanwhile by actual downloads are left alone
+            CollectionDownloadCount.objects.bulk_create(to_create, ignore_conflicts=True)
+            CollectionDownloadCount.objects.bulk_update(
+                to_update, ['download_count', 'pulp_last_updated']
+            )
+        log.info(f'created {len(to_create)} and updated {len(to_update)} download counts')
@@ -16,9 +16,10 @@ def instance_info(since, **kwargs):
 
 @register("collections", "1.0", format="csv", description="Data on ansible_collection")
 def collections(since, full_path, until, **kwargs):
-    query = data.collections_query()
-
-    return export_to_csv(full_path, "collections", query)
+    query, params = data.changed_rows(
+        data.collections_query(), '"ansible_collection"."pulp_last_updated"', since, until
+    )
+    return export_to_csv(full_path, "collections", query, params)
 
 
 @register(
@@ -28,9 +29,10 @@ def collections(since, full_path, until, **kwargs):
     description="Data on ansible_collectionversion",
 )
 def collection_versions(since, full_path, until, **kwargs):
-    query = data.collection_versions_query()
-
-    return export_to_csv(full_path, "collection_versions", query)
+    query, params = data.changed_rows(
+        data.collection_versions_query(), '"core_content"."pulp_last_updated"', since, until
+    )
+    return export_to_csv(full_path, "collection_versions", query, params)
 
 
 @register(
@@ -50,9 +52,11 @@ def collection_version_tags(since, full_path, **kwargs):
     format="csv",
     description="Data on ansible_tag"
 )
-def collection_tags(since, full_path, **kwargs):
-    query = data.collection_tags_query()
-    return export_to_csv(full_path, "collection_tags", query)
+def collection_tags(since, full_path, until, **kwargs):
+    query, params = data.changed_rows(
+        data.collection_tags_query(), 'pulp_last_updated', since, until
+    )
+    return export_to_csv(full_path, "collection_tags", query, params)
 
 
 @register(
@@ -61,10 +65,11 @@ def collection_tags(since, full_path, **kwargs):
     format="csv",
     description="Data on ansible_collectionversionsignature",
 )
-def collection_version_signatures(since, full_path, **kwargs):
-    query = data.collection_version_signatures_query()
-
-    return export_to_csv(full_path, "collection_version_signatures", query)
+def collection_version_signatures(since, full_path, until, **kwargs):
+    query, params = data.changed_rows(
+        data.collection_version_signatures_query(), '"core_content".pulp_last_updated', since, until
+    )
+    return export_to_csv(full_path, "collection_version_signatures", query, params)
 
 
 @register(
@@ -73,9 +78,11 @@ def collection_version_signatures(since, full_path, **kwargs):
     format="csv",
     description="Data on core_signingservice"
 )
-def signing_services(since, full_path, **kwargs):
-    query = data.signing_services_query()
-    return export_to_csv(full_path, "signing_services", query)
+def signing_services(since, full_path, until, **kwargs):
+    query, params = data.changed_rows(
+        data.signing_services_query(), 'pulp_last_updated', since, until
+    )
+    return export_to_csv(full_path, "signing_services", query, params)
 
 
 @register(
@@ -85,8 +92,10 @@ def signing_services(since, full_path, **kwargs):
     description="Data from ansible_downloadlog"
 )
 def collection_download_logs(since, full_path, until, **kwargs):
-    query = data.collection_downloads_query()
-    return export_to_csv(full_path, "collection_download_logs", query)
+    query, params = data.changed_rows(
+        data.collection_downloads_query(), 'pulp_last_updated', since, until
+    )
+    return export_to_csv(full_path, "collection_download_logs", query, params)
 
 
 @register(
@@ -96,27 +105,30 @@ def collection_download_logs(since, full_path, until, **kwargs):
     description="Data from ansible_collectiondownloadcount"
 )
 def collection_download_counts(since, full_path, until, **kwargs):
-    query = data.collection_download_counts_query()
-    return export_to_csv(full_path, "collection_download_counts", query)
+    query, params = data.changed_rows(
+        data.collection_download_counts_query(), 'pulp_last_updated', since, until
+    )
+    return export_to_csv(full_path, "collection_download_counts", query, params)
 
 
 def _get_csv_splitter(file_path, max_data_size=209715200):
     return CsvFileSplitter(filespec=file_path, max_file_size=max_data_size)
 
 
-def export_to_csv(full_path, file_name, query):
+def export_to_csv(full_path, file_name, query, params=None):
     copy_query = f"""COPY (
     {query}
     ) TO STDOUT WITH CSV HEADER
     """
-    return _simple_csv(full_path, file_name, copy_query, max_data_size=209715200)
+    return _simple_csv(full_path, file_name, copy_query, params, max_data_size=209715200)
 
 
-def _simple_csv(full_path, file_name, query, max_data_size=209715200):
+def _simple_csv(full_path, file_name, query, params=None, max_data_size=209715200):
     file_path = _get_file_path(full_path, file_name)
     tfile = _get_csv_splitter(file_path, max_data_size)
 
-    with connection.cursor() as cursor, cursor.copy(query) as copy:
+    # rows are streamed from COPY into the size split files
+    with connection.cursor() as cursor, cursor.copy(query, params) as copy:
         while data := copy.read():
             tfile.write(str(data, 'utf8'))
 
@@ -1,11 +1,61 @@
 from django.db import connection
+from django.utils.dateparse import parse_datetime
 from insights_analytics_collector import Collector as BaseCollector
+from insights_analytics_collector.collection_csv import CollectionCSV as BaseCollectionCSV
+
+from galaxy_ng.app.models import MetricsCollectionState
+
+
+class CollectionCSV(BaseCollectionCSV):
+    def _gather_since(self):
+        """
+        Export the rows changed after the last shipped window of this table,
+        or the whole table before its first successful shipment.
+
+        Unlike the library default, the watermark is not truncated to 4 weeks,
+        so a collector that did not run for a while does not skip any rows.
+        """
+        return self.collector.gather_since or self.last_gathered_entry
 
 
 class Collector(BaseCollector):
+    # key of the MetricsCollectionState row, set by the subclasses
+    STATE_KEY = None
+
     def _is_valid_license(self):
         return True
 
     @staticmethod
     def db_connection():
         return connection
+
+    @staticmethod
+    def _collection_csv_class():
+        return CollectionCSV
+
+    def _get_state(self):
+        state, _ = MetricsCollectionState.objects.get_or_create(collector=self.STATE_KEY)
+        return state
+
+    def _last_gathering(self):
+        return self._get_state().last_gather
+
+    def _load_last_gathered_entries(self):
+        entries = self._get_state().last_gathered_entries
+        return {key: parse_datetime(value) for key, value in entries.items()}
+
+    def _save_last_gathered_entries(self, last_gathered_entries):
+        MetricsCollectionState.objects.update_or_create(
+            collector=self.STATE_KEY,
+            defaults={"last_gathered_entries": {
+                key: value.isoformat()
+                for key, value in last_gathered_entries.items()
+                if value is not None
+            }},
+        )
+
+    def _save_last_gather(self):
+        MetricsCollectionState.objects.update_or_create(
+            collector=self.STATE_KEY,
+            defaults={"last_gather": self.gather_until},
+        )
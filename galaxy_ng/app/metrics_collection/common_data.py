@@ -69,6 +69,26 @@ def instance_info():
     }
 
 
+def changed_rows(query, column, since, until):
+    """
+    Restrict an export query to the rows whose `column` changed inside the
+    collection window. `since` is None on the first export of a table.
+
+    Returns the query and its parameters.
+    """
+    conditions = []
+    params = {}
+    if since is not None:
+        conditions.append(f"{column} > %(since)s")
+        params["since"] = since
+    if until is not None:
+        conditions.append(f"{column} <= %(until)s")
+        params["until"] = until
+    if conditions:
+        query = f"{query} WHERE {' AND '.join(conditions)}"
+    return query, params
+
+
 def collections_query():
     return """
         SELECT "ansible_collection"."pulp_id" AS uuid,
@@ -31,19 +31,16 @@ def instance_info(since, **kwargs):
 
 @register("ansible_collection_table", "1.0", format="csv", description="Data on ansible_collection")
 def ansible_collection_table(since, full_path, until, **kwargs):
-    source_query = """
-        COPY (
+    query, params = data.changed_rows("""
             SELECT "ansible_collection"."pulp_id",
                    "ansible_collection"."pulp_created",
                    "ansible_collection"."pulp_last_updated",
                    "ansible_collection"."namespace",
                    "ansible_collection"."name"
             FROM "ansible_collection"
-        )
-        TO STDOUT WITH CSV HEADER
-    """
+    """, '"ansible_collection"."pulp_last_updated"', since, until)
 
-    return _simple_csv(full_path, "ansible_collection", source_query)
+    return _simple_csv(full_path, "ansible_collection", _copy_query(query), params)
 
 
 @register(
@@ -53,7 +50,7 @@ def ansible_collection_table(since, full_path, until, **kwargs):
     description="Data on ansible_collectionversion",
 )
 def ansible_collectionversion_table(since, full_path, until, **kwargs):
-    source_query = """COPY (
+    query, params = data.changed_rows("""
             SELECT "ansible_collectionversion"."content_ptr_id",
                    "core_content"."pulp_created",
                    "core_content"."pulp_last_updated",
@@ -74,9 +71,8 @@ def ansible_collectionversion_table(since, full_path, until, **kwargs):
                 "ansible_collectionversion"."content_ptr_id" =
                 "ansible_collectionversion_tags"."collectionversion_id"
                 )
-        ) TO STDOUT WITH CSV HEADER
-    """
-    return _simple_csv(full_path, "ansible_collectionversion", source_query)
+    """, '"core_content"."pulp_last_updated"', since, until)
+    return _simple_csv(full_path, "ansible_collectionversion", _copy_query(query), params)
 
 
 @register(
@@ -86,12 +82,15 @@ def ansible_collectionversion_table(since, full_path, until, **kwargs):
     description="Data on ansible_collectionversionsignature",
 )
 def ansible_collectionversionsignature_table(since, full_path, until, **kwargs):
-    # currently no rows in the table, so no objects to base a query off
-    source_query = """COPY (
-            SELECT * FROM ansible_collectionversionsignature
-        ) TO STDOUT WITH CSV HEADER
-    """
-    return _simple_csv(full_path, "ansible_collectionversionsignature", source_query)
+    # the timestamps of content live in core_content
+    query, params = data.changed_rows("""
+            SELECT ansible_collectionversionsignature.* FROM ansible_collectionversionsignature
+            INNER JOIN core_content
+                ON core_content.pulp_id = ansible_collectionversionsignature.content_ptr_id
+    """, "core_content.pulp_last_updated", since, until)
+    return _simple_csv(
+        full_path, "ansible_collectionversionsignature", _copy_query(query), params
+    )
 
 
 @register(
@@ -101,12 +100,12 @@ def ansible_collectionversionsignature_table(since, full_path, until, **kwargs):
     description="Data on ansible_collectionimport",
 )
 def ansible_collectionimport_table(since, full_path, until, **kwargs):
-    # currently no rows in the table, so no objects to base a query off
-    source_query = """COPY (
-            SELECT * FROM ansible_collectionimport
-        ) TO STDOUT WITH CSV HEADER
-    """
-    return _simple_csv(full_path, "ansible_collectionimport", source_query)
+    # an import changes with its task
+    query, params = data.changed_rows("""
+            SELECT ansible_collectionimport.* FROM ansible_collectionimport
+            INNER JOIN core_task ON core_task.pulp_id = ansible_collectionimport.task_id
+    """, "core_task.pulp_last_updated", since, until)
+    return _simple_csv(full_path, "ansible_collectionimport", _copy_query(query), params)
 
 
 # Does not exist
@@ -129,12 +128,12 @@ def ansible_collectionimport_table(since, full_path, until, **kwargs):
     description="Data on container_containerrepository",
 )
 def container_containerrepository_table(since, full_path, until, **kwargs):
-    # currently no rows in the table, so no objects to base a query off
-    source_query = """COPY (
-            SELECT * FROM container_containerrepository
-        ) TO STDOUT WITH CSV HEADER
-    """
-    return _simple_csv(full_path, "container_containerrepository", source_query)
+    query, params = data.changed_rows("""
+            SELECT container_containerrepository.* FROM container_containerrepository
+            INNER JOIN core_repository
+                ON core_repository.pulp_id = container_containerrepository.repository_ptr_id
+    """, "core_repository.pulp_last_updated", since, until)
+    return _simple_csv(full_path, "container_containerrepository", _copy_query(query), params)
 
 
 @register(
@@ -144,62 +143,69 @@ def container_containerrepository_table(since, full_path, until, **kwargs):
     description="Data on container_containerremote",
 )
 def container_containerremote_table(since, full_path, until, **kwargs):
-    # currently no rows in the table, so no objects to base a query off
-    source_query = """COPY (
-            SELECT * FROM container_containerremote
-        ) TO STDOUT WITH CSV HEADER
-    """
-    return _simple_csv(full_path, "container_containerremote", source_query)
+    query, params = data.changed_rows("""
+            SELECT container_containerremote.* FROM container_containerremote
+            INNER JOIN core_remote ON core_remote.pulp_id = container_containerremote.remote_ptr_id
+    """, "core_remote.pulp_last_updated", since, until)
+    return _simple_csv(full_path, "container_containerremote", _copy_query(query), params)
 
 
 @register("container_tag_table", "1.0", format="csv", description="Data on container_tag")
 def container_tag_table(since, full_path, until, **kwargs):
-    # currently no rows in the table, so no objects to base a query off
-    source_query = """COPY (
-            SELECT * FROM container_tag
-        ) TO STDOUT WITH CSV HEADER
-    """
-    return _simple_csv(full_path, "container_tag", source_query)
+    query, params = data.changed_rows("""
+            SELECT container_tag.* FROM container_tag
+            INNER JOIN core_content ON core_content.pulp_id = container_tag.content_ptr_id
+    """, "core_content.pulp_last_updated", since, until)
+    return _simple_csv(full_path, "container_tag", _copy_query(query), params)
 
 
 @register(
     "galaxy_legacynamespace", "1.0", format="csv", description="Data on galaxy_legacynamespace"
 )
 def galaxy_legacynamespace_table(since, full_path, until, **kwargs):
-    source_query = """COPY (SELECT
+    query, params = data.changed_rows("""SELECT
             id, created, modified, name, company, avatar_url, description, namespace_id
             FROM galaxy_legacynamespace
-        ) TO STDOUT WITH CSV HEADER"""
-    return _simple_csv(full_path, "galaxy_legacynamespace", source_query)
+    """, "modified", since, until)
+    return _simple_csv(full_path, "galaxy_legacynamespace", _copy_query(query), params)
 
 
 @register("galaxy_legacyrole", "1.0", format="csv", description="Data on galaxy_legacyrole")
 def galaxy_legacyrole_table(since, full_path, until, **kwargs):
-    source_query = """COPY (SELECT
+    query, params = data.changed_rows("""SELECT
             id, created, modified, name, full_metadata, namespace_id
             FROM galaxy_legacyrole
-        ) TO STDOUT WITH CSV HEADER"""
-    return _simple_csv(full_path, "galaxy_legacyrole", source_query)
+    """, "modified", since, until)
+    return _simple_csv(full_path, "galaxy_legacyrole", _copy_query(query), params)
 
 
 @register(
     "galaxy_aiindexdenylist", "1.0", format="csv", description="Data on galaxy_aiindexdenylist"
 )
 def galaxy_aiindexdenylist_table(since, full_path, until, **kwargs):
+    # no timestamps, the table is small and always exported in full
     source_query = """COPY (SELECT * FROM galaxy_aiindexdenylist
         ) TO STDOUT WITH CSV HEADER"""
     return _simple_csv(full_path, "galaxy_aiindexdenylist", source_query)
 
 
+def _copy_query(query):
+    return f"""COPY (
+        {query}
+    ) TO STDOUT WITH CSV HEADER
+    """
+
+
 def _get_csv_splitter(file_path, max_data_size=209715200):
     return CsvFileSplitter(filespec=file_path, max_file_size=max_data_size)
 
 
-def _simple_csv(full_path, file_name, query, max_data_size=209715200):
+def _simple_csv(full_path, file_name, query, params=None, max_data_size=209715200):
     file_path = _get_file_path(full_path, file_name)
     tfile = _get_csv_splitter(file_path, max_data_size)
 
-    with connection.cursor() as cursor, cursor.copy(query) as copy:
+    # rows are streamed from COPY into the size split files
+    with connection.cursor() as cursor, cursor.copy(query, params) as copy:
         while data := copy.read():
             tfile.write(str(data, 'utf8'))
 
@@ -52,6 +52,9 @@ class Package(InsightsAnalyticsPackage):
                 region_name=self._get_rh_region(),
             )
 
-            return s3_client.upload_file(
+            result = s3_client.upload_file(
                 self.tar_path, self._get_rh_bucket(), os.path.basename(self.tar_path).split("/")[-1]
             )
+            # advances the watermarks of the shipped collections
+            self.shipping_successful = True
+            return result
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0117_task_unblocked_at"),
+        ("ansible", "0055_alter_collectionversion_version_alter_role_version"),
+        ("galaxy", "0055_remove_organization_users_remove_team_users"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HighestCollectionVersion",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "collection",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="ansible.collection",
+                    ),
+                ),
+                (
+                    "collection_version",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="ansible.collectionversion",
+                    ),
+                ),
+                (
+                    "repository_version",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="core.repositoryversion",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("repository_version", "collection")},
+            },
+        ),
+    ]
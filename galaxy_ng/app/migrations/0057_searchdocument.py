@@ -0,0 +1,402 @@
+# Generated by Django 4.2.16 on 2026-10-18 12:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+DOCUMENT_COLUMNS = [
+    "content_type",
+    "collection_id",
+    "role_id",
+    "name",
+    "namespace_name",
+    "description_text",
+    "latest_version",
+    "tag_names",
+    "platform_names",
+    "content_list",
+    "namespace_avatar",
+    "last_updated",
+    "deprecated",
+    "download_count",
+    "search",
+]
+
+INSERT_DOCUMENT = "INSERT INTO galaxy_searchdocument({columns})".format(
+    columns=", ".join(DOCUMENT_COLUMNS)
+)
+
+UPSERT_DOCUMENT = "DO UPDATE SET {columns}".format(
+    columns=", ".join(f"{column} = EXCLUDED.{column}" for column in DOCUMENT_COLUMNS)
+)
+
+# A collection document is the highest CollectionVersion of the collection,
+# the same values the search view used to annotate on every request.
+CREATE_REFRESH_FUNCTIONS = f"""
+CREATE OR REPLACE FUNCTION galaxy_refresh_collection_search_document(_collection_id uuid)
+    RETURNS void
+    AS $$
+BEGIN
+    {INSERT_DOCUMENT}
+    SELECT
+        'collection',
+        cv.collection_id,
+        NULL,
+        cv.name,
+        cv.namespace,
+        cv.description,
+        cv.version,
+        COALESCE((
+            SELECT jsonb_agg(t.name)
+            FROM ansible_tag t
+            INNER JOIN ansible_collectionversion_tags cvt ON t.pulp_id = cvt.tag_id
+            WHERE cvt.collectionversion_id = cv.content_ptr_id
+        ), '[]'::jsonb),
+        '[]'::jsonb,
+        cv.contents,
+        (SELECT ns._avatar_url FROM galaxy_namespace ns WHERE ns.name = cv.namespace),
+        c.timestamp_of_interest,
+        EXISTS(
+            SELECT 1 FROM ansible_ansiblecollectiondeprecated d
+            WHERE d.namespace = cv.namespace AND d.name = cv.name
+        ),
+        COALESCE((
+            SELECT dc.download_count FROM ansible_collectiondownloadcount dc
+            WHERE dc.namespace = cv.namespace AND dc.name = cv.name
+        ), 0),
+        cv.search_vector
+    FROM ansible_collectionversion cv
+    INNER JOIN core_content c ON c.pulp_id = cv.content_ptr_id
+    WHERE cv.collection_id = _collection_id AND cv.is_highest
+    ON CONFLICT (collection_id) {UPSERT_DOCUMENT};
+
+    IF NOT FOUND THEN
+        DELETE FROM galaxy_searchdocument WHERE collection_id = _collection_id;
+    END IF;
+END;
+$$
+LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION galaxy_refresh_role_search_document(_role_id integer)
+    RETURNS void
+    AS $$
+BEGIN
+    {INSERT_DOCUMENT}
+    SELECT
+        'role',
+        NULL,
+        r.id,
+        r.name,
+        ln.name,
+        r.full_metadata->>'description',
+        r.full_metadata #>> '{{versions,-1,version}}',
+        r.full_metadata->'tags',
+        r.full_metadata->'platforms',
+        '[]'::jsonb,
+        ns._avatar_url,
+        r.created,
+        false,
+        COALESCE(dc.count, 0),
+        sv.search_vector
+    FROM galaxy_legacyrole r
+    INNER JOIN galaxy_legacynamespace ln ON ln.id = r.namespace_id
+    LEFT JOIN galaxy_namespace ns ON ns.id = ln.namespace_id
+    LEFT JOIN galaxy_legacyroledownloadcount dc ON dc.legacyrole_id = r.id
+    LEFT JOIN galaxy_legacyrolesearchvector sv ON sv.role_id = r.id
+    WHERE r.id = _role_id
+    ON CONFLICT (role_id) {UPSERT_DOCUMENT};
+END;
+$$
+LANGUAGE plpgsql;
+"""
+
+# Only changes that can alter a document are propagated, rows that are not
+# (and were not) the highest version of a collection are ignored.
+CREATE_COLLECTION_TRIGGERS = """
+CREATE OR REPLACE FUNCTION galaxy_collectionversion_search_document()
+    RETURNS TRIGGER
+    AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.is_highest THEN
+            PERFORM galaxy_refresh_collection_search_document(NEW.collection_id);
+        END IF;
+        RETURN NEW;
+    ELSIF TG_OP = 'DELETE' THEN
+        IF OLD.is_highest THEN
+            PERFORM galaxy_refresh_collection_search_document(OLD.collection_id);
+        END IF;
+        RETURN OLD;
+    END IF;
+    IF OLD.is_highest OR NEW.is_highest THEN
+        PERFORM galaxy_refresh_collection_search_document(NEW.collection_id);
+    END IF;
+    RETURN NEW;
+END;
+$$
+LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS galaxy_search_document ON ansible_collectionversion;
+CREATE TRIGGER galaxy_search_document
+    AFTER INSERT OR UPDATE OR DELETE
+    ON ansible_collectionversion
+    FOR EACH ROW
+EXECUTE PROCEDURE galaxy_collectionversion_search_document();
+
+CREATE OR REPLACE FUNCTION galaxy_content_search_document()
+    RETURNS TRIGGER
+    AS $$
+BEGIN
+    UPDATE galaxy_searchdocument SET last_updated = NEW.timestamp_of_interest
+    WHERE collection_id = (
+        SELECT collection_id FROM ansible_collectionversion
+        WHERE content_ptr_id = NEW.pulp_id AND is_highest
+    );
+    RETURN NEW;
+END;
+$$
+LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS galaxy_search_document ON core_content;
+CREATE TRIGGER galaxy_search_document
+    AFTER UPDATE OF timestamp_of_interest
+    ON core_content
+    FOR EACH ROW
+    WHEN (NEW.pulp_type = 'ansible.collection_version')
+EXECUTE PROCEDURE galaxy_content_search_document();
+
+CREATE OR REPLACE FUNCTION galaxy_deprecated_search_document()
+    RETURNS TRIGGER
+    AS $$
+DECLARE
+    _row ansible_ansiblecollectiondeprecated;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        _row := OLD;
+    ELSE
+        _row := NEW;
+    END IF;
+    UPDATE galaxy_searchdocument SET deprecated = EXISTS(
+        SELECT 1 FROM ansible_ansiblecollectiondeprecated d
+        WHERE d.namespace = _row.namespace AND d.name = _row.name
+    )
+    WHERE content_type = 'collection'
+        AND namespace_name = _row.namespace
+        AND name = _row.name;
+    RETURN _row;
+END;
+$$
+LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS galaxy_search_document ON ansible_ansiblecollectiondeprecated;
+CREATE TRIGGER galaxy_search_document
+    AFTER INSERT OR DELETE
+    ON ansible_ansiblecollectiondeprecated
+    FOR EACH ROW
+EXECUTE PROCEDURE galaxy_deprecated_search_document();
+
+CREATE OR REPLACE FUNCTION galaxy_collection_download_count_search_document()
+    RETURNS TRIGGER
+    AS $$
+BEGIN
+    UPDATE galaxy_searchdocument SET download_count = NEW.download_count
+    WHERE content_type = 'collection'
+        AND namespace_name = NEW.namespace
+        AND name = NEW.name;
+    RETURN NEW;
+END;
+$$
+LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS galaxy_search_document ON ansible_collectiondownloadcount;
+CREATE TRIGGER galaxy_search_document
+    AFTER INSERT OR UPDATE OF download_count
+    ON ansible_collectiondownloadcount
+    FOR EACH ROW
+EXECUTE PROCEDURE galaxy_collection_download_count_search_document();
+"""
+
+# Role documents follow galaxy_legacyrolesearchvector, which the
+# update_role_ts_vector trigger (migration 0047) rewrites on every role change.
+CREATE_ROLE_TRIGGERS = """
+CREATE OR REPLACE FUNCTION galaxy_role_search_document()
+    RETURNS TRIGGER
+    AS $$
+BEGIN
+    PERFORM galaxy_refresh_role_search_document(NEW.role_id);
+    RETURN NEW;
+END;
+$$
+LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS galaxy_search_document ON galaxy_legacyrolesearchvector;
+CREATE TRIGGER galaxy_search_document
+    AFTER INSERT OR UPDATE
+    ON galaxy_legacyrolesearchvector
+    FOR EACH ROW
+EXECUTE PROCEDURE galaxy_role_search_document();
+
+CREATE OR REPLACE FUNCTION galaxy_role_download_count_search_document()
+    RETURNS TRIGGER
+    AS $$
+BEGIN
+    UPDATE galaxy_searchdocument SET download_count = NEW.count
+    WHERE role_id = NEW.legacyrole_id;
+    RETURN NEW;
+END;
+$$
+LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS galaxy_search_document ON galaxy_legacyroledownloadcount;
+CREATE TRIGGER galaxy_search_document
+    AFTER INSERT OR UPDATE OF count
+    ON galaxy_legacyroledownloadcount
+    FOR EACH ROW
+EXECUTE PROCEDURE galaxy_role_download_count_search_document();
+
+CREATE OR REPLACE FUNCTION galaxy_legacynamespace_search_document()
+    RETURNS TRIGGER
+    AS $$
+BEGIN
+    PERFORM galaxy_refresh_role_search_document(r.id)
+    FROM galaxy_legacyrole r WHERE r.namespace_id = NEW.id;
+    RETURN NEW;
+END;
+$$
+LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS galaxy_search_document ON galaxy_legacynamespace;
+CREATE TRIGGER galaxy_search_document
+    AFTER UPDATE OF name, namespace_id
+    ON galaxy_legacynamespace
+    FOR EACH ROW
+EXECUTE PROCEDURE galaxy_legacynamespace_search_document();
+
+CREATE OR REPLACE FUNCTION galaxy_namespace_search_document()
+    RETURNS TRIGGER
+    AS $$
+BEGIN
+    UPDATE galaxy_searchdocument SET namespace_avatar = NEW._avatar_url
+    WHERE (content_type = 'collection' AND namespace_name = NEW.name)
+        OR role_id IN (
+            SELECT r.id FROM galaxy_legacyrole r
+            INNER JOIN galaxy_legacynamespace ln ON ln.id = r.namespace_id
+            WHERE ln.namespace_id = NEW.id
+        );
+    RETURN NEW;
+END;
+$$
+LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS galaxy_search_document ON galaxy_namespace;
+CREATE TRIGGER galaxy_search_document
+    AFTER INSERT OR UPDATE OF _avatar_url
+    ON galaxy_namespace
+    FOR EACH ROW
+EXECUTE PROCEDURE galaxy_namespace_search_document();
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER IF EXISTS galaxy_search_document ON ansible_collectionversion;
+DROP TRIGGER IF EXISTS galaxy_search_document ON core_content;
+DROP TRIGGER IF EXISTS galaxy_search_document ON ansible_ansiblecollectiondeprecated;
+DROP TRIGGER IF EXISTS galaxy_search_document ON ansible_collectiondownloadcount;
+DROP TRIGGER IF EXISTS galaxy_search_document ON galaxy_legacyrolesearchvector;
+DROP TRIGGER IF EXISTS galaxy_search_document ON galaxy_legacyroledownloadcount;
+DROP TRIGGER IF EXISTS galaxy_search_document ON galaxy_legacynamespace;
+DROP TRIGGER IF EXISTS galaxy_search_document ON galaxy_namespace;
+DROP FUNCTION IF EXISTS galaxy_collectionversion_search_document();
+DROP FUNCTION IF EXISTS galaxy_content_search_document();
+DROP FUNCTION IF EXISTS galaxy_deprecated_search_document();
+DROP FUNCTION IF EXISTS galaxy_collection_download_count_search_document();
+DROP FUNCTION IF EXISTS galaxy_role_search_document();
+DROP FUNCTION IF EXISTS galaxy_role_download_count_search_document();
+DROP FUNCTION IF EXISTS galaxy_legacynamespace_search_document();
+DROP FUNCTION IF EXISTS galaxy_namespace_search_document();
+DROP FUNCTION IF EXISTS galaxy_refresh_collection_search_document(uuid);
+DROP FUNCTION IF EXISTS galaxy_refresh_role_search_document(integer);
+"""
+
+REBUILD_SEARCH_DOCUMENTS = """
+SELECT galaxy_refresh_collection_search_document(pulp_id) FROM ansible_collection;
+SELECT galaxy_refresh_role_search_document(id) FROM galaxy_legacyrole;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0117_task_unblocked_at"),
+        ("ansible", "0055_alter_collectionversion_version_alter_role_version"),
+        ("galaxy", "0056_highestcollectionversion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("content_type", models.CharField(max_length=16)),
+                ("name", models.CharField(max_length=64)),
+                ("namespace_name", models.CharField(max_length=64)),
+                ("description_text", models.TextField(null=True)),
+                ("latest_version", models.CharField(max_length=128, null=True)),
+                ("tag_names", models.JSONField(null=True)),
+                ("platform_names", models.JSONField(null=True)),
+                ("content_list", models.JSONField(null=True)),
+                ("namespace_avatar", models.CharField(max_length=256, null=True)),
+                ("last_updated", models.DateTimeField(null=True)),
+                ("deprecated", models.BooleanField(default=False)),
+                ("download_count", models.BigIntegerField(default=0)),
+                ("search", django.contrib.postgres.search.SearchVectorField(null=True)),
+                (
+                    "collection",
+                    models.OneToOneField(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="ansible.collection",
+                    ),
+                ),
+                (
+                    "role",
+                    models.OneToOneField(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="galaxy.legacyrole",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["search"], name="galaxy_searchdoc_search_idx"
+                    ),
+                    models.Index(
+                        fields=["-download_count", "-last_updated"],
+                        name="galaxy_searchdoc_popular_idx",
+                    ),
+                    models.Index(
+                        fields=["content_type", "-download_count"],
+                        name="galaxy_searchdoc_type_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            sql=CREATE_REFRESH_FUNCTIONS + CREATE_COLLECTION_TRIGGERS + CREATE_ROLE_TRIGGERS,
+            reverse_sql=DROP_TRIGGERS,
+        ),
+        migrations.RunSQL(
+            sql=REBUILD_SEARCH_DOCUMENTS,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.16 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("galaxy", "0057_searchdocument"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MetricsCollectionState",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("collector", models.CharField(max_length=64, unique=True)),
+                ("last_gather", models.DateTimeField(null=True)),
+                ("last_gathered_entries", models.JSONField(default=dict)),
+            ],
+        ),
+        # metrics collection exports the download log rows added since the last run
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX IF NOT EXISTS galaxy_downloadlog_last_updated_idx "
+                "ON ansible_downloadlog (pulp_last_updated)"
+            ),
+            reverse_sql="DROP INDEX IF EXISTS galaxy_downloadlog_last_updated_idx",
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.16 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("galaxy", "0058_metricscollectionstate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="containerregistryrepos",
+            name="upstream_fingerprint",
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name="containerregistryrepos",
+            name="last_synced_at",
+            field=models.DateTimeField(null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.16 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("galaxy", "0059_containerregistryrepos_sync_state"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="synclist",
+            name="excludes_json",
+            field=models.TextField(default=""),
+        ),
+        migrations.AddField(
+            model_name="synclist",
+            name="excludes_yaml",
+            field=models.TextField(default=""),
+        ),
+        migrations.AddField(
+            model_name="synclist",
+            name="excludes_digest",
+            field=models.CharField(default="", max_length=64),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from .aiindex import AIIndexDenyList
 from .auth import Group, User
+from .collection import HighestCollectionVersion
 from .collectionimport import CollectionImport
 from .config import Setting
 from .container import (
@@ -9,8 +10,10 @@ from .container import (
     ContainerRegistryRemote,
     ContainerRegistryRepos,
 )
+from .metrics_collection import MetricsCollectionState
 from .namespace import Namespace, NamespaceLink
 from .organization import Organization, Team
+from .search import SearchDocument
 from .synclist import SyncList
 
 from pulp_ansible.app.models import (
@@ -34,11 +37,17 @@ __all__ = (
     "ContainerRegistryRepos",
     # auth
     "Group",
+    # collection
+    "HighestCollectionVersion",
+    # metrics_collection
+    "MetricsCollectionState",
     # namespace
     "Namespace",
     "NamespaceLink",
     # organization
     "Organization",
+    # search
+    "SearchDocument",
     # config
     "Setting",
     # synclist
@@ -0,0 +1,67 @@
+import semantic_version
+
+from django.db import models
+from pulp_ansible.app.models import Collection, CollectionVersion
+from pulpcore.plugin.models import RepositoryVersion
+
+
+class HighestCollectionVersionManager(models.Manager):
+
+    def compute(self, repository_version):
+        """Store the highest CollectionVersion of each Collection in the repository version."""
+        highest = {}
+        versions = CollectionVersion.objects.filter(
+            pk__in=repository_version.content
+        ).values_list("pk", "collection_id", "version")
+        for pk, collection_id, version in versions.iterator():
+            semver = semantic_version.Version(version)
+            current = highest.get(collection_id)
+            if current is None or semver > current[1]:
+                highest[collection_id] = (pk, semver)
+
+        self.bulk_create(
+            [
+                self.model(
+                    repository_version=repository_version,
+                    collection_id=collection_id,
+                    collection_version_id=pk,
+                )
+                for collection_id, (pk, _) in highest.items()
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+    def for_repository_version(self, repository_version):
+        """
+        Return the rows for the repository version.
+
+        Repository versions created before this index existed are computed on first use.
+        """
+        qs = self.filter(repository_version=repository_version)
+        if not qs.exists():
+            self.compute(repository_version)
+        return qs
+
+
+class HighestCollectionVersion(models.Model):
+    """The highest CollectionVersion of each Collection in an ansible RepositoryVersion.
+
+    Rows are computed once when the repository version is completed (see
+    signals.handlers) so listing the latest version of each collection in a
+    distribution is a join on this table instead of comparing every version
+    in Python on each request.
+    """
+
+    objects = HighestCollectionVersionManager()
+
+    repository_version = models.ForeignKey(
+        RepositoryVersion, on_delete=models.CASCADE, related_name="+"
+    )
+    collection = models.ForeignKey(Collection, on_delete=models.CASCADE, related_name="+")
+    collection_version = models.ForeignKey(
+        CollectionVersion, on_delete=models.CASCADE, related_name="+"
+    )
+
+    class Meta:
+        unique_together = ("repository_version", "collection")
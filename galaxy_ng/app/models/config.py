@@ -46,6 +46,11 @@ Updating Cache:
 
     Setting.update_cache()
 
+    # Each process keeps a snapshot of the parsed values, it is refreshed when
+    # the cache version changes (checked at most every
+    # GALAXY_DYNAMIC_SETTINGS_SNAPSHOT_TTL seconds) and dropped locally on
+    # every call to `update_cache`.
+
 """
 
 import logging
@@ -156,8 +161,12 @@ class Setting(LifecycleModelMixin, models.Model):
 
     @classmethod
     def update_cache(cls):
-        from galaxy_ng.app.tasks.settings_cache import update_setting_cache  # noqa
+        from galaxy_ng.app.tasks.settings_cache import (  # noqa
+            invalidate_settings_snapshot,
+            update_setting_cache,
+        )
 
+        invalidate_settings_snapshot()
         update_setting_cache(cls.as_dict())
 
     @hook(AFTER_CREATE, on_commit=True)
@@ -89,3 +89,6 @@ class ContainerRegistryRepos(models.Model):
         primary_key=True,
         related_name="registry"
     )
+    # sha256 of the upstream tags and manifest digests at the last successful sync
+    upstream_fingerprint = models.CharField(max_length=64, null=True)
+    last_synced_at = models.DateTimeField(null=True)
@@ -0,0 +1,14 @@
+from django.db import models
+
+
+class MetricsCollectionState(models.Model):
+    """Bookkeeping of a metrics collector between runs.
+
+    `last_gathered_entries` maps every collection key of the collector to the
+    end of the last window that was shipped successfully (an ISO timestamp),
+    the next run only exports the rows changed after it.
+    """
+
+    collector = models.CharField(max_length=64, unique=True)
+    last_gather = models.DateTimeField(null=True)
+    last_gathered_entries = models.JSONField(default=dict)
@@ -0,0 +1,49 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+from pulp_ansible.app.models import Collection
+
+
+class SearchDocument(models.Model):
+    """One row per searchable collection or role, as listed by `_ui/v1/search/`.
+
+    Rows hold the already resolved values of the search results (latest
+    version, tags, deprecation, download count, avatar...) so searching is a
+    scan of a single indexed table instead of a union of two heavily
+    annotated querysets.
+
+    The table is maintained by database triggers on the source tables
+    (see migration 0057), it must never be written from Python.
+    """
+
+    content_type = models.CharField(max_length=16)
+    collection = models.OneToOneField(
+        Collection, null=True, on_delete=models.CASCADE, related_name="+"
+    )
+    role = models.OneToOneField(
+        "galaxy.LegacyRole", null=True, on_delete=models.CASCADE, related_name="+"
+    )
+
+    name = models.CharField(max_length=64)
+    namespace_name = models.CharField(max_length=64)
+    description_text = models.TextField(null=True)
+    latest_version = models.CharField(max_length=128, null=True)
+    tag_names = models.JSONField(null=True)
+    platform_names = models.JSONField(null=True)
+    content_list = models.JSONField(null=True)
+    namespace_avatar = models.CharField(max_length=256, null=True)
+    last_updated = models.DateTimeField(null=True)
+    deprecated = models.BooleanField(default=False)
+    download_count = models.BigIntegerField(default=0)
+    search = SearchVectorField(null=True)
+
+    class Meta:
+        indexes = (
+            GinIndex(fields=["search"], name="galaxy_searchdoc_search_idx"),
+            models.Index(
+                fields=["-download_count", "-last_updated"], name="galaxy_searchdoc_popular_idx"
+            ),
+            models.Index(
+                fields=["content_type", "-download_count"], name="galaxy_searchdoc_type_idx"
+            ),
+        )
@@ -36,3 +36,9 @@ class SyncList(
     )
     collections = models.ManyToManyField(Collection)
     namespaces = models.ManyToManyField(namespace_models.Namespace)
+
+    # The exclude list served by the excludes view, rendered whenever the
+    # policy or collections change (see galaxy_ng.app.signals.handlers).
+    excludes_json = models.TextField(default="")
+    excludes_yaml = models.TextField(default="")
+    excludes_digest = models.CharField(max_length=64, default="")
@@ -128,6 +128,10 @@ LOGGING = {
             "level": "DEBUG",
             "class": "galaxy_ng.app.api.v1.logutils.LegacyRoleImportHandler",
             "formatter": "simple",
+            # messages are appended to the import in batches of `capacity`
+            # records or every `flush_interval` seconds
+            "capacity": 50,
+            "flush_interval": 1.0,
         }
     },
     "dynaconf_merge": True,
@@ -218,6 +222,21 @@ AUTH_PASSWORD_VALIDATORS = [
 X_PULP_CONTENT_HOST = "localhost"
 X_PULP_CONTENT_PORT = 24816
 
+# Insights mode artifact downloads are streamed from the content app by the API
+# worker. When a prefix is set the API only authorizes the download and answers
+# with an internal redirect to <prefix>/<content path>, carried in the header
+# below, for the front proxy (e.g. an nginx `internal` location proxying to the
+# content app) to serve.
+GALAXY_DOWNLOAD_INTERNAL_REDIRECT_PREFIX = None
+GALAXY_DOWNLOAD_INTERNAL_REDIRECT_HEADER = "X-Accel-Redirect"
+
+# Execution environments requested per catalog page when indexing a registry,
+# each page is written in one transaction
+GALAXY_EE_INDEX_BATCH_SIZE = 50
+
+# Repository syncs of a container registry running at the same time per registry host
+GALAXY_CONTAINER_REGISTRY_SYNC_CONCURRENCY = 4
+
 # Example setting of CONTENT_BIND if unix sockets are used
 # CONTENT_BIND = "unix:/var/run/pulpcore-content/pulpcore-content.sock"
 
@@ -270,6 +289,45 @@ GALAXY_ENABLE_UNAUTHENTICATED_COLLECTION_ACCESS = False
 GALAXY_ENABLE_UNAUTHENTICATED_COLLECTION_DOWNLOAD = False
 
 GALAXY_ENABLE_API_ACCESS_LOG = False
+
+# Seconds between writes of the buffered legacy role download counts
+GALAXY_LEGACY_ROLE_DOWNLOAD_COUNT_FLUSH_INTERVAL = 10
+
+# Legacy role sync: roles fetched concurrently per page, requests per second
+# sent to the upstream host (None to disable) and roles written per batch
+GALAXY_LEGACY_SYNC_WORKERS = 4
+GALAXY_LEGACY_SYNC_RATE_LIMIT = 10
+GALAXY_LEGACY_SYNC_BATCH_SIZE = 100
+
+# Directory of the bare git mirrors reused by legacy role imports, imports
+# clone straight from github when unset. Mirrors are evicted least recently
+# used first once they use more than GALAXY_LEGACY_ROLE_GIT_CACHE_MAX_SIZE bytes.
+GALAXY_LEGACY_ROLE_GIT_CACHE_DIR = None
+GALAXY_LEGACY_ROLE_GIT_CACHE_MAX_SIZE = 10 * 1024 ** 3
+
+# Seconds a token and its user are cached by ExpiringTokenAuthentication, 0 disables.
+# Requires a Redis connection, where deleted tokens and changed users are
+# tracked for every process, nothing is cached without one.
+GALAXY_TOKEN_AUTH_CACHE_TTL = 30
+
+# Seconds an unchanged X-RH-IDENTITY is trusted to already have its user, group
+# and synclist, 0 disables. Requests within that window do not write anything.
+GALAXY_RH_IDENTITY_CACHE_TTL = 300
+
+# Seconds a successful keycloak basic auth verification is reused, capped by the
+# lifetime of the access token keycloak returned, 0 disables.
+GALAXY_KEYCLOAK_BASIC_AUTH_CACHE_TTL = 60
+
+# Seconds the collection and partner counts of the UI landing page are cached.
+# Collection counts are cached per repository version, the partner count is
+# dropped when a namespace is created or deleted, 0 disables.
+GALAXY_LANDING_PAGE_CACHE_TTL = 3600
+
+# Seconds the rendered responses of views with repository version based ETags
+# (api_base.ConditionalGetMixin) are kept in the cache, 0 disables. Clients
+# sending If-None-Match get 304 Not Modified regardless of this setting.
+GALAXY_API_RESPONSE_CACHE_TTL = 0
+
 # Extra AUTOMATED_LOGGING settings are defined on dynaconf_hooks.py
 # to be overridden by the /etc/pulp/settings.py
 # or environment variable PULP_GALAXY_ENABLE_API_ACCESS_LOG
@@ -389,6 +447,9 @@ GALAXY_METRICS_COLLECTION_ORG_ID = None
 # When set to True will enable the DYNAMIC settings feature
 # Individual allowed dynamic keys are set on ./dynamic_settings.py
 GALAXY_DYNAMIC_SETTINGS = False
+# Seconds each process reuses its parsed snapshot of the dynamic settings
+# before checking the cache version counter on Redis again.
+GALAXY_DYNAMIC_SETTINGS_SNAPSHOT_TTL = 5
 
 # DJANGO ANSIBLE BASE RESOURCES REGISTRY SETTINGS
 ANSIBLE_BASE_RESOURCE_CONFIG_MODULE = "galaxy_ng.app.api.resource_api"
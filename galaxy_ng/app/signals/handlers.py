@@ -11,12 +11,14 @@ import logging
 from django.dispatch import receiver
 from django.db.models.signals import post_save
 from django.db.models.signals import post_delete
+from django.db.models.signals import pre_delete
 from django.db.models.signals import m2m_changed
 from django.db.models import CharField, Value
 from django.db.models.functions import Concat
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth.models import Group
 from django.conf import settings
+from rest_framework.authtoken.models import Token
 from rest_framework.exceptions import ValidationError
 from django.apps import apps
 from pulp_ansible.app.models import (
@@ -25,9 +27,18 @@ from pulp_ansible.app.models import (
     Collection,
     AnsibleNamespaceMetadata,
 )
-from galaxy_ng.app.models import Namespace, User, Team
+from galaxy_ng.app.api.ui.v1.views.landing_page import invalidate_partners_cache
+from galaxy_ng.app.api.v3.views.excludes import update_synclist_excludes
+from galaxy_ng.app.auth.token import invalidate_token_cache
+from galaxy_ng.app.models import (
+    HighestCollectionVersion,
+    Namespace,
+    SyncList,
+    Team,
+    User,
+)
 from galaxy_ng.app.migrations._dab_rbac import copy_roles_to_role_definitions
-from pulpcore.plugin.models import ContentRedirectContentGuard
+from pulpcore.plugin.models import ContentRedirectContentGuard, RepositoryVersion
 
 from ansible_base.rbac.validators import validate_permissions_for_model
 from ansible_base.rbac.models import (
@@ -78,6 +89,17 @@ def ensure_content_guard_exists_on_distribution(sender, instance, created, **kwa
         instance.save()
 
 
+@receiver(post_save, sender=RepositoryVersion)
+def compute_highest_collection_versions(sender, instance, created, **kwargs):
+    """Index the highest version of each collection once the repository version is complete."""
+
+    if not instance.complete or instance.repository.pulp_type != AnsibleRepository.get_pulp_type():
+        return
+
+    if not HighestCollectionVersion.objects.filter(repository_version=instance).exists():
+        HighestCollectionVersion.objects.compute(instance)
+
+
 @receiver(post_save, sender=Collection)
 def create_namespace_if_not_present(sender, instance, created, **kwargs):
     """Ensure Namespace object exists when Collection object saved.
@@ -116,6 +138,80 @@ def associate_namespace_metadata(sender, instance, created, **kwargs):
         _update_metadata()
 
 
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    """Drop the token from the ExpiringTokenAuthentication cache."""
+    invalidate_token_cache(instance.key)
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user_token(sender, instance, created, **kwargs):
+    """
+    The token cache holds a copy of the user, drop it so a deactivated
+    user is rejected right away.
+    """
+    if created:
+        return
+    for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+        invalidate_token_cache(key)
+
+
+@receiver(post_save, sender=Namespace)
+@receiver(post_delete, sender=Namespace)
+def invalidate_landing_page_partners(sender, instance, created=False, **kwargs):
+    """The landing page caches the number of namespaces."""
+    if kwargs["signal"] is post_save and not created:
+        return
+    invalidate_partners_cache()
+
+
+@receiver(post_save, sender=SyncList)
+def render_synclist_excludes(sender, instance, created, **kwargs):
+    """Keep the exclude list served by ExcludesView in sync with the policy."""
+    if created or instance.has_changed("policy"):
+        update_synclist_excludes(instance.pk)
+
+
+@receiver(m2m_changed, sender=SyncList.collections.through)
+def render_synclist_excludes_on_collections_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Keep the exclude list served by ExcludesView in sync with the collections."""
+    if reverse and action == "pre_clear":
+        # instance is a Collection, remember its synclists before they are gone
+        instance._excludes_synclist_pks = list(
+            SyncList.objects.filter(collections=instance).values_list("pk", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        synclist_pks = [instance.pk]
+    elif action == "post_clear":
+        synclist_pks = getattr(instance, "_excludes_synclist_pks", [])
+    else:
+        synclist_pks = pk_set
+
+    for synclist_pk in synclist_pks:
+        update_synclist_excludes(synclist_pk)
+
+
+@receiver(pre_delete, sender=Collection)
+def remember_collection_synclists(sender, instance, **kwargs):
+    """Deleting a collection drops it from synclists without an m2m_changed signal."""
+    instance._excludes_synclist_pks = list(
+        SyncList.objects.filter(collections=instance).values_list("pk", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Collection)
+def render_synclist_excludes_on_collection_delete(sender, instance, **kwargs):
+    for synclist_pk in getattr(instance, "_excludes_synclist_pks", []):
+        update_synclist_excludes(synclist_pk)
+
+
 # ___ DAB RBAC ___
 
 TEAM_MEMBER_ROLE = 'Galaxy Team Member'
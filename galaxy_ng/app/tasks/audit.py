@@ -0,0 +1,17 @@
+from django.apps import apps
+
+
+def delete_expired_audit_events():
+    """
+    Delete the audit events older than the max_age configured in AUTOMATED_LOGGING.
+
+    The audit log handler does not do this while writing events, schedule it with:
+    django-admin task-scheduler --id delete_expired_audit_events
+        --path galaxy_ng.app.tasks.audit.delete_expired_audit_events --interval 1440
+    """
+    if not apps.is_installed("automated_logging"):
+        return
+
+    from automated_logging.handlers import delete_expired_events
+
+    delete_expired_events()
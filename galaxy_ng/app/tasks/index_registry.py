@@ -2,13 +2,16 @@ import json
 import logging
 from urllib.parse import quote, urlencode
 
-from django.core import exceptions
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.http.request import HttpRequest
 
 from rest_framework.exceptions import ValidationError
 
-from pulpcore.plugin.tasking import dispatch
+from pulpcore.plugin.constants import TASK_STATES
+from pulpcore.plugin.models import ProgressReport
 
 from pulp_container.app import models as container_models
 
@@ -22,6 +25,16 @@ log = logging.getLogger(__name__)
 CATALOG_API = "https://catalog.redhat.com/api/containers/v1/repositories"
 
 
+class IndexRegistryError(Exception):
+    def __init__(self, failed):
+        self.failed = failed
+        self.message = _("Failed to index {count} containers: {errors}").format(
+            count=len(failed),
+            errors="; ".join(f"{name}: {error}" for name, error in failed.items()),
+        )
+        super().__init__(self.message)
+
+
 class CouldNotCreateContainerError(Exception):
     def __init__(self, remote_name, error=""):
         self.message = _("Failed to create container {remote_name}. {error}").format(
@@ -53,112 +66,179 @@ def _parse_catalog_repositories(response_data):
     return containers
 
 
-def _update_distro_readme_and_description(distro, container_data):
-    readme = models.ContainerDistroReadme.objects.get_or_create(container=distro)[0]
-    readme.text = container_data['readme']
-    readme.save()
+def _iter_catalog_pages(registry, page_size):
+    """Yield the execution environments of the catalog one page at a time."""
+    query = {
+        "filter": (
+            "build_categories=in=('Automation execution environment') "
+            "and release_categories=in=('Generally Available')"
+        ),
+        "page": 0,
+        "page_size": page_size,
+        "sort_by": "creation_date[asc]"
+    }
 
-    distro.description = container_data['description']
-    distro.save()
+    while True:
+        url = CATALOG_API + "?" + urlencode(query, quote_via=quote)
+        downloader = registry.get_downloader(url=url)
+        download_result = downloader.fetch()
+        with open(download_result.path) as fd:
+            data = json.load(fd)
+        yield _parse_catalog_repositories(data)
+        if len(data['data']) == data['page_size']:
+            query['page'] += 1
+        else:
+            break
 
 
-def create_or_update_remote_container(container_data, registry_pk, request_data):
-    # check if a distro matching the base name exists
-    remote_repo_type = container_models.ContainerRepository.get_pulp_type()
+def _create_remote_container(container_data, registry_pk, request):
+    serializer = serializers.ContainerRemoteSerializer(
+        data={
+            "name": container_data['name'],
+            "upstream_name": container_data['name'],
+            "registry": str(registry_pk)
+        }, context={"request": request}
+    )
 
     try:
-        distro = container_models.ContainerDistribution.objects.get(
-            base_path=container_data['name'])
+        serializer.is_valid(raise_exception=True)
+    except ValidationError as e:
+        raise CouldNotCreateContainerError(
+            container_data['name'],
+            error=str(e)
+        )
+    serializer.create(serializer.validated_data)
 
-        repo = distro.repository
+    return container_models.ContainerDistribution.objects.get(base_path=container_data['name'])
 
-        # If a distro matching the container name exists, and it's a remote repository and
-        # it has a container remote attached to it that's associated with the selected
-        # registry, update the container's readme and description.
-        if repo.pulp_type == remote_repo_type and repo.remote is not None:
-            try:
-                remote_registry = models.ContainerRegistryRepos.objects.get(
-                    repository_remote=repo.remote).registry
-                if remote_registry and remote_registry.pk == registry_pk:
-                    _update_distro_readme_and_description(distro, container_data)
-                    return
-
-            except exceptions.ObjectDoesNotExist:
-                raise CouldNotCreateContainerError(
-                    container_data['name'],
-                    error=_(
-                        "A remote container with this name already exists, "
-                        "but is not associated with any registry.")
-                )
 
-        else:
-            raise CouldNotCreateContainerError(
-                container_data['name'],
-                error=_("A local container with this name already exists.")
-            )
+def _is_indexed_from_registry(distro, registry_pk, remote_registries):
+    """
+    Whether an existing distribution is a remote container of the registry. Raises when
+    it is a local container or a remote container that does not belong to any registry.
+    """
+    repo = distro.repository
+    remote_repo_type = container_models.ContainerRepository.get_pulp_type()
 
-    except exceptions.ObjectDoesNotExist:
-        # If no distributions match the selected container, create one.
-        request = _get_request(request_data)
-        serializer = serializers.ContainerRemoteSerializer(
-            data={
-                "name": container_data['name'],
-                "upstream_name": container_data['name'],
-                "registry": str(registry_pk)
-            }, context={"request": request}
+    if repo is None or repo.pulp_type != remote_repo_type or repo.remote_id is None:
+        raise CouldNotCreateContainerError(
+            distro.base_path,
+            error=_("A local container with this name already exists.")
         )
 
-        try:
-            serializer.is_valid(raise_exception=True)
-        except ValidationError as e:
-            CouldNotCreateContainerError(
-                container_data['name'],
-                error=str(e)
-            )
-        serializer.create(serializer.validated_data)
+    if repo.remote_id not in remote_registries:
+        raise CouldNotCreateContainerError(
+            distro.base_path,
+            error=_(
+                "A remote container with this name already exists, "
+                "but is not associated with any registry.")
+        )
 
-        distro = container_models.ContainerDistribution.objects.get(
-            base_path=container_data['name'])
+    return remote_registries[repo.remote_id] == registry_pk
 
-        _update_distro_readme_and_description(distro, container_data)
 
+def _update_readmes_and_descriptions(indexed):
+    """Write the readme and description of the (distro, container_data) pairs that changed."""
+    readmes = {
+        readme.container_id: readme
+        for readme in models.ContainerDistroReadme.objects.filter(
+            container__in=[distro for distro, _ in indexed]
+        )
+    }
 
-def index_execution_environments_from_redhat_registry(registry_pk, request_data):
-    registry = models.ContainerRegistryRemote.objects.get(pk=registry_pk)
-    remotes = []
+    distros = []
+    changed_readmes = []
+    for distro, container_data in indexed:
+        if distro.description != container_data['description']:
+            distro.description = container_data['description']
+            distro.pulp_last_updated = timezone.now()
+            distros.append(distro)
+
+        readme = readmes.get(distro.pk)
+        if readme is None or readme.text != container_data['readme']:
+            changed_readmes.append(
+                models.ContainerDistroReadme(container=distro, text=container_data['readme'])
+            )
 
-    query = {
-        "filter": (
-            "build_categories=in=('Automation execution environment') "
-            "and release_categories=in=('Generally Available')"
-        ),
-        "page": 0,
-        "sort_by": "creation_date[asc]"
+    container_models.ContainerDistribution.objects.bulk_update(
+        distros, ['description', 'pulp_last_updated']
+    )
+    models.ContainerDistroReadme.objects.bulk_create(
+        changed_readmes,
+        update_conflicts=True,
+        unique_fields=['container'],
+        update_fields=['text', 'updated'],
+    )
+
+
+def index_containers(containers, registry_pk, request, results):
+    """
+    Create or update a batch of catalog repositories in one transaction.
+
+    A container that cannot be indexed is rolled back on its own and
+    recorded in results['failed'], the rest of the batch is still written.
+    """
+    distros = {
+        distro.base_path: distro
+        for distro in container_models.ContainerDistribution.objects.filter(
+            base_path__in=[container_data['name'] for container_data in containers]
+        ).select_related('repository')
     }
+    remote_registries = dict(
+        models.ContainerRegistryRepos.objects.filter(
+            repository_remote_id__in=[
+                distro.repository.remote_id for distro in distros.values() if distro.repository
+            ]
+        ).values_list('repository_remote_id', 'registry_id')
+    )
+
+    indexed = []
+    with transaction.atomic():
+        for container_data in containers:
+            name = container_data['name']
+            try:
+                if name in distros:
+                    # remote containers of other registries are left alone
+                    if _is_indexed_from_registry(distros[name], registry_pk, remote_registries):
+                        indexed.append((distros[name], container_data))
+                        results['updated'].append(name)
+                else:
+                    with transaction.atomic():
+                        distro = _create_remote_container(container_data, registry_pk, request)
+                    indexed.append((distro, container_data))
+                    results['created'].append(name)
+            except Exception as e:
+                log.exception(f"Could not index container {name}")
+                results['failed'][name] = str(e)
+
+        _update_readmes_and_descriptions(indexed)
 
-    # Iterate through the pages on the API response and add the relevant information
-    # about each container repository.
-    while True:
-        url = CATALOG_API + "?" + urlencode(query, quote_via=quote)
-        downloader = registry.get_downloader(url=url)
-        download_result = downloader.fetch()
-        with open(download_result.path) as fd:
-            data = json.load(fd)
-            remotes = remotes + _parse_catalog_repositories(data)
-            if len(data['data']) == data['page_size']:
-                query['page'] += 1
-            else:
-                break
-
-    for remote in remotes:
-        # create a subtask for each remote, so that if one fails, we can throw a usable error
-        # message for the user to look at and prevent the rest of the repositories from failing.
-        dispatch(
-            create_or_update_remote_container,
-            kwargs={
-                "container_data": remote,
-                "registry_pk": registry.pk,
-                "request_data": request_data
-            },
-            exclusive_resources=["/api/v3/distributions/"]
-        )
+
+def index_execution_environments_from_redhat_registry(registry_pk, request_data):
+    registry = models.ContainerRegistryRemote.objects.get(pk=registry_pk)
+    request = _get_request(request_data)
+    results = {"created": [], "updated": [], "failed": {}}
+
+    # every catalog page is written in its own transaction before the next one is fetched
+    page_size = settings.get("GALAXY_EE_INDEX_BATCH_SIZE", 50)
+    for containers in _iter_catalog_pages(registry, page_size):
+        index_containers(containers, registry.pk, request, results)
+
+    for code, message in (
+        ("created", _("Created execution environments")),
+        ("updated", _("Updated execution environments")),
+        ("failed", _("Execution environments that could not be indexed")),
+    ):
+        count = len(results[code])
+        ProgressReport(
+            message=message,
+            code=f"index.execution_environments.{code}",
+            state=TASK_STATES.COMPLETED,
+            total=count,
+            done=count,
+        ).save()
+
+    if results['failed']:
+        raise IndexRegistryError(results['failed'])
+
+    return results
@@ -1,15 +1,37 @@
+import asyncio
+import hashlib
+import logging
+from urllib.parse import urljoin, urlsplit
 
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from pulp_container.app.tasks.sync_stages import ContainerFirstStage
 from pulp_container.app.tasks.synchronize import synchronize as container_sync
+from pulp_container.constants import V2_ACCEPT_HEADERS
+from pulpcore.plugin.constants import TASK_STATES
+from pulpcore.plugin.models import ProgressReport, Task, TaskGroup
 from pulpcore.plugin.tasking import dispatch
 
 from galaxy_ng.app import models
 
 
-def launch_container_remote_sync(remote, registry, repository):
+log = logging.getLogger(__name__)
+
+
+def _apply_connection_fields(remote, registry):
+    changed = False
     for key, value in registry.get_connection_fields().items():
-        setattr(remote, key, value)
+        if getattr(remote, key) != value:
+            setattr(remote, key, value)
+            changed = True
+    if changed:
         remote.save()
 
+
+def launch_container_remote_sync(remote, registry, repository):
+    _apply_connection_fields(remote, registry)
+
     return dispatch(
         container_sync,
         shared_resources=[remote],
@@ -23,11 +45,129 @@ def launch_container_remote_sync(remote, registry, repository):
     )
 
 
+async def _get_upstream_fingerprint(remote):
+    """Hash of the tags the remote syncs and the digests of their manifests."""
+    stage = ContainerFirstStage(remote, signed_only=False)
+    repo_name = remote.namespaced_upstream_name
+    tag_list = await stage.get_paginated_tag_list(f"/v2/{repo_name}/tags/list", repo_name)
+
+    async def get_digest(tag):
+        downloader = remote.get_downloader(
+            url=urljoin(remote.url, f"/v2/{repo_name}/manifests/{tag}")
+        )
+        response = await downloader.run(
+            extra_data={"headers": V2_ACCEPT_HEADERS, "http_method": "head"}
+        )
+        return f"{tag} {response.headers['docker-content-digest']}"
+
+    # the remote's downloader factory limits how many of these run at once,
+    # how many remotes are checked at once is up to the caller
+    digests = await asyncio.gather(*[get_digest(tag) for tag in stage.filter_tags(tag_list)])
+    return hashlib.sha256("\n".join(sorted(digests)).encode()).hexdigest()
+
+
+async def _get_upstream_fingerprints(remotes, concurrency):
+    """Fingerprints of remotes on the same registry host, `concurrency` checked at once."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def get_fingerprint(remote):
+        async with semaphore:
+            try:
+                return remote.pk, await _get_upstream_fingerprint(remote)
+            except Exception as e:
+                # synced anyway, the sync reports the actual problem
+                log.warning(f"Could not check upstream of {remote.name} for changes: {e}")
+                return remote.pk, None
+
+    return dict(await asyncio.gather(*[get_fingerprint(remote) for remote in remotes]))
+
+
+def sync_registry_repository(remote_pk, repository_pk, fingerprint=None):
+    """Sync one repository of a registry and remember the upstream state it synced."""
+    container_sync(
+        remote_pk=remote_pk,
+        repository_pk=repository_pk,
+        mirror=True,
+        signed_only=False,
+    )
+    models.ContainerRegistryRepos.objects.filter(repository_remote_id=remote_pk).update(
+        upstream_fingerprint=fingerprint,
+        last_synced_at=timezone.now(),
+    )
+
+
 def sync_all_repos_in_registry(registry_pk):
+    """
+    Sync the repositories of a registry, the least recently synced first.
+
+    Repositories whose upstream tags and manifest digests did not change since
+    their last successful sync are skipped. At most
+    GALAXY_CONTAINER_REGISTRY_SYNC_CONCURRENCY change checks and syncs run at
+    the same time against one registry host, and all of them are part of one
+    TaskGroup.
+    """
     registry = models.ContainerRegistryRemote.objects.get(pk=registry_pk)
-    for remote_rel in models.ContainerRegistryRepos.objects.filter(registry=registry).all():
+    remote_rels = list(
+        models.ContainerRegistryRepos.objects.filter(registry=registry)
+        .select_related("repository_remote")
+        .order_by(F("last_synced_at").asc(nulls_first=True))
+    )
+
+    concurrency = settings.get("GALAXY_CONTAINER_REGISTRY_SYNC_CONCURRENCY") or 1
+
+    remotes = [remote_rel.repository_remote for remote_rel in remote_rels]
+    for remote in remotes:
+        _apply_connection_fields(remote, registry)
+    fingerprints = asyncio.run(_get_upstream_fingerprints(remotes, concurrency))
+
+    task_group = TaskGroup.objects.create(
+        description=f"Sync of the repositories in container registry {registry.name}"
+    )
+    current_task = Task.current()
+    if current_task:
+        current_task.task_group = task_group
+        current_task.save(update_fields=["task_group"])
+
+    # syncs holding the same slot run one after the other
+    host = urlsplit(registry.url).netloc or registry.url
+
+    dispatched = 0
+    skipped = 0
+    for remote_rel in remote_rels:
         remote = remote_rel.repository_remote
+        fingerprint = fingerprints[remote.pk]
+        if fingerprint is not None and fingerprint == remote_rel.upstream_fingerprint:
+            skipped += 1
+            continue
 
         for repo in remote.repository_set.all():
-            repo.cast()
-            launch_container_remote_sync(remote, registry, repo)
+            slot = f"container-registry-sync:{host}:{dispatched % concurrency}"
+            dispatch(
+                sync_registry_repository,
+                task_group=task_group,
+                shared_resources=[remote],
+                exclusive_resources=[repo, slot],
+                kwargs={
+                    "remote_pk": str(remote.pk),
+                    "repository_pk": str(repo.pk),
+                    "fingerprint": fingerprint,
+                },
+            )
+            dispatched += 1
+
+    task_group.finish()
+
+    if current_task:
+        for code, message, count in (
+            ("dispatched", "Repository syncs dispatched", dispatched),
+            ("skipped", "Unchanged repositories skipped", skipped),
+        ):
+            ProgressReport(
+                message=message,
+                code=f"sync.container_registry.{code}",
+                state=TASK_STATES.COMPLETED,
+                total=count,
+                done=count,
+            ).save()
+
+    return task_group
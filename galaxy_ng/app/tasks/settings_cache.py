@@ -2,8 +2,11 @@
 Tasks related to the settings cache management.
 """
 import logging
+import threading
+import time
 import redis
 
+from dataclasses import dataclass, field
 from functools import wraps
 from typing import Any, Callable, Optional
 from uuid import uuid4
@@ -16,6 +19,7 @@ from django.db.utils import OperationalError
 logger = logging.getLogger(__name__)
 _conn = None
 CACHE_KEY = "GALAXY_SETTINGS_DATA"
+CACHE_VERSION_KEY = "GALAXY_SETTINGS_VERSION"
 
 
 def get_redis_connection():
@@ -112,12 +116,17 @@ def update_setting_cache(data: dict[str, Any]) -> int:
     if conn is None:
         return 0
 
-    conn.delete(CACHE_KEY)
-    updated = 0
+    expire = settings.get("GALAXY_SETTINGS_EXPIRE", 60 * 60 * 24)
+    pipe = conn.pipeline()
+    pipe.delete(CACHE_KEY)
     if data:
-        updated = conn.hset(CACHE_KEY, mapping=data)
-        conn.expire(CACHE_KEY, settings.get("GALAXY_SETTINGS_EXPIRE", 60 * 60 * 24))
-    return updated
+        pipe.hset(CACHE_KEY, mapping=data)
+        pipe.expire(CACHE_KEY, expire)
+    # Bump the version so other processes know their snapshot is stale
+    pipe.incr(CACHE_VERSION_KEY)
+    pipe.expire(CACHE_VERSION_KEY, expire)
+    results = pipe.execute()
+    return results[1] if data else 0
 
 
 @connection_error_wrapper(default=dict)
@@ -129,6 +138,15 @@ def get_settings_from_cache() -> dict[str, Any]:
     return conn.hgetall(CACHE_KEY)
 
 
+@connection_error_wrapper(default=lambda: None)
+def get_settings_version() -> str | None:
+    """Reads the settings cache version counter from Redis"""
+    if conn is None:
+        return None
+
+    return conn.get(CACHE_VERSION_KEY)
+
+
 def get_settings_from_db():
     """Returns the data in the Setting table."""
     try:
@@ -137,3 +155,64 @@ def get_settings_from_db():
     except OperationalError as exc:
         logger.error("Could not read settings from database: %s", str(exc))
         return {}
+
+
+@dataclass
+class SettingsSnapshot:
+    """Per-process copy of the dynamic settings data.
+
+    `data` is the raw key:value mapping as stored on cache/db and `values`
+    holds the values already parsed by Dynaconf, keyed by the upper case
+    setting name, so the parsing happens only once per snapshot.
+    """
+    version: str | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+    source: str | None = None
+    values: dict[str, Any] = field(default_factory=dict)
+    checked_at: float = 0.0
+
+
+_snapshot: SettingsSnapshot | None = None
+_snapshot_lock = threading.Lock()
+
+
+def invalidate_settings_snapshot():
+    """Drops the in-process snapshot, next read will load it again."""
+    global _snapshot
+    _snapshot = None
+
+
+def get_settings_snapshot(ttl: float = 5) -> SettingsSnapshot:
+    """Returns the in-process settings snapshot.
+
+    Within `ttl` seconds the snapshot is returned without any I/O, after that
+    only the version counter is read from Redis and the data is loaded again
+    (from cache or db) when the version changed or when there is no Redis
+    connection to tell the version.
+    """
+    global _snapshot
+    now = time.monotonic()
+    snapshot = _snapshot
+    if snapshot is not None and now - snapshot.checked_at < ttl:
+        return snapshot
+
+    with _snapshot_lock:
+        snapshot = _snapshot
+        if snapshot is not None and now - snapshot.checked_at < ttl:
+            return snapshot
+
+        version = get_settings_version()
+        if snapshot is not None and version is not None and version == snapshot.version:
+            snapshot.checked_at = now
+            return snapshot
+
+        if data := get_settings_from_cache():
+            source = "cache"
+        else:
+            data = get_settings_from_db()
+            source = "db"
+
+        _snapshot = SettingsSnapshot(
+            version=version, data=data, source=source, checked_at=now
+        )
+        return _snapshot
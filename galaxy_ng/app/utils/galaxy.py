@@ -1,6 +1,9 @@
 import logging
 import requests
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
 
 
@@ -29,33 +32,64 @@ def int_to_uuid(num):
     return uuid
 
 
-def safe_fetch(url):
+class RateLimiter:
+    """Spaces out the requests sent to each host, shared by all threads of a sync."""
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _retry_delay(response, attempt):
+    """Honor Retry-After when the server sends one, otherwise back off exponentially."""
+    retry_after = response.headers.get('Retry-After', '')
+    if retry_after.isdigit():
+        return min(int(retry_after), 60)
+    return min(2 ** attempt, 60)
+
+
+def safe_fetch(url, session=None, limiter=None):
     rr = None
     counter = 0
     while True:
         counter += 1
+        if limiter is not None:
+            limiter.wait(url)
         logger.info(f'fetch {url}')
-        rr = requests.get(url)
+        rr = (session or requests).get(url)
         if rr.status_code < 500:
             return rr
 
         if counter >= 5:
             return rr
 
-        logger.info(f'ERROR:{rr.status_code} waiting 60s to refetch {url}')
-        time.sleep(60)
+        delay = _retry_delay(rr, counter)
+        logger.info(f'ERROR:{rr.status_code} waiting {delay}s to refetch {url}')
+        time.sleep(delay)
 
     return rr
 
 
-def paginated_results(next_url):
+def paginated_results(next_url, session=None, limiter=None):
     """Iterate through a paginated query and combine the results."""
     parsed = urlparse(next_url)
     _baseurl = parsed.scheme + '://' + parsed.netloc
     results = []
     while next_url:
         logger.info(f'pagination fetch {next_url}')
-        rr = safe_fetch(next_url)
+        rr = safe_fetch(next_url, session=session, limiter=limiter)
         if rr.status_code == 404:
             break
 
@@ -123,13 +157,13 @@ def find_namespace(baseurl=None, name=None, id=None):
     return ns_name, ns_info
 
 
-def get_namespace_owners_details(baseurl, ns_id):
+def get_namespace_owners_details(baseurl, ns_id, session=None, limiter=None):
     # get the owners too
     owners = []
     next_owners_url = baseurl + f'/api/v1/namespaces/{ns_id}/owners/'
     while next_owners_url:
         logger.info(f'fetch {next_owners_url}')
-        o_data = safe_fetch(next_owners_url).json()
+        o_data = safe_fetch(next_owners_url, session=session, limiter=limiter).json()
         if isinstance(o_data, dict):
             # old galaxy
             for owner in o_data['results']:
@@ -410,8 +444,26 @@ def upstream_role_iterator(
     role_name=None,
     get_versions=True,
     start_page=None,
+    workers=1,
+    rate_limit=None,
+    is_unchanged=None,
+    on_page=None,
 ):
-    """Abstracts the pagination of v1 roles into a generator with error handling."""
+    """
+    Abstracts the pagination of v1 roles into a generator with error handling.
+
+    :param workers:
+        How many roles of a page are fetched concurrently, roles are still
+        yielded in the upstream order.
+    :param rate_limit:
+        Maximum number of requests per second sent to the upstream host.
+    :param is_unchanged:
+        Called with the results of each page, returns the ids of the roles
+        that didn't change upstream. Those are yielded as
+        (None, listing data, None) without fetching their details or versions.
+    :param on_page:
+        Called with the page number once all roles of that page were yielded.
+    """
     if baseurl is None or not baseurl:
         baseurl = 'https://old-galaxy.ansible.com/api/v1/roles'
     logger.info(f'upstream_role_iterator baseurl:{baseurl}')
@@ -438,98 +490,127 @@ def upstream_role_iterator(
         else:
             next_url = next_url.rstrip('/') + f'/?page={start_page}'
 
-    namespace_cache = {}
+    session = requests.Session()
+    session.mount(parsed.scheme + '://', HTTPAdapter(pool_maxsize=max(workers, 10)))
+    limiter = RateLimiter(rate_limit)
+
+    def fetch_role(rdata):
+        role_upstream_url = _baseurl + f'/api/v1/roles/{rdata["id"]}/'
+        role_page = safe_fetch(role_upstream_url, session=session, limiter=limiter)
+        if role_page.status_code == 404:
+            return None
+
+        try:
+            role_data = role_page.json()
+            if role_data.get('detail', '').lower().strip() == 'not found':
+                return None
+        except Exception:
+            return None
+
+        # Get all of the versions because they have more info than the summary
+        if get_versions:
+            versions_url = role_upstream_url + 'versions'
+            role_versions = paginated_results(versions_url, session=session, limiter=limiter)
+        else:
+            role_versions = []
 
-    pagenum = 0
-    role_count = 0
-    while next_url:
-        logger.info(f'fetch {pagenum} {next_url} role-count:{role_count} ...')
+        return role_data, role_versions
 
-        page = safe_fetch(next_url)
+    namespace_cache = {}
 
-        # Some upstream pages return ISEs for whatever reason.
-        if page.status_code >= 500:
-            logger.error(f'{next_url} returned 500ISE. incrementing the page manually')
-            if 'page=' in next_url:
-                next_url = next_url.replace(f'page={pagenum}', f'page={pagenum + 1}')
-            else:
-                next_url = next_url.rstrip('/') + '/?page={pagenum + 1}'
-            pagenum += 1
-            continue
+    pagenum = int(start_page) if start_page else 1
+    role_count = 0
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        while next_url:
+            logger.info(f'fetch {pagenum} {next_url} role-count:{role_count} ...')
+
+            page = safe_fetch(next_url, session=session, limiter=limiter)
+
+            # Some upstream pages return ISEs for whatever reason.
+            if page.status_code >= 500:
+                logger.error(f'{next_url} returned 500ISE. incrementing the page manually')
+                if 'page=' in next_url:
+                    next_url = next_url.replace(f'page={pagenum}', f'page={pagenum + 1}')
+                else:
+                    next_url = next_url.rstrip('/') + f'/?page={pagenum + 1}'
+                pagenum += 1
+                continue
 
-        ds = page.json()
+            ds = page.json()
+            results = ds['results']
 
-        # iterate each role
-        for rdata in ds['results']:
+            unchanged = set(is_unchanged(results)) if is_unchanged else set()
+            futures = {
+                rdata['id']: executor.submit(fetch_role, rdata)
+                for rdata in results if rdata['id'] not in unchanged
+            }
 
-            remote_id = rdata['id']
-            role_upstream_url = _baseurl + f'/api/v1/roles/{remote_id}/'
-            logger.info(f'fetch {role_upstream_url}')
+            # iterate each role
+            for rdata in results:
 
-            role_page = safe_fetch(role_upstream_url)
-            if role_page.status_code == 404:
-                continue
+                if rdata['id'] in unchanged:
+                    role_count += 1
+                    yield None, rdata, None
 
-            role_data = None
-            try:
-                role_data = role_page.json()
-                if role_data.get('detail', '').lower().strip() == 'not found':
-                    continue
-            except Exception:
-                continue
+                else:
+                    fetched = futures[rdata['id']].result()
+                    if fetched is None:
+                        continue
+                    role_data, role_versions = fetched
 
-            # Get the namespace+owners
-            ns_id = role_data['summary_fields']['namespace']['id']
-            if ns_id not in namespace_cache:
-                logger.info(_baseurl + f'/api/v1/namespaces/{ns_id}/')
-                ns_url = _baseurl + f'/api/v1/namespaces/{ns_id}/'
+                    # Get the namespace+owners
+                    ns_id = role_data['summary_fields']['namespace']['id']
+                    if ns_id not in namespace_cache:
+                        logger.info(_baseurl + f'/api/v1/namespaces/{ns_id}/')
+                        ns_url = _baseurl + f'/api/v1/namespaces/{ns_id}/'
 
-                nsd_rr = safe_fetch(ns_url)
-                try:
-                    namespace_data = nsd_rr.json()
-                except requests.exceptions.JSONDecodeError:
-                    continue
-                namespace_cache[ns_id] = namespace_data
+                        nsd_rr = safe_fetch(ns_url, session=session, limiter=limiter)
+                        try:
+                            namespace_data = nsd_rr.json()
+                        except requests.exceptions.JSONDecodeError:
+                            continue
+                        namespace_cache[ns_id] = namespace_data
 
-                # get the owners too
-                namespace_cache[ns_id]['summary_fields']['owners'] = \
-                    get_namespace_owners_details(_baseurl, ns_id)
+                        # get the owners too
+                        owners = get_namespace_owners_details(
+                            _baseurl, ns_id, session=session, limiter=limiter
+                        )
+                        namespace_cache[ns_id]['summary_fields']['owners'] = owners
 
-            else:
-                namespace_data = namespace_cache[ns_id]
+                    else:
+                        namespace_data = namespace_cache[ns_id]
 
-            # Get all of the versions because they have more info than the summary
-            if get_versions:
-                versions_url = role_upstream_url + 'versions'
-                role_versions = paginated_results(versions_url)
-            else:
-                role_versions = []
+                    # send the role
+                    role_count += 1
+                    yield namespace_data, role_data, role_versions
 
-            # send the role
-            role_count += 1
-            yield namespace_data, role_data, role_versions
+                # break early if count reached
+                if limit is not None and role_count >= limit:
+                    break
 
             # break early if count reached
             if limit is not None and role_count >= limit:
                 break
 
-        # break early if count reached
-        if limit is not None and role_count >= limit:
-            break
-
-        if ds.get('next'):
-            next_url = ds['next']
-        elif ds.get('next_link'):
-            next_url = ds['next_link']
-        else:
-            # break if no next page
-            break
+            if on_page is not None:
+                on_page(pagenum)
 
-        api_prefix = '/api/v1'
-        if not next_url.startswith(_baseurl):
-            if not next_url.startswith(api_prefix):
-                next_url = _baseurl + api_prefix + next_url
+            if ds.get('next'):
+                next_url = ds['next']
+            elif ds.get('next_link'):
+                next_url = ds['next_link']
             else:
-                next_url = _baseurl + next_url
+                # break if no next page
+                break
 
-        pagenum += 1
+            api_prefix = '/api/v1'
+            if not next_url.startswith(_baseurl):
+                if not next_url.startswith(api_prefix):
+                    next_url = _baseurl + api_prefix + next_url
+                else:
+                    next_url = _baseurl + next_url
+
+            pagenum += 1
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -1,4 +1,8 @@
-from pulpcore.plugin.models.role import Role
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import CharField, Q
+from django.db.models.functions import Cast
+
+from pulpcore.plugin.models.role import GroupRole, Role, UserRole
 
 from pulpcore.plugin.util import (
     assign_role,
@@ -93,6 +97,30 @@ def get_v3_namespace_owners(namespace: Namespace) -> list:
     return unique_owners
 
 
+def filter_by_v3_namespace_owner(queryset, username: str, field_name: str = "pk"):
+    """
+    Filter `queryset` down to the rows whose v3 namespace (`field_name`) is owned
+    by `username`, either directly or through one of the user's groups.
+
+    This is the set based counterpart of `get_v3_namespace_owners` and runs as
+    part of the queryset's single SQL statement.
+    """
+    ctype = ContentType.objects.get_for_model(Namespace)
+    user_roles = UserRole.objects.filter(
+        content_type=ctype, user__username=username
+    ).values("object_id")
+    group_roles = GroupRole.objects.filter(
+        content_type=ctype, group__user__username=username
+    ).values("object_id")
+
+    # role assignments store the object pk as text
+    return queryset.annotate(
+        v3_namespace_pk_str=Cast(field_name, output_field=CharField())
+    ).filter(
+        Q(v3_namespace_pk_str__in=user_roles) | Q(v3_namespace_pk_str__in=group_roles)
+    )
+
+
 def get_owned_v3_namespaces(user: User):
 
     role_name = 'galaxy.collection_namespace_owner'
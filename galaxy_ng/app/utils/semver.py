@@ -0,0 +1,126 @@
+"""
+Translate semantic_version specs into database filters.
+
+pulp_ansible stores the components of every CollectionVersion's version in
+the `version_major`, `version_minor`, `version_patch` and `version_prerelease`
+columns, so most of a spec can be compared in SQL. Ordering between
+prerelease identifiers of the same major.minor.patch has no SQL equivalent,
+those few rows are matched with semantic_version instead.
+"""
+import semantic_version
+
+from django.db.models import Q
+from semantic_version.base import AllOf, Always, AnyOf, Never, Range
+
+
+NOTHING = Q(pk__in=[])
+IS_PRERELEASE = ~Q(version_prerelease="")
+
+
+def filter_by_spec(queryset, spec):
+    """
+    Filter a CollectionVersion queryset down to the versions matching `spec`.
+
+    Equivalent to `spec.filter(...)` over every version in the queryset but
+    evaluated by the database.
+    """
+    if isinstance(spec, str):
+        spec = semantic_version.SimpleSpec(spec)
+    return queryset.filter(_clause_to_q(spec.clause, queryset))
+
+
+def _clause_to_q(clause, queryset):
+    if isinstance(clause, Always):
+        return Q()
+    if isinstance(clause, Never):
+        return NOTHING
+    if isinstance(clause, AllOf):
+        q = Q()
+        for subclause in clause.clauses:
+            q &= _clause_to_q(subclause, queryset)
+        return q
+    if isinstance(clause, AnyOf):
+        q = NOTHING
+        for subclause in clause.clauses:
+            q |= _clause_to_q(subclause, queryset)
+        return q
+    if isinstance(clause, Range):
+        return _range_to_q(clause, queryset)
+    raise ValueError(f"Unsupported version clause {clause!r}")
+
+
+def _same_patch(target):
+    return Q(
+        version_major=target.major,
+        version_minor=target.minor,
+        version_patch=target.patch,
+    )
+
+
+def _lower_patch(target):
+    return (
+        Q(version_major__lt=target.major)
+        | Q(version_major=target.major, version_minor__lt=target.minor)
+        | Q(
+            version_major=target.major,
+            version_minor=target.minor,
+            version_patch__lt=target.patch,
+        )
+    )
+
+
+def _higher_patch(target):
+    return (
+        Q(version_major__gt=target.major)
+        | Q(version_major=target.major, version_minor__gt=target.minor)
+        | Q(
+            version_major=target.major,
+            version_minor=target.minor,
+            version_patch__gt=target.patch,
+        )
+    )
+
+
+def _range_to_q(clause, queryset):
+    """
+    Mirrors `semantic_version.base.Range.match`.
+
+    Versions on a different major.minor.patch than the target are ordered by
+    those three numbers alone, versions on the same one depend on the
+    prerelease and build parts.
+    """
+    target = clause.target
+    operator = clause.operator
+
+    other_patch = NOTHING
+    if operator in (Range.OP_LT, Range.OP_LTE, Range.OP_NEQ):
+        other_patch |= _lower_patch(target)
+    if operator in (Range.OP_GT, Range.OP_GTE, Range.OP_NEQ):
+        other_patch |= _higher_patch(target)
+    if clause.prerelease_policy == Range.PRERELEASE_SAMEPATCH:
+        other_patch &= ~IS_PRERELEASE
+
+    return other_patch | (_same_patch(target) & _same_patch_q(clause, queryset))
+
+
+def _same_patch_q(clause, queryset):
+    target = clause.target
+    operator = clause.operator
+
+    if target.prerelease or clause.build_policy == Range.BUILD_STRICT:
+        # prerelease identifiers and build metadata can't be ordered in SQL,
+        # only the versions sharing the target's major.minor.patch are loaded.
+        candidates = queryset.filter(_same_patch(target)).values_list("pk", "version")
+        return Q(pk__in=[
+            pk for pk, version in candidates
+            if clause.match(semantic_version.Version(version))
+        ])
+
+    natural = clause.prerelease_policy == Range.PRERELEASE_NATURAL
+    if operator in (Range.OP_EQ, Range.OP_GTE):
+        return ~IS_PRERELEASE
+    if operator == Range.OP_LTE:
+        return Q()
+    if operator in (Range.OP_LT, Range.OP_NEQ) and not natural:
+        return IS_PRERELEASE
+    return NOTHING
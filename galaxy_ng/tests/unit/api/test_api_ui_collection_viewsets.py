@@ -235,6 +235,28 @@ class TestUiCollectionViewSet(BaseTestCase):
         response = self.client.get(self.repo1_collection1_detail_url)
         self.assertEqual(response.data['latest_version']['version'], '1.0.1')
 
+    def test_highest_versions_indexed_on_new_repository_version(self):
+        highest = models.HighestCollectionVersion.objects.filter(
+            repository_version=self.repo1.latest_version()
+        )
+        self.assertEqual(
+            sorted(highest.values_list('collection_version__version', flat=True)),
+            ['1.0.1', '2.0.0'],
+        )
+
+    def test_list_latest_version_without_index(self):
+        # repository versions created before the index existed are computed on demand
+        models.HighestCollectionVersion.objects.all().delete()
+        response = self.client.get(self.repo1_list_url)
+        c1 = next(i for i in response.data['data'] if i['name'] == self.collection1.name)
+        self.assertEqual(c1['latest_version']['version'], '1.0.1')
+        self.assertEqual(
+            models.HighestCollectionVersion.objects.filter(
+                repository_version=self.repo1.latest_version()
+            ).count(),
+            2,
+        )
+
     def test_include_related(self):
         response = self.client.get(self.repo1_list_url + "?include_related=my_permissions")
         for c in response.data['data']:
@@ -267,3 +289,51 @@ class TestUiCollectionRemoteViewSet(BaseTestCase):
 
         # token is not visible in a GET
         self.assertNotIn('token', response.data['data'][1])
+
+
+@override_settings(GALAXY_DEPLOYMENT_MODE=DeploymentMode.STANDALONE.value)
+class TestUiCollectionConditionalGet(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.repo = _create_repo(name="the_repo")
+        self.namespace = models.Namespace.objects.create(name="my_namespace")
+        self.collection = Collection.objects.create(namespace=self.namespace, name="foo")
+        _get_create_version_in_repo(self.namespace, self.collection, self.repo, version="1.0.0")
+        self.url = get_current_ui_url(
+            "collections-list", kwargs={"distro_base_path": "the_repo"}
+        )
+
+    def _assert_modified(self, etag):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        return response
+
+    def test_not_modified_until_a_new_repository_version(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        _get_create_version_in_repo(self.namespace, self.collection, self.repo, version="2.0.0")
+
+        response = self._assert_modified(etag)
+        self.assertEqual(response.data["data"][0]["latest_version"]["version"], "2.0.0")
+
+    def test_namespace_edit_invalidates_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        self.namespace.company = "Acme"
+        self.namespace.save()
+
+        response = self._assert_modified(etag)
+        self.assertEqual(response.data["data"][0]["namespace"]["company"], "Acme")
+
+    def test_no_etag_on_collection_versions(self):
+        # the versions list every repository they are in
+        response = self.client.get(
+            get_current_ui_url("collection-versions-list") + "?repository=the_repo"
+        )
+        self.assertNotIn("ETag", response)
@@ -0,0 +1,36 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from galaxy_ng.app.api.ui.v1.views.landing_page import (
+    _get_partners,
+    _get_random_partner,
+)
+from galaxy_ng.app.models import Namespace
+
+
+@override_settings(GALAXY_LANDING_PAGE_CACHE_TTL=60)
+class TestLandingPagePartners(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_partners_are_cached_until_a_namespace_is_created(self):
+        Namespace.objects.create(name="partner_one", company="One")
+        self.assertEqual(_get_partners()["count"], 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(_get_partners()["count"], 1)
+
+        Namespace.objects.create(name="partner_two", company="Two")
+        self.assertEqual(_get_partners()["count"], 2)
+
+    def test_random_partner(self):
+        names = {"partner_one", "partner_two", "partner_three"}
+        for name in names:
+            Namespace.objects.create(name=name)
+        Namespace.objects.filter(name="partner_three").delete()
+
+        partners = _get_partners()
+        with self.assertNumQueries(1):
+            namespace = _get_random_partner(partners)
+        self.assertIn(namespace.name, names - {"partner_three"})
@@ -0,0 +1,87 @@
+import urllib
+
+from django.test import override_settings
+from pulp_ansible.app.models import (
+    AnsibleCollectionDeprecated,
+    Collection,
+    CollectionDownloadCount,
+    CollectionVersion,
+)
+
+from galaxy_ng.app import models
+from galaxy_ng.app.api.v1.models import LegacyNamespace, LegacyRole, LegacyRoleDownloadCount
+from galaxy_ng.app.constants import DeploymentMode
+from .base import BaseTestCase, get_current_ui_url
+
+
+@override_settings(GALAXY_DEPLOYMENT_MODE=DeploymentMode.STANDALONE.value)
+class TestUiSearchView(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.search_url = get_current_ui_url("search-view")
+        self.namespace = models.Namespace.objects.create(name="search_ns")
+        self.collection = Collection.objects.create(namespace="search_ns", name="finder")
+        for version in ("1.0.0", "1.2.0"):
+            CollectionVersion.objects.create(
+                namespace="search_ns",
+                name="finder",
+                collection=self.collection,
+                version=version,
+                description="finds things",
+            )
+        CollectionVersion.objects.filter(collection=self.collection).update(is_highest=False)
+        CollectionVersion.objects.filter(collection=self.collection, version="1.2.0").update(
+            is_highest=True
+        )
+
+        legacy_namespace = LegacyNamespace.objects.create(name="search_ns")
+        self.role = LegacyRole.objects.create(
+            namespace=legacy_namespace,
+            name="seeker",
+            full_metadata={
+                "description": "seeks things",
+                "tags": ["search"],
+                "platforms": [{"name": "Fedora"}],
+                "versions": [{"version": "0.1.0"}, {"version": "0.2.0"}],
+            },
+        )
+
+    def _search(self, **query_params):
+        url = self.search_url + "?" + urllib.parse.urlencode(query_params, doseq=True)
+        return self.client.get(url).data["data"]
+
+    def test_documents_follow_their_source(self):
+        results = {item["type"]: item for item in self._search(namespace="search_ns")}
+        self.assertEqual(results["collection"]["latest_version"], "1.2.0")
+        self.assertEqual(results["role"]["latest_version"], "0.2.0")
+        self.assertEqual(results["role"]["platforms"], [{"name": "Fedora"}])
+
+        AnsibleCollectionDeprecated.objects.create(namespace="search_ns", name="finder")
+        CollectionDownloadCount.objects.create(namespace="search_ns", name="finder",
+                                               download_count=7)
+        LegacyRoleDownloadCount.objects.create(legacyrole=self.role, count=3)
+
+        results = {item["type"]: item for item in self._search(namespace="search_ns")}
+        self.assertTrue(results["collection"]["deprecated"])
+        self.assertEqual(results["collection"]["download_count"], 7)
+        self.assertEqual(results["role"]["download_count"], 3)
+
+    def test_filters(self):
+        self.assertEqual(
+            [item["name"] for item in self._search(namespace="search_ns", type="role")],
+            ["seeker"],
+        )
+        self.assertEqual(
+            [item["name"] for item in self._search(namespace="search_ns", platform="fedora")],
+            ["seeker"],
+        )
+        self.assertEqual(
+            [item["name"] for item in self._search(keywords="finds", search_type="sql")],
+            ["finder"],
+        )
+
+    def test_deleted_role_is_removed(self):
+        self.role.delete()
+        self.assertEqual(
+            [item["type"] for item in self._search(namespace="search_ns")], ["collection"]
+        )
@@ -0,0 +1,44 @@
+from unittest.mock import MagicMock
+
+from django.test import SimpleTestCase, override_settings
+
+from galaxy_ng.app.api.v3.viewsets.collection import (
+    DOWNLOAD_CHUNK_SIZE,
+    CollectionArtifactDownloadView,
+    _stream_content,
+)
+
+
+class TestCollectionArtifactDownloadView(SimpleTestCase):
+    @override_settings(
+        GALAXY_DOWNLOAD_INTERNAL_REDIRECT_PREFIX="/_content/",
+        GALAXY_DOWNLOAD_INTERNAL_REDIRECT_HEADER="X-Accel-Redirect",
+    )
+    def test_internal_redirect(self):
+        response = CollectionArtifactDownloadView()._get_internal_redirect(
+            "http://localhost:24816/api/v3/artifacts/inbound/ns-name-1.0.0.tar.gz"
+            "?validate_token=abc"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            "/_content/api/v3/artifacts/inbound/ns-name-1.0.0.tar.gz?validate_token=abc",
+        )
+        self.assertFalse(response.content)
+        self.assertNotIn("Content-Type", response)
+
+    def test_stream_content_releases_the_connection(self):
+        upstream = MagicMock()
+        upstream.raw.stream.return_value = iter([b"a" * 10, b"b" * 10])
+
+        self.assertEqual(b"".join(_stream_content(upstream)), b"a" * 10 + b"b" * 10)
+        upstream.raw.stream.assert_called_once_with(DOWNLOAD_CHUNK_SIZE, decode_content=False)
+        upstream.close.assert_called_once()
+
+        # also when the client goes away halfway
+        upstream = MagicMock()
+        upstream.raw.stream.return_value = iter([b"a", b"b"])
+        stream = _stream_content(upstream)
+        next(stream)
+        stream.close()
+        upstream.close.assert_called_once()
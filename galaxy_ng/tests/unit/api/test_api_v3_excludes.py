@@ -0,0 +1,61 @@
+import json
+
+from django.test import TestCase
+from pulp_ansible.app.models import Collection
+
+from galaxy_ng.app.api.v3.views.excludes import get_excludes_document
+from galaxy_ng.app.models import SyncList
+
+
+class TestExcludesDocument(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.synclist = SyncList.objects.create(name="123-synclist", policy="exclude")
+        self.foo = Collection.objects.create(namespace="ns", name="foo")
+        self.bar = Collection.objects.create(namespace="ns", name="bar")
+
+    def _excluded(self):
+        document = get_excludes_document("123-synclist")
+        return [c["name"] for c in json.loads(document["excludes_json"])["collections"]]
+
+    def test_document_follows_collections(self):
+        self.assertEqual(self._excluded(), [])
+
+        self.synclist.collections.add(self.foo, self.bar)
+        self.assertEqual(self._excluded(), ["ns.bar", "ns.foo"])
+
+        self.synclist.collections.remove(self.bar)
+        self.assertEqual(self._excluded(), ["ns.foo"])
+
+        self.foo.synclist_set.clear()
+        self.assertEqual(self._excluded(), [])
+
+        self.synclist.collections.add(self.bar)
+        self.bar.delete()
+        self.assertEqual(self._excluded(), [])
+
+    def test_document_follows_policy(self):
+        self.synclist.collections.add(self.foo)
+        document = get_excludes_document("123-synclist")
+        self.assertEqual(
+            document["excludes_yaml"], "collections:\n- name: ns.foo\n"
+        )
+
+        self.synclist.policy = "include"
+        self.synclist.save()
+        self.assertEqual(self._excluded(), [])
+        self.assertNotEqual(
+            get_excludes_document("123-synclist")["excludes_digest"],
+            document["excludes_digest"],
+        )
+
+    def test_document_is_read_with_one_query(self):
+        self.synclist.collections.add(self.foo)
+        with self.assertNumQueries(1):
+            get_excludes_document("123-synclist")
+
+    def test_unknown_synclist(self):
+        self.assertEqual(
+            json.loads(get_excludes_document("published")["excludes_json"]),
+            {"collections": []},
+        )
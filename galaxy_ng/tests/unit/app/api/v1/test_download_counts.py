@@ -0,0 +1,55 @@
+import pytest
+
+from unittest.mock import patch
+
+from galaxy_ng.app.api.v1 import download_counts
+from galaxy_ng.app.api.v1.models import LegacyNamespace
+from galaxy_ng.app.api.v1.models import LegacyRole
+from galaxy_ng.app.api.v1.models import LegacyRoleDownloadCount
+
+
+@pytest.fixture
+def no_redis():
+    with patch.object(download_counts, 'get_redis_connection', return_value=None):
+        yield
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('no_redis')
+def test_role_downloads_are_buffered_until_flush(settings):
+    settings.GALAXY_LEGACY_ROLE_DOWNLOAD_COUNT_FLUSH_INTERVAL = 3600
+    download_counts.flush_role_download_counts()
+
+    namespace = LegacyNamespace.objects.create(name='download_counts')
+    role1 = LegacyRole.objects.create(namespace=namespace, name='role1')
+    role2 = LegacyRole.objects.create(namespace=namespace, name='role2')
+    LegacyRoleDownloadCount.objects.create(legacyrole=role2, count=5)
+
+    for _ in range(3):
+        download_counts.record_role_download(role1.pk)
+    download_counts.record_role_download(role2.pk)
+
+    assert not LegacyRoleDownloadCount.objects.filter(legacyrole=role1).exists()
+
+    assert download_counts.flush_role_download_counts() == 2
+    assert LegacyRoleDownloadCount.objects.get(legacyrole=role1).count == 3
+    assert LegacyRoleDownloadCount.objects.get(legacyrole=role2).count == 6
+
+    # nothing left to write
+    assert download_counts.flush_role_download_counts() == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('no_redis')
+def test_role_downloads_of_deleted_roles_are_dropped(settings):
+    settings.GALAXY_LEGACY_ROLE_DOWNLOAD_COUNT_FLUSH_INTERVAL = 3600
+    download_counts.flush_role_download_counts()
+
+    namespace = LegacyNamespace.objects.create(name='download_counts_deleted')
+    role = LegacyRole.objects.create(namespace=namespace, name='role')
+    download_counts.record_role_download(role.pk)
+    role_pk = role.pk
+    role.delete()
+
+    download_counts.flush_role_download_counts()
+    assert not LegacyRoleDownloadCount.objects.filter(legacyrole_id=role_pk).exists()
@@ -0,0 +1,58 @@
+import os
+
+from git import Repo
+
+from galaxy_ng.app.api.v1 import git_mirrors
+from galaxy_ng.app.common import metrics
+
+
+def _make_upstream(path):
+    repo = Repo.init(path)
+    with repo.config_writer() as config:
+        config.set_value('user', 'name', 'galaxy')
+        config.set_value('user', 'email', 'galaxy@example.com')
+    with open(os.path.join(path, 'README.md'), 'w') as f:
+        f.write('role')
+    repo.index.add(['README.md'])
+    repo.index.commit('initial')
+    repo.create_tag('1.0.0')
+    return repo
+
+
+def test_clone_from_mirror_reuses_the_mirror(settings, tmp_path):
+    settings.GALAXY_LEGACY_ROLE_GIT_CACHE_DIR = str(tmp_path / 'cache')
+    settings.GALAXY_LEGACY_ROLE_GIT_CACHE_MAX_SIZE = None
+    upstream = _make_upstream(str(tmp_path / 'upstream'))
+    clone_url = upstream.working_dir
+    hits = metrics.legacy_role_git_mirror_requests.labels(result='hit')
+
+    git_mirrors.clone_from_mirror(clone_url, str(tmp_path / 'first'))
+    hits_before = hits._value.get()
+
+    upstream.create_tag('1.1.0')
+    git_mirrors.clone_from_mirror(clone_url, str(tmp_path / 'second'))
+
+    assert hits._value.get() == hits_before + 1
+    checkout = Repo(str(tmp_path / 'second'))
+    assert sorted(tag.name for tag in checkout.tags) == ['1.0.0', '1.1.0']
+    assert checkout.remotes.origin.url == clone_url
+    assert checkout.head.commit.hexsha == upstream.head.commit.hexsha
+
+
+def test_evict_mirrors_keeps_the_most_recent(settings, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    settings.GALAXY_LEGACY_ROLE_GIT_CACHE_DIR = cache_dir
+    settings.GALAXY_LEGACY_ROLE_GIT_CACHE_MAX_SIZE = None
+
+    urls = []
+    for name in ('old', 'new'):
+        urls.append(_make_upstream(str(tmp_path / name)).working_dir)
+        git_mirrors.clone_from_mirror(urls[-1], str(tmp_path / f'{name}_checkout'))
+    old_mirror = git_mirrors.mirror_path(cache_dir, urls[0])
+    new_mirror = git_mirrors.mirror_path(cache_dir, urls[1])
+    os.utime(old_mirror, (0, 0))
+
+    git_mirrors.evict_mirrors(cache_dir, 1, keep=new_mirror)
+
+    assert not os.path.exists(old_mirror)
+    assert os.path.isdir(new_mirror)
@@ -0,0 +1,57 @@
+import logging
+import pytest
+
+from unittest.mock import patch
+
+from pulpcore.plugin.models import Task
+
+from galaxy_ng.app.api.v1.logutils import LegacyRoleImportHandler
+from galaxy_ng.app.api.v1.models import LegacyRoleImport
+
+
+def _record(msg):
+    return logging.LogRecord('test', logging.INFO, __file__, 1, msg, None, None)
+
+
+@pytest.mark.django_db
+def test_legacy_role_import_handler_buffers_and_appends():
+    task = Task.objects.create(name='test_legacy_role_import_handler', state='running')
+    LegacyRoleImport.objects.create(task=task)
+
+    handler = LegacyRoleImportHandler(capacity=3, flush_interval=3600)
+    with patch('pulpcore.plugin.models.Task.current', return_value=task):
+        handler.emit(_record('one'))
+        handler.emit(_record('two'))
+
+        # nothing written until the buffer is full
+        assert LegacyRoleImport.objects.get(task=task).messages == []
+
+        handler.emit(_record('three'))
+        handler.emit(_record('four'))
+        assert [
+            x['message'] for x in LegacyRoleImport.objects.get(task=task).messages
+        ] == ['one', 'two', 'three']
+
+        handler.flush()
+
+    messages = LegacyRoleImport.objects.get(task=task).messages
+    assert [x['message'] for x in messages] == ['one', 'two', 'three', 'four']
+    assert messages[0]['state'] == 'running'
+    assert messages[0]['level'] == 'INFO'
+
+
+@pytest.mark.django_db
+def test_legacy_role_import_handler_ignores_tasks_without_import(django_assert_num_queries):
+    task = Task.objects.create(name='test_legacy_role_import_handler', state='running')
+
+    handler = LegacyRoleImportHandler(capacity=1)
+    with patch('pulpcore.plugin.models.Task.current', return_value=task):
+        handler.emit(_record('one'))
+
+        # the missing import is remembered
+        with django_assert_num_queries(0):
+            handler.emit(_record('two'))
+
+        handler.flush()
+
+    assert not LegacyRoleImport.objects.filter(task=task).exists()
@@ -6,8 +6,12 @@ from galaxy_importer.config import Config
 from galaxy_ng.app.models import Namespace
 from galaxy_ng.app.api.v1.models import LegacyNamespace
 from galaxy_ng.app.api.v1.models import LegacyRole
+from galaxy_ng.app.api.v1.models import LegacyRoleDownloadCount
 
 from galaxy_ng.app.api.v1.tasks import legacy_role_import
+from galaxy_ng.app.api.v1.tasks import build_synced_role_metadata
+from galaxy_ng.app.api.v1.tasks import find_unchanged_roles
+from galaxy_ng.app.api.v1.tasks import LegacyRoleSyncBatch
 # from galaxy_ng.app.api.v1.tasks import legacy_sync_from_upstream
 
 
@@ -187,3 +191,62 @@ def test_legacy_role_import_with_tag_name():
     # the tag should be in the versions ...
     vmap = {x['version']: x for x in role.full_metadata['versions']}
     assert github_reference in vmap
+
+
+def _upstream_role(remote_id, name, modified):
+    return {
+        'id': remote_id,
+        'name': name,
+        'github_user': 'syncer',
+        'github_repo': f'ansible-role-{name}',
+        'github_branch': 'main',
+        'modified': modified,
+        'download_count': remote_id * 10,
+        'summary_fields': {'namespace': {'name': 'syncer'}},
+    }
+
+
+@pytest.mark.django_db
+def test_legacy_role_sync_batch_upserts_roles_and_counts():
+    namespace, _ = LegacyNamespace.objects.get_or_create(name='syncer')
+    versions = [{'id': 1, 'name': '1.0.0'}]
+
+    batch = LegacyRoleSyncBatch(size=100)
+    for remote_id, name in ((1, 'alpha'), (2, 'beta')):
+        rdata = _upstream_role(remote_id, name, '2024-01-01T00:00:00Z')
+        metadata = build_synced_role_metadata(rdata, versions)
+        batch.add_role(namespace, name, metadata, rdata['download_count'])
+    batch.flush()
+
+    alpha = LegacyRole.objects.get(namespace=namespace, name='alpha')
+    assert alpha.full_metadata['upstream_id'] == 1
+    assert alpha.full_metadata['versions_summary'][0]['name'] == '1.0.0'
+    assert LegacyRoleDownloadCount.objects.get(legacyrole=alpha).count == 10
+
+    # a second sync updates in place
+    rdata = _upstream_role(1, 'alpha', '2024-02-01T00:00:00Z')
+    batch.add_role(namespace, 'alpha', build_synced_role_metadata(rdata, versions), 99)
+    batch.flush()
+
+    assert LegacyRole.objects.filter(namespace=namespace, name='alpha').count() == 1
+    alpha.refresh_from_db()
+    assert alpha.full_metadata['modified'] == '2024-02-01T00:00:00Z'
+    assert LegacyRoleDownloadCount.objects.get(legacyrole=alpha).count == 99
+
+
+@pytest.mark.django_db
+def test_find_unchanged_roles():
+    namespace, _ = LegacyNamespace.objects.get_or_create(name='syncer')
+    role = LegacyRole.objects.create(
+        namespace=namespace,
+        name='gamma',
+        full_metadata={'upstream_id': 3, 'modified': '2024-01-01T00:00:00Z'},
+    )
+
+    unchanged = find_unchanged_roles([
+        _upstream_role(3, 'gamma', '2024-01-01T00:00:00Z'),
+        _upstream_role(4, 'delta', '2024-01-01T00:00:00Z'),
+    ])
+    assert unchanged == {3: role.pk}
+
+    assert find_unchanged_roles([_upstream_role(3, 'gamma', '2024-03-01T00:00:00Z')]) == {}
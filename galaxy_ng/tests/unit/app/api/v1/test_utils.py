@@ -0,0 +1,22 @@
+from galaxy_ng.app.api.v1.utils import summarize_versions
+
+
+def test_summarize_versions_newest_first():
+    versions = [
+        {'id': 1, 'name': 'v1.0.0', 'tag': 'v1.0.0', 'version': '1.0.0', 'commit_date': 'a'},
+        {'id': 3, 'name': 'v1.10.0', 'tag': 'v1.10.0', 'version': '1.10.0', 'commit_date': 'c'},
+        {'id': 2, 'name': 'v1.2.0', 'tag': 'v1.2.0', 'version': '1.2.0', 'commit_date': 'b'},
+    ]
+    assert summarize_versions(versions) == [
+        {'id': 3, 'name': 'v1.10.0', 'release_date': 'c'},
+        {'id': 2, 'name': 'v1.2.0', 'release_date': 'b'},
+        {'id': 1, 'name': 'v1.0.0', 'release_date': 'a'},
+    ]
+
+
+def test_summarize_versions_limit_and_name_fallback():
+    versions = [{'id': x, 'name': f'{x}.0.0', 'version': f'{x}.0.0'} for x in range(20)]
+    summary = summarize_versions(versions)
+    assert summary[0] == {'id': 19, 'name': '19.0.0', 'release_date': None}
+    assert len(summary) == 11
+    assert summarize_versions([]) == []
@@ -9,6 +9,7 @@ import insights_analytics_collector.package
 from galaxy_ng.app.metrics_collection.automation_analytics.collector import Collector
 from galaxy_ng.app.metrics_collection.automation_analytics.package import Package
 from django.test import TestCase, override_settings
+from django.utils.timezone import now, timedelta
 
 
 @register('config', '1.0', config=True)
@@ -231,3 +232,34 @@ class TestAutomationAnalyticsCollector(TestCase):
             logging.ERROR,
             "Metrics Collection for Ansible Automation Platform not enabled."
         )
+
+    def test_last_gathered_entries_are_persisted(self):
+        collector = Collector(
+            collector_module=importlib.import_module(__name__),
+            collection_type=Collector.DRY_RUN,
+            logger=self.logger
+        )
+        assert collector._load_last_gathered_entries() == {}
+
+        watermark = now() - timedelta(days=1)
+        collector._save_last_gathered_entries({'example1': watermark, 'example2': None})
+        assert collector._load_last_gathered_entries() == {'example1': watermark}
+
+    def test_csv_collection_exports_from_the_watermark(self):
+        collector = Collector(
+            collector_module=importlib.import_module(__name__),
+            collection_type=Collector.DRY_RUN,
+            logger=self.logger
+        )
+        collector.gather_since = None
+        collector.gather_until = now()
+        collector.last_gathered_entries = {}
+
+        # the first export of a table is not limited to the last 4 weeks
+        collection = collector._create_collection(csv_exception)
+        assert collection._gather_since() is None
+
+        watermark = now() - timedelta(weeks=8)
+        collector.last_gathered_entries = {'csv_exception': watermark}
+        collection = collector._create_collection(csv_exception)
+        assert collection._gather_since() == watermark
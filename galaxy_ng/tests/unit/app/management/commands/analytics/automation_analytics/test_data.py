@@ -1,3 +1,4 @@
+import datetime as dt
 import galaxy_ng.app.metrics_collection.common_data
 from django.test import TestCase, override_settings
 from unittest.mock import MagicMock, patch
@@ -27,3 +28,22 @@ class TestAutomationAnalyticsData(TestCase):
         mock_request.assert_called_with("GET",
                                         'https://example.com/api-test/xxx/pulp/api/v3/status/')
         json_response.assert_called_once()
+
+    def test_changed_rows(self):
+        since = dt.datetime(2024, 1, 1, tzinfo=dt.UTC)
+        until = since + dt.timedelta(days=1)
+        query, params = galaxy_ng.app.metrics_collection.common_data.changed_rows(
+            "SELECT * FROM ansible_downloadlog", "pulp_last_updated", since, until
+        )
+        self.assertEqual(
+            query,
+            "SELECT * FROM ansible_downloadlog "
+            "WHERE pulp_last_updated > %(since)s AND pulp_last_updated <= %(until)s"
+        )
+        self.assertEqual(params, {"since": since, "until": until})
+
+        # first export of the table
+        query, params = galaxy_ng.app.metrics_collection.common_data.changed_rows(
+            "SELECT * FROM ansible_downloadlog", "pulp_last_updated", None, until
+        )
+        self.assertEqual(params, {"until": until})
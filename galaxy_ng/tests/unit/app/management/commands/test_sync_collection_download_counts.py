@@ -0,0 +1,61 @@
+import datetime as dt
+import importlib
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from pulp_ansible.app.models import Collection, CollectionDownloadCount
+
+
+CMD = "sync-collection-download-counts"
+command_module = importlib.import_module(f"galaxy_ng.app.management.commands.{CMD}")
+
+UPSTREAM_COUNTS = {
+    ("foo", "new"): 10,
+    ("foo", "stale"): 20,
+    ("foo", "fresh"): 30,
+    ("foo", "lower"): 1,
+}
+
+
+def fake_fetch(upstream, namespace, name, session=None, limiter=None):
+    return UPSTREAM_COUNTS.get((namespace, name))
+
+
+class TestSyncCollectionDownloadCountsCommand(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        for name in ("new", "stale", "fresh", "lower", "missing"):
+            Collection.objects.create(namespace="foo", name=name)
+        for name, count in (("stale", 5), ("fresh", 5), ("lower", 5)):
+            CollectionDownloadCount.objects.create(namespace="foo", name=name, download_count=count)
+
+        two_days_ago = timezone.now() - dt.timedelta(days=2)
+        CollectionDownloadCount.objects.exclude(name="fresh").update(
+            pulp_last_updated=two_days_ago
+        )
+
+    def _counts(self):
+        return dict(CollectionDownloadCount.objects.values_list("name", "download_count"))
+
+    @patch.object(command_module, "fetch_download_count", side_effect=fake_fetch)
+    def test_sync(self, fetch):
+        call_command(CMD, "--batch-size", "1")
+
+        fetched = sorted(call.args[2] for call in fetch.call_args_list)
+        self.assertEqual(fetched, ["lower", "missing", "new", "stale"])
+        self.assertEqual(
+            self._counts(), {"new": 10, "stale": 20, "fresh": 5, "lower": 5}
+        )
+
+        stale = CollectionDownloadCount.objects.get(name="stale")
+        self.assertLess(timezone.now() - stale.pulp_last_updated, dt.timedelta(minutes=1))
+
+    @patch.object(command_module, "fetch_download_count", side_effect=fake_fetch)
+    def test_sync_force(self, fetch):
+        call_command(CMD, "--force")
+
+        self.assertEqual(fetch.call_count, 5)
+        self.assertEqual(self._counts()["fresh"], 30)
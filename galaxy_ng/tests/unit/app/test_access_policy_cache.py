@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from pulp_ansible.app.models import AnsibleRepository
+from pulpcore.plugin.util import assign_role
+
+from galaxy_ng.app.models import auth as auth_models
+from galaxy_ng.app.access_control.access_policy import (
+    AccessPolicyBase,
+    NamespaceAccessPolicy,
+    get_request_cache,
+)
+
+
+def _request(user):
+    return SimpleNamespace(_request=SimpleNamespace(), user=user)
+
+
+def test_has_perm_is_memoized_per_request():
+    user = MagicMock(pk=1)
+    user.has_perm.return_value = True
+    policy = AccessPolicyBase()
+
+    request = _request(user)
+    for _ in range(3):
+        assert policy._has_perm(request, "galaxy.view_user")
+    assert user.has_perm.call_count == 1
+
+    # a new request checks again
+    assert policy._has_perm(_request(user), "galaxy.view_user")
+    assert user.has_perm.call_count == 2
+
+
+def test_access_policy_is_resolved_once_per_request():
+    request = _request(MagicMock(pk=1))
+    view = SimpleNamespace(request=request)
+
+    policy = NamespaceAccessPolicy.get_access_policy(view)
+    assert NamespaceAccessPolicy.get_access_policy(view) is policy
+    assert len(get_request_cache(request)) == 1
+
+    # outside of a request nothing is cached
+    assert NamespaceAccessPolicy.get_access_policy(SimpleNamespace()) is not policy
+
+
+@pytest.mark.django_db
+def test_scope_by_view_repository_permissions():
+    user = auth_models.User.objects.create(username="repo_scope_user")
+    group = auth_models.Group.objects.create(name="repo_scope_group")
+    group.user_set.add(user)
+
+    public = AnsibleRepository.objects.create(name="scope_public")
+    by_user = AnsibleRepository.objects.create(name="scope_by_user", private=True)
+    by_group = AnsibleRepository.objects.create(name="scope_by_group", private=True)
+    AnsibleRepository.objects.create(name="scope_hidden", private=True)
+    assign_role("ansible.ansiblerepository_viewer", user, by_user)
+    assign_role("ansible.ansiblerepository_viewer", group, by_group)
+
+    view = SimpleNamespace(request=_request(user))
+    qs = AccessPolicyBase().scope_by_view_repository_permissions(
+        view, AnsibleRepository.objects.filter(name__startswith="scope_"), is_generic=False
+    )
+    assert sorted(qs.values_list("name", flat=True)) == sorted(
+        [public.name, by_user.name, by_group.name]
+    )
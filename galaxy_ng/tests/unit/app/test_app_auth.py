@@ -1,6 +1,9 @@
+import base64
+import json
 from unittest.mock import Mock
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.test import override_settings
 from pulp_ansible.app.models import AnsibleDistribution, AnsibleRepository
 from pulpcore.plugin.models.role import Role
@@ -55,3 +58,25 @@ class TestRHIdentityAuth(BaseTestCase):
 
         # assert objects do not exist: repo
         self.assertFalse(AnsibleRepository.objects.filter(name=synclist_name))
+
+    @override_settings(GALAXY_RH_IDENTITY_CACHE_TTL=60)
+    def test_authenticate_unchanged_identity_is_read_only(self):
+        self.addCleanup(cache.clear)
+        x_rh_identity = rh_auth_utils.user_x_rh_identity("user_cached_rh_auth", "13579")
+        request = Mock()
+        request.META = {"HTTP_X_RH_IDENTITY": x_rh_identity}
+        rh_id_auth = RHIdentityAuthentication()
+
+        user, _ = rh_id_auth.authenticate(request)
+
+        # only the user is loaded
+        with self.assertNumQueries(1):
+            cached_user, _ = rh_id_auth.authenticate(request)
+        self.assertEqual(cached_user, user)
+
+        # changed attributes go through the full path again
+        identity = json.loads(base64.b64decode(x_rh_identity))
+        identity["identity"]["user"]["email"] = "changed@example.com"
+        request.META = {"HTTP_X_RH_IDENTITY": base64.b64encode(json.dumps(identity).encode())}
+        rh_id_auth.authenticate(request)
+        self.assertEqual(User.objects.get(pk=user.pk).email, "changed@example.com")
@@ -0,0 +1,74 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from pulp_container.app import models as container_models
+
+from galaxy_ng.app import models
+from galaxy_ng.app.tasks.index_registry import index_containers
+
+
+def _container_data(name):
+    return {
+        "name": name,
+        "upstream_name": name,
+        "description": f"{name} description",
+        "readme": f"# {name}",
+    }
+
+
+class TestIndexContainers(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.registry = models.ContainerRegistryRemote.objects.create(
+            name="catalog", url="registry.redhat.io"
+        )
+
+        remote = container_models.ContainerRemote.objects.create(
+            name="ee-minimal", upstream_name="ee-minimal", url="registry.redhat.io"
+        )
+        models.ContainerRegistryRepos.objects.create(
+            registry=self.registry, repository_remote=remote
+        )
+        repo = container_models.ContainerRepository.objects.create(
+            name="ee-minimal", remote=remote
+        )
+        container_models.ContainerDistribution.objects.create(
+            name="ee-minimal", base_path="ee-minimal", repository=repo
+        )
+
+        local_repo = container_models.ContainerPushRepository.objects.create(name="ee-local")
+        container_models.ContainerDistribution.objects.create(
+            name="ee-local", base_path="ee-local", repository=local_repo
+        )
+
+    def test_failures_are_collected_per_container(self):
+        results = {"created": [], "updated": [], "failed": {}}
+        index_containers(
+            [_container_data("ee-minimal"), _container_data("ee-local")],
+            self.registry.pk,
+            request=None,
+            results=results,
+        )
+
+        self.assertEqual(results["updated"], ["ee-minimal"])
+        self.assertEqual(list(results["failed"]), ["ee-local"])
+        self.assertIn("local container", results["failed"]["ee-local"])
+
+        distro = container_models.ContainerDistribution.objects.get(base_path="ee-minimal")
+        self.assertEqual(distro.description, "ee-minimal description")
+        self.assertEqual(
+            models.ContainerDistroReadme.objects.get(container=distro).text, "# ee-minimal"
+        )
+
+    def test_unchanged_containers_are_not_written(self):
+        results = {"created": [], "updated": [], "failed": {}}
+        containers = [_container_data("ee-minimal")]
+        index_containers(containers, self.registry.pk, request=None, results=results)
+
+        with CaptureQueriesContext(connection) as queries:
+            index_containers(containers, self.registry.pk, request=None, results=results)
+        writes = [
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].startswith(("INSERT", "UPDATE"))
+        ]
+        self.assertEqual(writes, [])
@@ -0,0 +1,62 @@
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from galaxy_ng.app.auth import keycloak
+from galaxy_ng.app.models import User
+
+
+@override_settings(
+    SOCIAL_AUTH_KEYCLOAK_KEY="galaxy",
+    SOCIAL_AUTH_KEYCLOAK_SECRET="secret",
+    SOCIAL_AUTH_KEYCLOAK_ACCESS_TOKEN_URL="https://keycloak.example.com/token",
+    GALAXY_VERIFY_KEYCLOAK_SSL_CERTS=True,
+    GALAXY_KEYCLOAK_BASIC_AUTH_CACHE_TTL=60,
+)
+class TestKeycloakBasicAuth(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create(username="keycloak_user")
+
+        session = MagicMock()
+        session.post.return_value.status_code = 200
+        session.post.return_value.json.return_value = {
+            "access_token": "abc",
+            "expires_in": 300,
+        }
+        self.session = session
+
+        strategy = MagicMock()
+        strategy.authenticate.return_value = self.user
+        for target, value in (
+            ("get_session", session),
+            ("load_strategy", strategy),
+        ):
+            patcher = patch.object(keycloak, target, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(keycloak, "KeycloakOAuth2")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_verification_is_cached(self):
+        auth = keycloak.KeycloakBasicAuth()
+        self.assertEqual(auth.authenticate_credentials("keycloak_user", "pw"), (self.user, None))
+        self.assertEqual(auth.authenticate_credentials("keycloak_user", "pw"), (self.user, None))
+        self.assertEqual(self.session.post.call_count, 1)
+
+        # another password is verified again
+        auth.authenticate_credentials("keycloak_user", "other")
+        self.assertEqual(self.session.post.call_count, 2)
+
+    def test_cache_is_capped_by_token_lifetime(self):
+        self.session.post.return_value.json.return_value["expires_in"] = 0
+        auth = keycloak.KeycloakBasicAuth()
+        auth.authenticate_credentials("keycloak_user", "pw")
+        auth.authenticate_credentials("keycloak_user", "pw")
+        self.assertEqual(self.session.post.call_count, 2)
+
+    def test_cache_key_does_not_contain_the_password(self):
+        self.assertNotIn("hunter2", keycloak.verification_cache_key("keycloak_user", "hunter2"))
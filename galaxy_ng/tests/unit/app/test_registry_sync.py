@@ -0,0 +1,105 @@
+import asyncio
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from pulp_container.app import models as container_models
+
+from galaxy_ng.app import models
+from galaxy_ng.app.tasks import registry_sync
+
+
+@override_settings(GALAXY_CONTAINER_REGISTRY_SYNC_CONCURRENCY=2)
+class TestSyncAllReposInRegistry(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.registry = models.ContainerRegistryRemote.objects.create(
+            name="registry", url="https://registry.example.com"
+        )
+        self.remotes = []
+        for name in ("one", "two", "three"):
+            remote = container_models.ContainerRemote.objects.create(
+                name=name, upstream_name=name, url=self.registry.url
+            )
+            container_models.ContainerRepository.objects.create(name=name, remote=remote)
+            models.ContainerRegistryRepos.objects.create(
+                registry=self.registry, repository_remote=remote
+            )
+            self.remotes.append(remote)
+
+    def _sync(self, fingerprints):
+        async def get_fingerprints(remotes, concurrency):
+            return {remote.pk: fingerprints.get(remote.name) for remote in remotes}
+
+        with patch.object(registry_sync, "_get_upstream_fingerprints", get_fingerprints), \
+                patch.object(registry_sync, "dispatch") as dispatch:
+            task_group = registry_sync.sync_all_repos_in_registry(self.registry.pk)
+        return task_group, dispatch
+
+    def test_unchanged_repositories_are_skipped(self):
+        models.ContainerRegistryRepos.objects.filter(
+            repository_remote__name="one"
+        ).update(upstream_fingerprint="abc")
+
+        task_group, dispatch = self._sync({"one": "abc", "two": "def"})
+
+        synced = [call.kwargs["kwargs"]["remote_pk"] for call in dispatch.call_args_list]
+        self.assertEqual(
+            sorted(synced), sorted([str(self.remotes[1].pk), str(self.remotes[2].pk)])
+        )
+        self.assertTrue(task_group.all_tasks_dispatched)
+        for call in dispatch.call_args_list:
+            self.assertEqual(call.kwargs["task_group"], task_group)
+
+    def test_least_recently_synced_first_and_concurrency_slots(self):
+        models.ContainerRegistryRepos.objects.filter(
+            repository_remote__name="one"
+        ).update(last_synced_at="2024-01-02T00:00:00Z")
+        models.ContainerRegistryRepos.objects.filter(
+            repository_remote__name="two"
+        ).update(last_synced_at="2024-01-01T00:00:00Z")
+
+        _, dispatch = self._sync({})
+
+        synced = [call.kwargs["kwargs"]["remote_pk"] for call in dispatch.call_args_list]
+        self.assertEqual(
+            synced, [str(self.remotes[i].pk) for i in (2, 1, 0)]
+        )
+        slots = [call.kwargs["exclusive_resources"][1] for call in dispatch.call_args_list]
+        self.assertEqual(slots, [
+            "container-registry-sync:registry.example.com:0",
+            "container-registry-sync:registry.example.com:1",
+            "container-registry-sync:registry.example.com:0",
+        ])
+
+    def test_upstream_checks_are_capped_per_host(self):
+        running = 0
+        most_running = 0
+
+        async def get_fingerprint(remote):
+            nonlocal running, most_running
+            running += 1
+            most_running = max(most_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return remote.name
+
+        with patch.object(registry_sync, "_get_upstream_fingerprint", get_fingerprint):
+            fingerprints = asyncio.run(
+                registry_sync._get_upstream_fingerprints(self.remotes, 2)
+            )
+
+        self.assertEqual(most_running, 2)
+        self.assertEqual(
+            fingerprints, {remote.pk: remote.name for remote in self.remotes}
+        )
+
+    @patch.object(registry_sync, "container_sync")
+    def test_successful_sync_records_the_fingerprint(self, container_sync):
+        remote = self.remotes[0]
+        repo = remote.repository_set.get()
+        registry_sync.sync_registry_repository(str(remote.pk), str(repo.pk), "abc")
+
+        container_sync.assert_called_once()
+        remote_rel = models.ContainerRegistryRepos.objects.get(repository_remote=remote)
+        self.assertEqual(remote_rel.upstream_fingerprint, "abc")
+        self.assertIsNotNone(remote_rel.last_synced_at)
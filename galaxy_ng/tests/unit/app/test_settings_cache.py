@@ -0,0 +1,53 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from galaxy_ng.app.tasks import settings_cache
+
+
+class TestSettingsSnapshot(TestCase):
+
+    def setUp(self):
+        settings_cache.invalidate_settings_snapshot()
+
+    def tearDown(self):
+        settings_cache.invalidate_settings_snapshot()
+
+    @mock.patch.object(settings_cache, "get_settings_from_db", return_value={"FOO": "bar"})
+    @mock.patch.object(settings_cache, "get_settings_from_cache", return_value={})
+    @mock.patch.object(settings_cache, "get_settings_version", return_value="1")
+    def test_snapshot_reused_within_ttl(self, version, from_cache, from_db):
+        first = settings_cache.get_settings_snapshot(ttl=60)
+        second = settings_cache.get_settings_snapshot(ttl=60)
+
+        assert first is second
+        assert first.data == {"FOO": "bar"}
+        assert first.source == "db"
+        assert version.call_count == 1
+        assert from_db.call_count == 1
+
+    @mock.patch.object(settings_cache, "get_settings_from_db", return_value={})
+    @mock.patch.object(settings_cache, "get_settings_from_cache", return_value={"FOO": "bar"})
+    @mock.patch.object(settings_cache, "get_settings_version", return_value="1")
+    def test_snapshot_reloaded_only_on_version_change(self, version, from_cache, from_db):
+        first = settings_cache.get_settings_snapshot(ttl=0)
+        assert first.source == "cache"
+
+        # same version, data is not read again
+        assert settings_cache.get_settings_snapshot(ttl=0) is first
+        assert from_cache.call_count == 1
+
+        version.return_value = "2"
+        from_cache.return_value = {"FOO": "baz"}
+        third = settings_cache.get_settings_snapshot(ttl=0)
+        assert third is not first
+        assert third.data == {"FOO": "baz"}
+
+    @mock.patch.object(settings_cache, "get_settings_from_db", return_value={"FOO": "bar"})
+    @mock.patch.object(settings_cache, "get_settings_from_cache", return_value={})
+    @mock.patch.object(settings_cache, "get_settings_version", return_value=None)
+    def test_invalidate_snapshot(self, version, from_cache, from_db):
+        first = settings_cache.get_settings_snapshot(ttl=60)
+        settings_cache.invalidate_settings_snapshot()
+        assert settings_cache.get_settings_snapshot(ttl=60) is not first
+        assert from_db.call_count == 2
@@ -0,0 +1,103 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+
+from galaxy_ng.app.auth.token import ExpiringTokenAuthentication, token_cache_key
+from galaxy_ng.app.models import User
+
+
+class FakeRedis:
+    """The few commands used by the token cache."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+
+    def expire(self, key, ttl):
+        pass
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+
+@override_settings(GALAXY_TOKEN_AUTH_CACHE_TTL=60)
+class TestExpiringTokenAuthentication(TestCase):
+    def setUp(self):
+        super().setUp()
+        redis = FakeRedis()
+        patchers = [
+            patch("galaxy_ng.app.tasks.settings_cache.conn", redis),
+            patch("galaxy_ng.app.auth.token.get_redis_connection", return_value=redis),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create(username="token_cache_user")
+        self.token = Token.objects.create(user=self.user)
+        self.auth = ExpiringTokenAuthentication()
+        self.addCleanup(cache.clear)
+
+    def _cache_of_another_process(self):
+        """Put the entry cached before the change back, as if another process held it."""
+        entry = cache.get(token_cache_key(self.token.key))
+        self.assertIsNotNone(entry)
+        return lambda: cache.set(token_cache_key(self.token.key), entry)
+
+    def test_cached_token_skips_the_database(self):
+        user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(user, self.user)
+        self.assertNotIn(self.token.key, token_cache_key(self.token.key))
+
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(token.key, self.token.key)
+
+    def test_deleted_token_is_rejected(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.token.delete()
+        with self.assertRaisesMessage(exceptions.AuthenticationFailed, "Invalid token"):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_deactivated_user_is_rejected(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaisesMessage(exceptions.AuthenticationFailed, "inactive"):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_deleted_token_is_rejected_by_other_processes(self):
+        self.auth.authenticate_credentials(self.token.key)
+        restore = self._cache_of_another_process()
+
+        self.token.delete()
+        restore()
+        with self.assertRaisesMessage(exceptions.AuthenticationFailed, "Invalid token"):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_deactivated_user_is_rejected_by_other_processes(self):
+        self.auth.authenticate_credentials(self.token.key)
+        restore = self._cache_of_another_process()
+
+        self.user.is_active = False
+        self.user.save()
+        restore()
+        with self.assertRaisesMessage(exceptions.AuthenticationFailed, "inactive"):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_nothing_is_cached_without_redis(self):
+        with patch("galaxy_ng.app.auth.token.get_redis_connection", return_value=None):
+            self.auth.authenticate_credentials(self.token.key)
+            self.assertIsNone(cache.get(token_cache_key(self.token.key)))
@@ -0,0 +1,48 @@
+from django.test import TestCase
+
+from galaxy_ng.app.api.v1.models import LegacyNamespace
+from galaxy_ng.app.models import Namespace
+from galaxy_ng.app.models.auth import Group, User
+from galaxy_ng.app.utils.rbac import (
+    add_group_to_v3_namespace,
+    add_user_to_v3_namespace,
+    filter_by_v3_namespace_owner,
+    get_v3_namespace_owners,
+)
+
+
+class TestFilterByV3NamespaceOwner(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username='owner_filter_user')
+        self.group_user = User.objects.create(username='owner_filter_group_user')
+        self.group = Group.objects.create(name='owner_filter_group')
+        self.group.user_set.add(self.group_user)
+
+        self.ns_user = Namespace.objects.create(name='owner_filter_ns_user')
+        self.ns_group = Namespace.objects.create(name='owner_filter_ns_group')
+        self.ns_none = Namespace.objects.create(name='owner_filter_ns_none')
+        add_user_to_v3_namespace(self.user, self.ns_user)
+        add_group_to_v3_namespace(self.group, self.ns_group)
+
+        self.legacy = {
+            ns.name: LegacyNamespace.objects.create(name=ns.name, namespace=ns)
+            for ns in (self.ns_user, self.ns_group, self.ns_none)
+        }
+        self.unbound = LegacyNamespace.objects.create(name='owner_filter_unbound')
+
+    def _owned(self, username):
+        qs = filter_by_v3_namespace_owner(
+            LegacyNamespace.objects.all(), username, field_name='namespace_id'
+        )
+        return sorted(qs.values_list('name', flat=True))
+
+    def test_direct_and_group_owners(self):
+        assert self._owned(self.user.username) == [self.ns_user.name]
+        assert self._owned(self.group_user.username) == [self.ns_group.name]
+        assert self._owned('not_a_user') == []
+
+    def test_matches_get_v3_namespace_owners(self):
+        for legacy in self.legacy.values():
+            for owner in get_v3_namespace_owners(legacy.namespace):
+                assert legacy.name in self._owned(owner.username)
@@ -0,0 +1,59 @@
+import semantic_version
+
+from django.test import TestCase
+from pulp_ansible.app.models import Collection, CollectionVersion
+
+from galaxy_ng.app.utils.semver import filter_by_spec
+
+
+VERSIONS = [
+    "0.9.0",
+    "1.0.0-alpha",
+    "1.0.0",
+    "1.2.0-rc.2",
+    "1.2.0-rc.10",
+    "1.2.0",
+    "1.2.5",
+    "1.10.0",
+    "2.0.0-beta",
+    "2.0.0",
+]
+
+SPECS = [
+    ">=1.2,<2",
+    "^1.2.0",
+    "~1.2",
+    "1.*",
+    "==1.2.0",
+    "!=1.2.0",
+    "<1.2.0",
+    "<=1.2.0",
+    ">1.2.0-rc.2",
+    ">=1.2.0-rc.10,<2.0.0",
+    "!=1.2.3",
+    ">=0.0.0",
+]
+
+
+class TestFilterBySpec(TestCase):
+
+    def setUp(self):
+        collection = Collection.objects.create(namespace="semver_ns", name="semver")
+        for version in VERSIONS:
+            CollectionVersion.objects.create(
+                namespace="semver_ns", name="semver", collection=collection, version=version
+            )
+        self.queryset = CollectionVersion.objects.filter(collection=collection)
+
+    def test_matches_semantic_version(self):
+        for value in SPECS:
+            spec = semantic_version.SimpleSpec(value)
+            expected = sorted(
+                str(v) for v in spec.filter(semantic_version.Version(v) for v in VERSIONS)
+            )
+            found = sorted(filter_by_spec(self.queryset, spec).values_list("version", flat=True))
+            self.assertEqual(found, expected, value)
+
+    def test_accepts_spec_strings(self):
+        found = filter_by_spec(self.queryset, ">=2").values_list("version", flat=True)
+        self.assertEqual(list(found), ["2.0.0"])